@@ -0,0 +1,166 @@
+"""
+Response compression for mobile clients on slow networks.
+
+CompressionMiddleware compresses response bodies of at least
+COMPRESSION_MIN_SIZE bytes with brotli (when the `brotli` package is
+installed and the client accepts `br`) or gzip, negotiated from
+Accept-Encoding. Smaller bodies go out as-is: below about a kilobyte the
+saving is smaller than a packet and not worth the CPU.
+
+Streaming responses (NDJSON/CSV exports) are compressed chunk by chunk with a
+sync flush, so every chunk still reaches the client as soon as it is produced.
+
+Skipped: already-encoded bodies, binary media types, 204/206/304 responses
+and routes marked with @no_compression:
+
+    @router.get("/live-feed")
+    @no_compression
+    async def live_feed(): ...
+"""
+import zlib
+from typing import Callable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config import settings
+from app.services.timing_service import timing_service
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only
+    brotli = None
+
+EXCLUDED_CONTENT_TYPES = (
+    "image/", "audio/", "video/", "font/",
+    "application/zip", "application/gzip", "application/x-gzip",
+    "text/event-stream",
+)
+UNCOMPRESSED_STATUS = {204, 206, 304}
+
+
+def no_compression(endpoint: Callable) -> Callable:
+    """Route decorator (below @router.get/post): never compress this route's responses."""
+    endpoint.no_compression = True
+    return endpoint
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Best supported coding in an Accept-Encoding header: "br", "gzip" or None."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+
+    def allowed(coding: str) -> bool:
+        return accepted.get(coding, accepted.get("*", 0.0)) > 0
+
+    if brotli is not None and allowed("br"):
+        return "br"
+    if allowed("gzip"):
+        return "gzip"
+    return None
+
+
+class GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip container
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.process(data) + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class CompressionMiddleware:
+    """ASGI middleware: gzip/brotli response bodies above a size threshold."""
+
+    def __init__(self, app, minimum_size: Optional[int] = None,
+                 gzip_level: Optional[int] = None, brotli_quality: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.gzip_level = settings.COMPRESSION_GZIP_LEVEL if gzip_level is None else gzip_level
+        self.brotli_quality = settings.COMPRESSION_BROTLI_QUALITY if brotli_quality is None else brotli_quality
+
+    def encoder(self, coding: str):
+        return BrotliEncoder(self.brotli_quality) if coding == "br" else GzipEncoder(self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        encoder = None
+
+        def skip(message, headers: MutableHeaders) -> bool:
+            content_type = headers.get("content-type", "").lower()
+            return (
+                message["status"] in UNCOMPRESSED_STATUS
+                or "content-encoding" in headers
+                or content_type.startswith(EXCLUDED_CONTENT_TYPES)
+                or getattr(scope.get("endpoint"), "no_compression", False)
+            )
+
+        async def send_compressed(message):
+            nonlocal start_message, encoder
+            message_type = message["type"]
+            if message_type == "http.response.start":
+                # Held back until the first body chunk decides the encoding
+                start_message = message
+                return
+            if message_type != "http.response.body":
+                if start_message is not None:
+                    await send(start_message)
+                    start_message = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                start, start_message = start_message, None
+                start["headers"] = list(start.get("headers", []))
+                headers = MutableHeaders(raw=start["headers"])
+                if skip(start, headers) or (not more_body and len(body) < self.minimum_size):
+                    await send(start)
+                    await send(message)
+                    return
+
+                encoder = self.encoder(coding)
+                with timing_service.span("compress"):
+                    compressed = encoder.compress(body, final=not more_body)
+                headers["content-encoding"] = coding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    if "content-length" in headers:
+                        del headers["content-length"]
+                else:
+                    headers["content-length"] = str(len(compressed))
+                await send(start)
+                await send({**message, "body": compressed})
+                return
+
+            if encoder is not None:
+                message = {**message, "body": encoder.compress(body, final=not more_body)}
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -39,6 +39,40 @@ class Settings(BaseSettings):
     # Swiss Ephemeris data path
     EPHEMERIS_PATH: str = "/usr/share/swisseph"  # Default Linux path
     
+    # Lottery statistics background refresher
+    LOTTERY_REFRESHER_ENABLED: bool = True
+    
+    # Logging (see app/services/logging_service.py)
+    LOG_LEVEL: str = "INFO"  # DEBUG, INFO, WARNING, ERROR or OFF
+    LOG_FORMAT: str = "json"  # json or text
+    LOG_RATE_BURST: int = 20  # Records per message template per window...
+    LOG_RATE_WINDOW: float = 10.0  # ...seconds
+    LOG_SAMPLE_EVERY: int = 100  # Beyond the burst, keep 1 in N
+    
+    # Prometheus metrics: per-worker snapshot directory (default: app/data/metrics)
+    METRICS_DIR: str = ""
+    
+    # Startup warm-up (see app/services/warmup_service.py); /ready is 503 until it finishes
+    WARMUP_ENABLED: bool = True
+    WARMUP_STEPS: str = ""  # Comma-separated subset of steps (default: all)
+    WARMUP_TIMEOUT: float = 60.0  # Seconds before the worker reports ready anyway
+    
+    # Server-Timing response header with per-stage durations (see app/services/timing_service.py).
+    # Off by default: it exposes internal stage names; the histograms are kept either way
+    SERVER_TIMING_ENABLED: bool = False
+    
+    # Response compression (see app/compression.py)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Bytes; smaller bodies are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # Used when the brotli package is installed
+    
+    # Luck history store (see app/services/luck_history_service.py; default: app/data/luck_history.db)
+    LUCK_HISTORY_DB: str = ""
+    
+    # Daily check-in log directory (see app/services/checkin_service.py; default: app/data/checkins)
+    CHECKIN_DIR: str = ""
+    
     # LLM Settings
     USE_LOCAL_LLM: bool = False  # Set to False to use OpenAI/Cloud APIs
     LOCAL_LLM_MODEL: str = "orca-mini-3b-gguf2-q4_0.gguf"
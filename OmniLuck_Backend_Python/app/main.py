@@ -1,25 +1,61 @@
 """
 FastAPI application entry point for Celestial Fortune backend.
 """
+import asyncio
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from app.routes import astrology, luck, signals, ml, auth
 from app.config import settings
+from app.compression import CompressionMiddleware
+from app.services.checkin_service import checkin_service
+from app.services.luck_history_service import luck_history_service
+from app.services.trend_service import trend_service
+from app.services.metrics_service import MetricsMiddleware, metrics_service
+from app.services.timing_service import ServerTimingMiddleware, timing_service
+from app.services.warmup_service import warmup_service
+from app.services.logging_service import get_logger, logging_service
+
+logger = get_logger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
     # Startup
-    print("🌟 Celestial Fortune Backend starting...")
-    print(f"📍 Environment: {settings.ENVIRONMENT}")
+    logger.info("Celestial Fortune Backend starting", extra={"environment": settings.ENVIRONMENT})
+    
+    # Preload expensive resources in the background; /ready reports when done
+    warmup = asyncio.create_task(warmup_service.run())
+    
+    # Personal-trend aggregates: rebuilt from the check-in log, then kept in
+    # step with the other workers' check-ins
+    trend_sync = asyncio.create_task(trend_service.run_sync())
+    
+    # Event-loop lag sampling (also flushes this worker's metrics snapshot)
+    loop_monitor = asyncio.create_task(metrics_service.monitor_event_loop())
+    
+    # Keep lottery statistics fresh in the background (requests never fetch them)
+    refresher = None
+    if settings.LOTTERY_REFRESHER_ENABLED:
+        from app.services.lottery_stats_service import lottery_stats_service
+        refresher = asyncio.create_task(lottery_stats_service.run_refresh_scheduler())
     
     yield
     
     # Shutdown
-    print("🌙 Celestial Fortune Backend shutting down...")
+    logger.info("Celestial Fortune Backend shutting down")
+    for task in (warmup, trend_sync, refresher, loop_monitor):
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    luck_history_service.close()  # Writes the queued scores
+    checkin_service.close()  # ...and check-ins
+    metrics_service.close()  # This worker's counters leave /metrics with it
+    logging_service.shutdown()
 
 
 app = FastAPI(
@@ -44,8 +80,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# gzip/brotli for large bodies (inside Server-Timing, so its total includes it)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Per-stage timings -> Server-Timing header (the histograms are recorded regardless)
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Request latency per route -> /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(astrology.router, prefix="/api/astrology", tags=["Astrology"])
@@ -59,4 +107,20 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    """Liveness (always 200); `ready` turns true once the warm-up has finished"""
+    return {"status": "healthy" if warmup_service.ready else "warming", "ready": warmup_service.ready}
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness for load balancers: 503 until this worker has warmed up"""
+    return JSONResponse(warmup_service.status(), status_code=200 if warmup_service.ready else 503)
+
+@app.get("/debug/timings")
+async def get_timings():
+    """Per-stage latency summary (count, mean, approximate p50/p95/p99) since startup"""
+    return timing_service.summary()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics (all workers)"""
+    return PlainTextResponse(metrics_service.render(), media_type="text/plain; version=0.0.4")
@@ -2,7 +2,7 @@
 Pydantic models for request/response validation.
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime, date
 
 
@@ -121,9 +121,16 @@ class LuckCalculationRequest(BaseModel):
     date: Optional[str] = None  # Defaults to today
     provided_luck_score: Optional[int] = Field(None, description="Pre-calculated luck score for consistency")
     powerball_count: Optional[int] = Field(5, ge=1, le=50, description="Number of Powerball lines to generate")
+    powerball_mode: Optional[Literal["independent", "wheel"]] = Field("independent", description="'independent' or 'wheel' (coverage-optimized lines)")
 
 
 
+class LuckBatchRequest(BaseModel):
+    """Bulk luck scoring for many users in one request"""
+    requests: List[LuckCalculationRequest] = Field(..., min_length=1, max_length=5000)
+    include_ai: bool = Field(False, description="Also run the AI pillar (one LLM call per user)")
+
+
 class LuckComponents(BaseModel):
     """Breakdown of luck score components"""
     base_numerology: int = Field(..., ge=0, le=100)
@@ -148,6 +155,42 @@ class LotteryResponse(BaseModel):
     daily_powerballs: List[PowerballNumbers] = Field(default_factory=list, description="10 daily powerball combinations")
 
 
+class BulkPowerballRequest(BaseModel):
+    """Request for a large batch of deterministic daily Powerball lines"""
+    name: str = "User"
+    dob: str  # YYYY-MM-DD
+    date: Optional[str] = None  # Defaults to today
+    luck_score: int = Field(70, ge=0, le=100)
+    astro_score: int = Field(50, ge=0, le=100)
+    count: int = Field(1000, ge=1, le=100000, description="Number of distinct lines to generate")
+    seed: Optional[int] = Field(None, ge=0, description="Overrides the profile-derived seed")
+
+
+class WheelRequest(BaseModel):
+    """Request for coverage-optimized (wheeled) Powerball lines"""
+    name: str = "User"
+    dob: str  # YYYY-MM-DD
+    date: Optional[str] = None  # Defaults to today
+    luck_score: int = Field(70, ge=0, le=100)
+    astro_score: int = Field(50, ge=0, le=100)
+    count: int = Field(10, ge=1, le=100, description="Number of lines")
+    pool: Optional[List[int]] = Field(None, min_length=5, max_length=20, description="Lucky white balls to wheel (defaults to today's daily balls)")
+    pool_size: int = Field(15, ge=5, le=20, description="Size of the default pool")
+    cover: Literal["pair", "triple"] = Field("pair", description="'pair' or 'triple' coverage")
+
+
+class TicketLine(BaseModel):
+    """A single Powerball line to check against history"""
+    white_balls: List[int] = Field(..., description="5 white balls (1-69)")
+    powerball: int = Field(..., description="Red powerball (1-26; up to 39 matches pre-2015 draws)")
+
+
+class TicketCheckRequest(BaseModel):
+    """Lines to score against the full Powerball draw history"""
+    lines: List[TicketLine] = Field(..., min_length=1, max_length=10000)
+    include_dates: bool = Field(True, description="List dates where the exact 5 white balls were drawn")
+
+
 class LuckCalculationResponse(BaseModel):
     luck_score: int = Field(..., ge=0, le=100)
     components: LuckComponents
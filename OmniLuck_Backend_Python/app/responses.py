@@ -0,0 +1,74 @@
+"""
+Fast JSON responses for the heavy routers (luck, lottery, astrology).
+
+FastAPI's default path turns a response into plain Python objects
+(jsonable_encoder / model_dump) and then runs stdlib json over them, which is
+slow for nested aspect lists, 365-day trajectories and 100-line powerball
+payloads. FastJSONResponse instead:
+
+- dumps Pydantic models straight to JSON bytes (model_dump_json, pydantic-core)
+- dumps everything else with orjson when it is installed (numpy arrays and
+  scalars, dates and non-str keys included), else with stdlib json plus the
+  same fallback hook, so both paths produce the same bytes
+
+Opt in per router with `APIRouter(default_response_class=FastJSONResponse)`,
+or return `FastJSONResponse(model)` from a handler to skip FastAPI's own
+response serialization entirely.
+"""
+import json
+import sys
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # Optional: stdlib json fallback
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """Hook for types the serializer does not know (models nested in dicts, numpy, sets, ...)."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if _is_numpy(value):
+        return value.tolist()
+    return jsonable_encoder(value)
+
+
+def _is_numpy(value: Any) -> bool:
+    """numpy array or scalar (checked without importing numpy at startup)."""
+    return type(value).__module__ == "numpy" and hasattr(value, "tolist")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize a response body (model, dict, list, ...) to compact JSON bytes."""
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+    try:
+        return _stdlib_dumps(content)
+    except TypeError:
+        # Non-str keys (dates, ...): let jsonable_encoder convert them
+        numpy = sys.modules.get("numpy")
+        custom_encoder = {numpy.ndarray: numpy.ndarray.tolist, numpy.generic: numpy.generic.tolist} if numpy else {}
+        return _stdlib_dumps(jsonable_encoder(content, custom_encoder=custom_encoder))
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps() (same media type and output shape)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -8,9 +8,9 @@ from app.models.schemas import (
     NatalChartResponse,
     DailyTransitsResponse
 )
-from app.services.astrology_service import astrology_service
+from app.responses import FastJSONResponse
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 
 
 @router.post("/natal-chart", response_model=NatalChartResponse)
@@ -30,9 +30,11 @@ async def calculate_natal_chart(birth_info: BirthInfo):
     - House cusps
     - Overall chart strength score
     """
+    from app.services.astrology_service import astrology_service
+    
     try:
         chart = astrology_service.calculate_natal_chart(birth_info)
-        return chart
+        return FastJSONResponse(chart)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to calculate natal chart: {str(e)}")
 
@@ -51,6 +53,8 @@ async def calculate_daily_transits(natal_chart: NatalChartResponse, date: str =
     - Aspects between transit and natal planets
     - Overall influence score
     """
+    from app.services.astrology_service import astrology_service
+    
     try:
         if date:
             target_date = datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
@@ -58,7 +62,7 @@ async def calculate_daily_transits(natal_chart: NatalChartResponse, date: str =
             target_date = datetime.now(timezone.utc)
         
         transits = astrology_service.calculate_daily_transits(target_date, natal_chart)
-        return transits
+        return FastJSONResponse(transits)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
     except Exception as e:
@@ -4,6 +4,10 @@ import httpx
 import json
 import os
 
+from app.services.metrics_service import metrics_service
+from app.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
@@ -19,7 +23,7 @@ class LoginRequest(BaseModel):
 async def login(request: LoginRequest):
     email_to_use = request.email
     
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(transport=metrics_service.transport()) as client:
         # 1. Resolve Username
         if "@" not in request.email:
             query_url = f"https://firestore.googleapis.com/v1/projects/{FIREBASE_PROJECT_ID}/databases/(default)/documents:runQuery"
@@ -52,7 +56,7 @@ async def login(request: LoginRequest):
                 else:
                     raise HTTPException(status_code=404, detail="No account found with this username")
             except httpx.RequestError as e:
-                print(f"Username query error: {e}")
+                logger.warning("Username query error", extra={"error": str(e)})
                 raise HTTPException(status_code=404, detail="No account found with this username")
 
         # 2. Auth with Google
@@ -132,7 +136,7 @@ async def signup(request: SignupRequest):
         "returnSecureToken": True
     }
     
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(transport=metrics_service.transport()) as client:
         try:
             resp = await client.post(auth_url, json=payload)
             
@@ -175,7 +179,7 @@ async def signup(request: SignupRequest):
             fs_resp = await client.post(firestore_url, json=user_data, headers=headers)
             
             if fs_resp.status_code not in [200, 201]:
-                print(f"Firestore Create Error: {fs_resp.text}")
+                logger.error("Firestore create error", extra={"status": fs_resp.status_code, "body": fs_resp.text})
                 raise HTTPException(status_code=500, detail="Failed to create user profile")
                 
             return {
@@ -200,7 +204,7 @@ async def reset_password(request: ResetPasswordRequest):
         "email": request.email
     }
     
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(transport=metrics_service.transport()) as client:
         try:
             resp = await client.post(auth_url, json=payload)
             if resp.status_code != 200:
@@ -218,7 +222,7 @@ class DeleteAccountRequest(BaseModel):
 
 @router.post("/delete")
 async def delete_account(request: DeleteAccountRequest):
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(transport=metrics_service.transport()) as client:
         # 1. Lookup UID
         lookup_url = f"https://identitytoolkit.googleapis.com/v1/accounts:lookup?key={FIREBASE_WEB_API_KEY}"
         lookup_resp = await client.post(lookup_url, json={"idToken": request.idToken})
@@ -3,12 +3,23 @@ Enhanced Luck Calculation API endpoints.
 Combines numerology, astrology, and cosmic signals.
 """
 from fastapi import APIRouter, HTTPException, Body
+from fastapi.responses import StreamingResponse
+from contextvars import copy_context
 from datetime import datetime
 from typing import Optional, Dict
-from app.models.schemas import LuckCalculationRequest, LuckCalculationResponse, LuckComponents, LotteryResponse
+from app.compression import no_compression
+from app.responses import FastJSONResponse, dumps
+from app.models.schemas import LuckCalculationRequest, LuckCalculationResponse, LuckBatchRequest, LuckComponents, LotteryResponse, TicketCheckRequest, BulkPowerballRequest, WheelRequest
 from app.services.llm_service import llm_service
+from app.services.luck_history_service import MAX_DAYS as MAX_HISTORY_DAYS, luck_history_service
+from app.services.timing_service import timing_service
+from app.services.logging_service import get_logger
 
-router = APIRouter()
+logger = get_logger(__name__)
+
+# Large payloads (aspects, powerball lines, trajectories); handlers returning
+# a response model wrap it in FastJSONResponse directly. See app/responses.py
+router = APIRouter(default_response_class=FastJSONResponse)
 
 
 @router.post("/calculate", response_model=LuckCalculationResponse)
@@ -33,7 +44,7 @@ async def calculate_luck(request: LuckCalculationRequest):
             signals = await signals_service.get_all_signals(lat, lon)
             return signals.total_influence_score, signals.dict()
         except Exception as e:
-            print(f"⚠️ Signals Error: {e}")
+            logger.warning("Signals error", extra={"error": str(e)})
             return 50, {}
     
     async def calculate_astrology():
@@ -46,16 +57,16 @@ async def calculate_luck(request: LuckCalculationRequest):
             try:
                 # Infer timezone from birth coordinates
                 try:
-                    from timezonefinder import TimezoneFinder
-                    tf = TimezoneFinder()
-                    birth_timezone = tf.timezone_at(lat=request.birth_lat, lng=request.birth_lon)
+                    from app.services.astrology_service import timezone_finder
+                    with timing_service.span("timezone"):
+                        birth_timezone = timezone_finder().timezone_at(lat=request.birth_lat, lng=request.birth_lon)
                 except Exception as e:
-                    print(f"⚠️ Timezone detection failed (fallback to UTC): {e}")
+                    logger.warning("Timezone detection failed (fallback to UTC)", extra={"error": str(e)})
                     birth_timezone = "UTC"
                 
                 if not birth_timezone:
                     birth_timezone = "UTC"  # Fallback
-                print(f"📍 Birth timezone inferred: {birth_timezone}")
+                logger.debug("Birth timezone inferred", extra={"timezone": birth_timezone})
                 
                 birth_info = BirthInfo(
                     dob=request.dob,
@@ -78,16 +89,17 @@ async def calculate_luck(request: LuckCalculationRequest):
                     "aspects": transits_result.aspects
                 }
             except Exception as e:
-                print(f"⚠️ Astrology Error: {e}")
+                logger.warning("Astrology error", extra={"error": str(e)})
         
         return astro_score, natal_score, astro_data
     
     async def calculate_numerology():
         try:
-            numerology_result = numerology_service.calculate_daily_score(request.dob, request.name)
+            with timing_service.span("numerology"):
+                numerology_result = numerology_service.calculate_daily_score(request.dob, request.name, request.date)
             return numerology_result["numerology_score"], numerology_result
         except Exception as e:
-            print(f"⚠️ Numerology Error: {e}")
+            logger.warning("Numerology error", extra={"error": str(e)})
             return 50, {}
     
     # Execute all calculations in PARALLEL (massive speedup!)
@@ -126,6 +138,7 @@ async def calculate_luck(request: LuckCalculationRequest):
     loop = asyncio.get_running_loop()
     ai_result = await loop.run_in_executor(
         None,
+        copy_context().run,  # Keep this request's timing spans
         lambda: llm_service.analyze_luck_and_generate_content(
             user_data=user_context,
             cosmic_signals=signals_dict,
@@ -158,7 +171,7 @@ async def calculate_luck(request: LuckCalculationRequest):
         f"AI Intuition ({ai_intuition_score}/100)"
     )
 
-    return LuckCalculationResponse(
+    response = LuckCalculationResponse(
         luck_score=int(final_score),
         components=LuckComponents(
             astrology_score=astro_score,
@@ -178,34 +191,292 @@ async def calculate_luck(request: LuckCalculationRequest):
         personal_powerball=None,
         daily_powerballs=[]
     )
+    luck_history_service.record(request.uid, response, source="calculate", day=request.date)
+    return FastJSONResponse(response)
+
+
+@router.post("/calculate:batch")
+@no_compression
+async def calculate_luck_batch(request: LuckBatchRequest):
+    """
+    Score many users in one request (e.g. the morning notification run).
+    Transits, lunar phase, Kp and weather tiles are computed once per batch;
+    numerology is vectorized. The AI pillar is skipped unless include_ai is
+    set (its 10% weight then uses the neutral default).
+    
+    Streams NDJSON, one line per user:
+    {"index": 0, "uid": "...", "result": {...LuckCalculationResponse}}
+    or {"index": 0, "uid": "...", "error": "..."}
+    
+    Not compressed: rows trickle out as users finish (AI calls), and clients
+    read them as they arrive.
+    """
+    from app.services.batch_luck_service import batch_luck_service
+    
+    async def rows():
+        async for row in batch_luck_service.score(request.requests, include_ai=request.include_ai):
+            if "result" in row:
+                day = request.requests[row["index"]].date
+                luck_history_service.record(row["uid"], row["result"], source="batch", day=day)
+            yield dumps(row) + b"\n"
+    
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
 
 
 @router.get("/lottery/stats")
-async def get_lottery_stats():
+async def get_lottery_stats(window: Optional[str] = None):
     """
     Get live Powerball statistics including hot/cold numbers.
-    Data is fetched from official NY State API and cached until next drawing.
+    Data is synced from the official NY State API in the background after each drawing.
+    
+    Args:
+    - window: Optional analysis window - number of recent draws (e.g. 10, 50,
+      100, 500) or "all" for every draw under the current 5/69 + 1/26 matrix
+      (since 2015-10-07; older draws used other ball ranges). Adds per-ball
+      frequency, last-seen gaps and rolling-window stats for that window.
     """
     from app.services.lottery_stats_service import lottery_stats_service
-    stats = await lottery_stats_service.get_live_stats()
-    return stats
+    if window is None:
+        return await lottery_stats_service.get_live_stats()
+    
+    if window.lower() == "all":
+        size = None
+    else:
+        try:
+            size = int(window)
+        except ValueError:
+            size = 0
+        if size < 1:
+            raise HTTPException(status_code=400, detail="window must be a positive integer or 'all'")
+    
+    return await lottery_stats_service.get_window_stats(window=size)
 
 
 @router.get("/lottery/history")
-async def get_lottery_history(limit: int = 20):
+async def get_lottery_history(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    balls: Optional[str] = None,
+    powerball: Optional[int] = None,
+    order: str = "desc",
+    format: str = "json"
+):
     """
-    Get recent Powerball drawing history with smart caching.
-    Cache refreshes only after new drawings (Mon/Wed/Sat at 11 PM ET).
+    Get Powerball drawing history from the full local archive (since 2010).
+    Refreshed in the background after new drawings (Mon/Wed/Sat at 11 PM ET).
     
-    Returns:
-    - drawings: List of recent drawings with white_balls, powerball, date
-    - last_updated: When data was last refreshed
-    - next_refresh: When cache will refresh (after next drawing)
-    - cached: Whether data came from cache
+    Args:
+    - limit: Page size (1-500)
+    - cursor: next_cursor from the previous page
+    - start_date / end_date: Inclusive YYYY-MM-DD range
+    - balls: Comma-separated white balls that must all be drawn (e.g. "7,23")
+    - powerball: Only draws with this Powerball
+    - order: "desc" (newest first) or "asc"
+    - format: "json" (paginated), or "ndjson" / "csv" to stream every match
+    
+    Returns (json):
+    - drawings: List of drawings with white_balls, powerball, date
+    - next_cursor: Cursor for the next page (null on the last page)
+    - total: Number of drawings matching the filters
+    - last_updated / next_refresh / cached
     """
     from app.services.lottery_stats_service import lottery_stats_service
-    history = await lottery_stats_service.get_historical_drawings(limit=min(limit, 100))
-    return history
+    from app.services.history_service import history_service, MAX_PAGE_SIZE
+    from app.services.draw_store import date_to_day, POWERBALL_MAX_EVER
+    
+    if order not in ("desc", "asc"):
+        raise HTTPException(status_code=400, detail="order must be 'desc' or 'asc'")
+    if format not in ("json", "ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'json', 'ndjson' or 'csv'")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    for value in (cursor, start_date, end_date):
+        if value is not None:
+            try:
+                date_to_day(value)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+    try:
+        ball_list = sorted({int(b) for b in balls.split(",") if b.strip()}) if balls else []
+    except ValueError:
+        raise HTTPException(status_code=400, detail="balls must be comma-separated numbers")
+    if len(ball_list) > 5 or any(not 1 <= b <= 69 for b in ball_list):
+        raise HTTPException(status_code=400, detail="balls must be up to 5 white balls between 1 and 69")
+    if powerball is not None and not 1 <= powerball <= POWERBALL_MAX_EVER:
+        raise HTTPException(status_code=400, detail=f"powerball must be between 1 and {POWERBALL_MAX_EVER}")
+    
+    if format == "json":
+        return await lottery_stats_service.get_historical_drawings(
+            limit=limit, cursor=cursor, start_date=start_date, end_date=end_date,
+            balls=ball_list, powerball=powerball, order=order
+        )
+    
+    # Streamed export of every matching draw
+    await lottery_stats_service.check_history_freshness()
+    indices = history_service.find(start_date, end_date, ball_list, powerball)
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        history_service.export(indices, fmt=format, order=order),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=powerball_history.{format}"}
+    )
+
+
+@router.get("/lottery/companions/{ball}")
+async def get_lottery_companions(ball: int, k: int = 10, with_ball: Optional[int] = None):
+    """
+    Get the white balls most often drawn together with a given ball.
+    Served from the precomputed pair/triple co-occurrence index over the
+    current 5/69 matrix draws (since 2015-10-07).
+    
+    Args:
+    - ball: White ball (1-69)
+    - k: Number of companions to return (default 10)
+    - with_ball: Optional second ball - returns the best third balls for the pair
+    
+    Returns:
+    - companions: List of {ball, count}, most frequent first
+    """
+    from app.services.cooccurrence_service import cooccurrence_service
+    
+    for b in (ball, with_ball):
+        if b is not None and not 1 <= b <= 69:
+            raise HTTPException(status_code=400, detail="Balls must be between 1 and 69")
+    if with_ball == ball:
+        raise HTTPException(status_code=400, detail="with_ball must differ from ball")
+    if not 1 <= k <= 68:
+        raise HTTPException(status_code=400, detail="k must be between 1 and 68")
+    
+    return {
+        "ball": ball,
+        "with_ball": with_ball,
+        "companions": cooccurrence_service.top_companions(ball, k=k, with_ball=with_ball)
+    }
+
+
+@router.post("/lottery/check")
+async def check_lottery_lines(request: TicketCheckRequest):
+    """
+    Check Powerball lines against every historical drawing.
+    Works for generated lines (personal/daily powerballs) or user-supplied picks.
+    Draws before 2015-10-07 are scored under their own matrix (Powerball up to
+    39, then 35) and paid from that matrix's prize table.
+    
+    Returns:
+    - matrices: Draws checked per matrix ({matrix, from, draws})
+    - results, per line:
+      - tiers: How many times each prize tier would have been hit
+      - wins_by_matrix: The same hits split by matrix
+      - best_tier / best_date: Best result and when it happened
+      - fixed_prize_total: Sum of fixed prizes won (jackpots counted in tiers)
+      - exact_white_hits: Dates the exact 5 white balls were drawn
+    """
+    import asyncio
+    from app.services.match_service import match_service
+    
+    lines = [line.model_dump() for line in request.lines]
+    for line in lines:
+        error = match_service.validate_line(line)
+        if error:
+            raise HTTPException(status_code=400, detail=error)
+    
+    # Up to 10k lines of index lookups - keep them off the event loop
+    return await asyncio.get_running_loop().run_in_executor(
+        None,
+        copy_context().run,  # Keep this request's timing spans
+        lambda: match_service.check_lines(lines, include_dates=request.include_dates)
+    )
+
+
+@router.post("/lottery/bulk")
+async def generate_bulk_lottery(request: BulkPowerballRequest):
+    """
+    Generate up to 100k distinct, balanced daily Powerball lines for one profile.
+    Deterministic: the same profile, date and seed always give the same lines.
+    
+    Streams NDJSON, one line per row, as each batch is generated:
+    {"index": 1, "white_balls": [...], "powerball": 7}
+    """
+    import asyncio
+    from app.services.powerball_service import powerball_service
+    
+    current_date = request.date or datetime.now().strftime("%Y-%m-%d")
+    chunks = powerball_service.iter_bulk_powerballs(
+        name=request.name,
+        dob=request.dob,
+        current_date=current_date,
+        luck_score=request.luck_score,
+        astro_score=request.astro_score,
+        num_lines=request.count,
+        seed=request.seed
+    )
+    
+    def next_rows(start: int):
+        """Generate and format the next chunk (in a worker thread); None when done."""
+        chunk = next(chunks, None)
+        if chunk is None:
+            return None
+        white, powerball = chunk[0].tolist(), chunk[1].tolist()
+        return len(white), "".join(
+            f'{{"index": {start + i + 1}, "white_balls": [{w[0]}, {w[1]}, {w[2]}, {w[3]}, {w[4]}], "powerball": {pb}}}\n'
+            for i, (w, pb) in enumerate(zip(white, powerball))
+        )
+    
+    async def rows():
+        loop = asyncio.get_running_loop()
+        start = 0
+        while True:
+            result = await loop.run_in_executor(None, copy_context().run, next_rows, start)
+            if result is None:
+                return
+            count, text = result
+            start += count
+            yield text
+    
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+@router.post("/lottery/wheel")
+async def generate_lottery_wheel(request: WheelRequest):
+    """
+    Generate lines that cover as many distinct pairs (or triples) of the
+    user's lucky pool as possible, instead of overlapping independent lines.
+    
+    Returns:
+    - lines: Wheeled Powerball lines
+    - coverage: Covered vs total pairs/triples of the pool
+    """
+    import asyncio
+    from app.services.powerball_service import powerball_service
+    
+    if request.pool is not None:
+        if any(not 1 <= b <= 69 for b in request.pool):
+            raise HTTPException(status_code=400, detail="Pool balls must be between 1 and 69")
+        if len(set(request.pool)) < 5:
+            raise HTTPException(status_code=400, detail="Pool needs at least 5 distinct balls")
+    
+    # Greedy search + local search is CPU-bound - keep it off the event loop
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            None,
+            copy_context().run,  # Keep this request's timing spans
+            lambda: powerball_service.generate_wheel_powerballs(
+                name=request.name,
+                dob=request.dob,
+                current_date=request.date or datetime.now().strftime("%Y-%m-%d"),
+                luck_score=request.luck_score,
+                astro_score=request.astro_score,
+                num_lines=request.count,
+                pool=request.pool,
+                pool_size=request.pool_size,
+                cover=request.cover
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/lottery", response_model=LuckCalculationResponse)
@@ -213,22 +484,17 @@ async def calculate_lottery(request: LuckCalculationRequest):
     """
     Calculate Lucky Powerball Numbers with FULL 6-Pillar Analysis.
     Returns comprehensive luck data + lottery numbers.
-    Now uses LIVE hot/cold statistics from official Powerball data!
+    Uses LIVE hot/cold statistics from official Powerball data (refreshed in the background)!
     """
     import asyncio
     from app.services.astrology_service import astrology_service
     from app.services.signals_service import signals_service
     from app.services.numerology_service import numerology_service
     from app.services.powerball_service import powerball_service
-    from app.services.lottery_stats_service import lottery_stats_service
     from app.models.schemas import BirthInfo
 
-    # 🔄 Refresh lottery statistics (will use cache if recent)
-    try:
-        await lottery_stats_service.get_live_stats()
-        print("📊 Lottery stats refreshed for number generation")
-    except Exception as e:
-        print(f"⚠️ Stats refresh failed, using fallback: {e}")
+    # Lottery statistics are kept fresh by the background refresher (see app
+    # lifespan) - number generation reads the current snapshot, never the API
 
     # --- 1. Define Calculation Functions (Same as calculate_luck) ---
     async def fetch_signals():
@@ -238,7 +504,7 @@ async def calculate_lottery(request: LuckCalculationRequest):
             signals = await signals_service.get_all_signals(lat, lon)
             return signals.total_influence_score, signals.dict()
         except Exception as e:
-            print(f"⚠️ Signals Error: {e}")
+            logger.warning("Signals error", extra={"error": str(e)})
             return 50, {}
     
     async def calculate_astrology():
@@ -249,9 +515,9 @@ async def calculate_lottery(request: LuckCalculationRequest):
         
         if request.birth_lat and request.birth_lon:
                 # Infer timezone from birth coordinates
-                from timezonefinder import TimezoneFinder
-                tf = TimezoneFinder()
-                birth_timezone = tf.timezone_at(lat=request.birth_lat, lng=request.birth_lon)
+                from app.services.astrology_service import timezone_finder
+                with timing_service.span("timezone"):
+                    birth_timezone = timezone_finder().timezone_at(lat=request.birth_lat, lng=request.birth_lon)
                 if not birth_timezone:
                     birth_timezone = "UTC"  # Fallback
                 
@@ -280,10 +546,11 @@ async def calculate_lottery(request: LuckCalculationRequest):
     
     async def calculate_numerology():
         try:
-            numerology_result = numerology_service.calculate_daily_score(request.dob, request.name)
+            with timing_service.span("numerology"):
+                numerology_result = numerology_service.calculate_daily_score(request.dob, request.name, request.date)
             return numerology_result["numerology_score"], numerology_result
         except Exception as e:
-            print(f"⚠️ Numerology Error: {e}")
+            logger.warning("Numerology error", extra={"error": str(e)})
             return 50, {}
 
     # --- 2. Execute Parallel Calculations ---
@@ -317,6 +584,7 @@ async def calculate_lottery(request: LuckCalculationRequest):
     loop = asyncio.get_running_loop()
     ai_result = await loop.run_in_executor(
         None,
+        copy_context().run,  # Keep this request's timing spans
         lambda: llm_service.analyze_luck_and_generate_content(
             user_data=user_context,
             cosmic_signals=signals_dict,
@@ -344,17 +612,33 @@ async def calculate_lottery(request: LuckCalculationRequest):
             name=request.name,
             dob=request.dob
         )
-        daily_powerballs = powerball_service.generate_daily_powerballs(
-            name=request.name,
-            dob=request.dob,
-            current_date=datetime.now().strftime("%Y-%m-%d"),
-            luck_score=final_score,
-            astro_score=astro_score,
-            natal_score=natal_score,
-            num_lines=request.powerball_count or 5
-        )
+        if request.powerball_mode == "wheel":
+            wheel = await asyncio.get_running_loop().run_in_executor(
+                None,
+                copy_context().run,  # Keep this request's timing spans
+                lambda: powerball_service.generate_wheel_powerballs(
+                    name=request.name,
+                    dob=request.dob,
+                    current_date=datetime.now().strftime("%Y-%m-%d"),
+                    luck_score=final_score,
+                    astro_score=astro_score,
+                    natal_score=natal_score,
+                    num_lines=request.powerball_count or 5
+                )
+            )
+            daily_powerballs = wheel["lines"]
+        else:
+            daily_powerballs = powerball_service.generate_daily_powerballs(
+                name=request.name,
+                dob=request.dob,
+                current_date=datetime.now().strftime("%Y-%m-%d"),
+                luck_score=final_score,
+                astro_score=astro_score,
+                natal_score=natal_score,
+                num_lines=request.powerball_count or 5
+            )
     except Exception as e:
-        print(f"⚠️ Powerball Gen Error: {e}")
+        logger.warning("Powerball generation error", extra={"error": str(e)})
 
     # --- 6. Construct Response ---
     factors_summary = (
@@ -365,7 +649,7 @@ async def calculate_lottery(request: LuckCalculationRequest):
         f"AI Intuition ({ai_intuition_score}/100)"
     )
 
-    return LuckCalculationResponse(
+    response = LuckCalculationResponse(
         luck_score=final_score,
         components=LuckComponents(
             astrology_score=astro_score,
@@ -385,29 +669,39 @@ async def calculate_lottery(request: LuckCalculationRequest):
         personal_powerball=personal_powerball,
         daily_powerballs=daily_powerballs
     )
+    luck_history_service.record(request.uid, response, source="lottery", day=request.date)
+    return FastJSONResponse(response)
 
 
 @router.get("/history/{uid}")
 async def get_luck_history(uid: str, days: int = 30):
     """
-    Get user's historical luck scores.
+    Get user's historical luck scores (every /calculate, /lottery and batch
+    result is stored; see luck_history_service).
     
     Args:
     - uid: User ID
-    - days: Number of days to retrieve (default 30)
+    - days: Number of days to retrieve, today included (default 30, max 3650)
     
     Returns:
-    - List of daily luck scores with dates
+    - List of daily luck scores with dates, newest first (a day's latest
+      calculation; days without one are omitted)
     """
-    # TODO: Implement with Firestore integration
+    import asyncio
+    
+    if not 1 <= days <= MAX_HISTORY_DAYS:
+        raise HTTPException(status_code=400, detail=f"days must be between 1 and {MAX_HISTORY_DAYS}")
+    
+    # SQLite read - keep it off the event loop
+    history = await asyncio.get_running_loop().run_in_executor(
+        None,
+        copy_context().run,  # Keep this request's timing spans
+        lambda: luck_history_service.history(uid, days)
+    )
     return {
         "uid": uid,
         "days": days,
-        "history": [
-            {"date": "2025-12-11", "score": 75},
-            {"date": "2025-12-10", "score": 68},
-            {"date": "2025-12-09", "score": 82},
-        ]
+        "history": history,
     }
 
 
@@ -430,9 +724,9 @@ async def get_forecast(request: LuckCalculationRequest):
 
     # Infer timezone from birth coordinates
     # Infer timezone from birth coordinates
-    from timezonefinder import TimezoneFinder
-    tf = TimezoneFinder()
-    birth_timezone = tf.timezone_at(lat=request.birth_lat, lng=request.birth_lon)
+    from app.services.astrology_service import timezone_finder
+    with timing_service.span("timezone"):
+        birth_timezone = timezone_finder().timezone_at(lat=request.birth_lat, lng=request.birth_lon)
     if not birth_timezone:
         birth_timezone = request.timezone or "UTC"
     
@@ -459,22 +753,30 @@ async def get_forecast(request: LuckCalculationRequest):
     # Calculate Forecast with full weighted formula
     raw_forecast = astrology_service.calculate_weekly_forecast(natal_chart)
     
+    # Numerology scores for the whole horizon in one vectorized call
+    forecast_dates = [day['date'] for day in raw_forecast]  # Format: YYYY-MM-DD
+    try:
+        numero_scores = numerology_service.calculate_daily_scores(
+            request.dob, request.name, forecast_dates
+        )["numerology_score"].tolist()
+    except Exception:
+        # Day by day, so only the day that fails falls back
+        numero_scores = []
+        for future_date in forecast_dates:
+            try:
+                numero_result = numerology_service.calculate_daily_score(request.dob, request.name, future_date)
+                numero_scores.append(numero_result["numerology_score"])
+            except Exception:
+                numero_scores.append(50)  # Fallback
+    
     trajectory = []
     max_score = -1
     best_date = ""
     
-    for day in raw_forecast:
+    for day, numero_score in zip(raw_forecast, numero_scores):
         # Get astrology transit score for this day
         astro_score = day['transits_score']
         
-        # Calculate numerology score for this specific date
-        try:
-            future_date = day['date']  # Format: YYYY-MM-DD
-            numero_result = numerology_service.calculate_daily_score(request.dob, request.name, future_date)
-            numero_score = numero_result["numerology_score"]
-        except Exception:
-            numero_score = 50  # Fallback
-        
         # Apply OmniLuck Edge weighted formula (40/20/15/15/10)
         weighted_score = (
             (astro_score * 0.40) +
@@ -507,8 +809,8 @@ async def get_forecast(request: LuckCalculationRequest):
     else:
         direction = "Stable"
         
-    return ForecastResponse(
+    return FastJSONResponse(ForecastResponse(
         trajectory=trajectory,
         trend_direction=direction,
         best_day=best_date
-    )
+    ))
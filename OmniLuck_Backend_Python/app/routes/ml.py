@@ -8,6 +8,8 @@ from app.models.schemas import (
     DailyCheckInResponse,
     PersonalTrendResponse
 )
+from app.services.checkin_service import checkin_service
+from app.services.trend_service import day_number, trend_service
 
 router = APIRouter()
 
@@ -27,15 +29,26 @@ async def submit_daily_checkin(checkin: DailyCheckIn):
     
     Returns:
     - Saved check-in with sentiment score
+    
+    Persisted write-behind to the local check-in log (see checkin_service):
+    the response does not wait for the write. The user's trend aggregates
+    are updated at once.
     """
-    # TODO: Implement sentiment analysis and Firestore save
-    # Placeholder response
+    try:
+        day = day_number(checkin.date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="date must be YYYY-MM-DD")
     
     journal_sentiment = None
     if checkin.journal_text:
         # TODO: Use HuggingFace transformers for sentiment
         journal_sentiment = 0.75  # Placeholder
     
+    saved_at = datetime.now()
+    if not checkin_service.submit(checkin, journal_sentiment, saved_at):
+        raise HTTPException(status_code=503, detail="Check-in queue is full, please retry")
+    trend_service.add(checkin.uid, day, checkin.mood_score)
+    
     return DailyCheckInResponse(
         uid=checkin.uid,
         date=checkin.date,
@@ -43,7 +56,7 @@ async def submit_daily_checkin(checkin: DailyCheckIn):
         energy_level=checkin.energy_level,
         mood_tags=checkin.mood_tags,
         journal_sentiment=journal_sentiment,
-        saved_at=datetime.now()
+        saved_at=saved_at
     )
 
 
@@ -53,29 +66,25 @@ async def get_personal_trend(uid: str):
     Get user's personal trend analysis.
     
     Includes:
-    - Average mood over 7 and 30 days
-    - Trend direction
+    - Average mood over the 7 and 30 days up to the latest check-in
+    - Trend direction (improving, stable or declining)
     - Best days of the week
-    - ML model accuracy
+    - ML model accuracy (null until personal models are trained)
+    
+    Read from running aggregates kept up to date by every check-in (see
+    trend_service), not computed from history.
     
     Args:
     - uid: User ID
     
     Returns:
-    - Personal trend data
+    - Personal trend data (404 if the user has no check-ins)
     """
-    # TODO: Implement with Firestore queries and ML analysis
-    # Placeholder response
+    trend = trend_service.trend(uid)
+    if trend is None:
+        raise HTTPException(status_code=404, detail="No check-ins for this user yet")
     
-    return PersonalTrendResponse(
-        uid=uid,
-        avg_mood_7d=7.2,
-        avg_mood_30d=6.8,
-        trend_direction="improving",
-        best_days=["Tuesday", "Friday"],
-        ml_model_accuracy=0.78,
-        total_logs=45
-    )
+    return PersonalTrendResponse(uid=uid, ml_model_accuracy=None, **trend)
 
 
 @router.post("/train-model/{uid}")
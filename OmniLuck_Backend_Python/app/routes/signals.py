@@ -10,7 +10,6 @@ from app.models.schemas import (
     GeomagneticResponse,
     CosmicSignalsResponse
 )
-from app.services.signals_service import signals_service
 
 router = APIRouter()
 
@@ -29,6 +28,8 @@ async def get_lunar_phase(date: Optional[str] = None):
     - Illumination percentage
     - Influence score (0-100)
     """
+    from app.services.signals_service import signals_service
+    
     try:
         target_date = None
         if date:
@@ -60,6 +61,8 @@ async def get_weather(
     - Humidity, pressure
     - Influence score (0-100)
     """
+    from app.services.signals_service import signals_service
+    
     try:
         weather = await signals_service.get_weather(lat, lon)
         return weather
@@ -77,6 +80,8 @@ async def get_geomagnetic():
     - Activity level (quiet, unsettled, active, storm)
     - Influence score (-20 to +20, can be negative during storms)
     """
+    from app.services.signals_service import signals_service
+    
     try:
         geomagnetic = await signals_service.get_geomagnetic_activity()
         return geomagnetic
@@ -103,6 +108,8 @@ async def get_all_signals(
     Returns:
     - Combined response with all signals and total influence score
     """
+    from app.services.signals_service import signals_service
+    
     try:
         target_date = None
         if date:
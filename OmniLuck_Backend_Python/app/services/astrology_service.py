@@ -3,10 +3,13 @@ Astrology calculations using Swiss Ephemeris (pyswisseph).
 Supports both Western and Vedic astrology.
 """
 import swisseph as swe
+import threading
 from datetime import datetime, timezone
 import pytz
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from app.models.schemas import BirthInfo, NatalChartResponse, PlanetPosition, DailyTransitsResponse
+from app.services.metrics_service import metrics_service
+from app.services.timing_service import timing_service
 
 
 # Zodiac sign names (Western)
@@ -39,10 +42,28 @@ ASPECTS = {
 }
 
 
+# One TimezoneFinder per thread: instances are not thread-safe and take
+# tens of milliseconds to build, so each thread keeps its own
+_timezone_finders = threading.local()
+
+
+def timezone_finder():
+    """This thread's TimezoneFinder (birth timezone inference)."""
+    finder = getattr(_timezone_finders, "finder", None)
+    if finder is None:
+        from timezonefinder import TimezoneFinder
+        finder = _timezone_finders.finder = TimezoneFinder()
+    return finder
+
+
 class AstrologyService:
     """Service for astrological calculations"""
     
     def __init__(self):
+        # Latest transit snapshot (moment, positions): every request in the
+        # same minute shares it (see calculate_transit_positions)
+        self._transit_snapshot: Optional[Tuple[datetime, Dict[str, PlanetPosition]]] = None
+        
         # Set ephemeris path (Swiss Ephemeris data files)
         # Default paths: /usr/share/ephe on Linux, custom on Windows/Mac
         try:
@@ -75,6 +96,7 @@ class AstrologyService:
                     return i + 1
         return 1  # Fallback
     
+    @timing_service.timed("natal_chart")
     def calculate_natal_chart(self, birth_info: BirthInfo) -> NatalChartResponse:
         """
         Calculate complete natal chart.
@@ -147,20 +169,21 @@ class AstrologyService:
             computed_at=datetime.now(timezone.utc)
         )
     
-    def calculate_daily_transits(self, date: datetime, natal_chart: NatalChartResponse) -> DailyTransitsResponse:
+    @timing_service.timed("transit_positions")
+    def calculate_transit_positions(self, date: datetime) -> Dict[str, PlanetPosition]:
         """
-        Calculate current planetary transits and aspects to natal chart.
-        
-        Args:
-            date: Date to calculate transits for
-            natal_chart: User's natal chart
-            
-        Returns:
-            DailyTransitsResponse with current positions and aspects
+        Calculate planetary positions at a moment (independent of any natal
+        chart, so one snapshot can be shared across many users).
+        The latest snapshot is kept and reused for the same moment.
         """
+        snapshot = self._transit_snapshot
+        if snapshot is not None and snapshot[0] == date:
+            metrics_service.cache_lookup("transit_snapshot", True)
+            return snapshot[1]
+        metrics_service.cache_lookup("transit_snapshot", False)
+        
         jd = self._datetime_to_jd(date)
         
-        # Calculate current planetary positions
         transit_planets = {}
         for name, planet_id in PLANETS.items():
             result, flags = swe.calc_ut(jd, planet_id)
@@ -176,6 +199,26 @@ class AstrologyService:
                 house=1,  # Not calculated for transits
                 retrograde=speed < 0
             )
+        self._transit_snapshot = (date, transit_planets)
+        return transit_planets
+    
+    @timing_service.timed("transits")
+    def calculate_daily_transits(self, date: datetime, natal_chart: NatalChartResponse,
+                                 transit_planets: Dict[str, PlanetPosition] = None) -> DailyTransitsResponse:
+        """
+        Calculate current planetary transits and aspects to natal chart.
+        
+        Args:
+            date: Date to calculate transits for
+            natal_chart: User's natal chart
+            transit_planets: Precomputed positions for `date` (see calculate_transit_positions)
+            
+        Returns:
+            DailyTransitsResponse with current positions and aspects
+        """
+        # Calculate current planetary positions
+        if transit_planets is None:
+            transit_planets = self.calculate_transit_positions(date)
         
         # Calculate aspects to natal planets
         aspects = self._calculate_aspects(transit_planets, natal_chart.planets)
@@ -317,6 +360,7 @@ class AstrologyService:
             
         return max(10, min(100, int(score)))
     
+    @timing_service.timed("forecast_transits")
     def calculate_weekly_forecast(self, natal_chart: NatalChartResponse, start_date: datetime = None) -> List[Dict]:
         """
         Calculate luck trajectory for the next 7 days based on planetary transits.
@@ -0,0 +1,289 @@
+"""
+Powerball Strategy Backtesting Engine.
+Measures whether our number-generation strategies beat random picks.
+
+Two experiments, both fully offline against the local draw store:
+1. Historical replay - for every drawing under the current 5/69 + 1/26 matrix
+   (since 2015-10-07; older draws used other ball ranges and prizes), each
+   strategy generates its lines using only information available before
+   that drawing, and the lines are scored against the actual result.
+2. Monte Carlo - a fixed pool of lines per strategy is scored against millions
+   of simulated uniform draws, split across a process pool.
+
+Strategies:
+- "delta":    PowerballService.generate_daily_powerballs (Delta spacing)
+- "hot_cold": uniform picks nudged with _apply_statistical_weight's rule,
+              using the hot/cold numbers of the STATS_WINDOW current-matrix
+              draws before each drawing
+- "random":   uniform picks (the baseline)
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from math import comb
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.services.draw_store import CURRENT_ERA, draw_store, day_to_date
+from app.services.match_service import PRIZE_TIERS, CODE_TIER, NO_PRIZE, balls_to_bitsets, shared_balls
+
+WHITE_BALL_MAX = CURRENT_ERA.white_ball_max
+POWERBALL_MAX = CURRENT_ERA.powerball_max
+TICKET_PRICE = 2
+DEFAULT_JACKPOT = 20_000_000  # Starting jackpot, used for expected value
+STATS_WINDOW = 100            # Hot/cold lookback (matches get_live_stats)
+STRATEGIES = ("delta", "hot_cold", "random")
+HOT_COUNT = 16                # Hot/cold list sizes (match calculate_frequency)
+COLD_COUNT = 10
+
+# Draws simulated per task (bounds the lines x draws working set)
+_SIM_CHUNK = 50_000
+
+
+def theoretical_odds() -> Dict[str, float]:
+    """Exact probability of each prize tier for a single random line."""
+    total = comb(WHITE_BALL_MAX, 5) * POWERBALL_MAX
+    odds = {}
+    for tier in PRIZE_TIERS:
+        w = tier["white"]
+        ways = comb(5, w) * comb(WHITE_BALL_MAX - 5, 5 - w) * (1 if tier["powerball"] else POWERBALL_MAX - 1)
+        odds[tier["tier"]] = ways / total
+    return odds
+
+
+def random_lines(rng: np.random.Generator, count: int):
+    """`count` uniform lines -> (white (count x 5) sorted, powerball (count,))."""
+    white = rng.random((count, WHITE_BALL_MAX)).argpartition(5, axis=1)[:, :5] + 1
+    white.sort(axis=1)
+    powerball = rng.integers(1, POWERBALL_MAX + 1, size=count)
+    return white.astype(np.int64), powerball.astype(np.int64)
+
+
+def point_in_time_frequencies(window: int = STATS_WINDOW):
+    """
+    Ball counts as they looked right before each current-matrix draw, over
+    the preceding `window` current-matrix draws. Returns (white (M+1 x 70),
+    powerball (M+1 x 27)) for the M current-matrix draws: row i is the state
+    before draw current_era_start() + i, row M the state after the newest.
+    """
+    base = draw_store.current_era_start()
+    white = np.asarray(draw_store.white_balls[base:], dtype=np.intp)
+    powerball = np.asarray(draw_store.powerballs[base:], dtype=np.intp)[:, None]
+    m = len(white)
+    rows = np.arange(m + 1)
+    starts = np.maximum(rows - window, 0)
+
+    def counts(balls: np.ndarray, columns: int) -> np.ndarray:
+        hits = np.zeros((m, columns), dtype=np.int32)
+        hits[np.arange(m)[:, None], balls] = 1
+        cum = np.concatenate([np.zeros((1, columns), np.int32), hits.cumsum(axis=0)])
+        return cum[rows] - cum[starts]
+
+    return counts(white, WHITE_BALL_MAX + 1), counts(powerball, POWERBALL_MAX + 1)
+
+
+def point_in_time_hot_cold(white_freq: np.ndarray):
+    """
+    Hot (top HOT_COUNT) and cold (bottom COLD_COUNT) white balls for each row
+    of point_in_time_frequencies' white counts, ranked like calculate_frequency
+    (ties -> lower number first). Returns (hot_rank (R x 70), cold_mask
+    (R x 70)); hot_rank is the ball's position in the hot list (99 = not hot).
+    """
+    order = np.argsort(-white_freq[:, 1:], axis=1, kind="stable") + 1
+    rows = np.arange(len(white_freq))[:, None]
+    hot_rank = np.full(white_freq.shape, 99, dtype=np.int64)
+    hot_rank[rows, order[:, :HOT_COUNT]] = np.arange(HOT_COUNT)
+    cold_mask = np.zeros(white_freq.shape, dtype=bool)
+    cold_mask[rows, order[:, -COLD_COUNT:]] = True
+    return hot_rank, cold_mask
+
+
+def apply_statistical_weight(white: np.ndarray, seeds: np.ndarray, hot_rank: np.ndarray,
+                             cold_mask: np.ndarray) -> np.ndarray:
+    """
+    Vectorized PowerballService._apply_statistical_weight, ball by ball:
+    a cold ball is pushed away ((ball + seed) % 69 + 1) when seed % 10 > 3,
+    any other ball snaps to the first hot number (in hot-list order) within
+    1 of it. white and seeds are L x 5; hot_rank / cold_mask are per line (L x 70).
+    """
+    rows = np.arange(len(white))[:, None]
+    pushed = (white + seeds) % WHITE_BALL_MAX + 1
+    is_cold = cold_mask[rows, white] & (seeds % 10 > 3)
+
+    # Rank of ball-1, ball, ball+1 in the hot list; take the best-ranked one
+    padded = np.pad(hot_rank, ((0, 0), (0, 1)), constant_values=99)
+    neighbours = np.stack([white - 1, white, white + 1], axis=-1)
+    ranks = padded[rows[..., None], neighbours]
+    best = np.take_along_axis(neighbours, ranks.argmin(axis=-1)[..., None], -1)[..., 0]
+    snapped = np.where(ranks.min(axis=-1) < 99, best, white)
+    return np.where(is_cold, pushed, snapped)
+
+
+def hot_cold_lines(rng: np.random.Generator, hot_rank: np.ndarray, cold_mask: np.ndarray):
+    """
+    Uniform lines nudged by apply_statistical_weight (one line per row of
+    hot_rank / cold_mask). A ball the nudge turns into a repeat is re-drawn
+    the way generate_personal_powerball does: step its seed until the ball is new.
+    Returns (white (L x 5) sorted, powerball (L,)).
+    """
+    white, powerball = random_lines(rng, len(hot_rank))
+    seeds = rng.integers(0, 2**31 - 1, size=white.shape)
+    nudged = apply_statistical_weight(white, seeds, hot_rank, cold_mask)
+    nudged.sort(axis=1)
+    for row in np.nonzero((np.diff(nudged, axis=1) == 0).any(axis=1))[0]:
+        balls = []
+        for ball, seed in zip(nudged[row].tolist(), seeds[row].tolist()):
+            while ball in balls:
+                seed = (seed * 1103515245 + 12345) & 0x7fffffff
+                ball = seed % WHITE_BALL_MAX + 1
+            balls.append(ball)
+        nudged[row] = sorted(balls)
+    return nudged, powerball
+
+
+def delta_lines(dates: List[str], lines_per_draw: int, name: str, dob: str):
+    """generate_daily_powerballs output for each date, stacked."""
+    from app.services.powerball_service import powerball_service
+
+    white, powerball = [], []
+    for day in dates:
+        for combo in powerball_service.generate_daily_powerballs(
+            name=name, dob=dob, current_date=day, luck_score=70,
+            astro_score=60, natal_score=50, num_lines=lines_per_draw
+        ):
+            white.append(sorted(combo["white_balls"]))
+            powerball.append(combo["powerball"])
+    return np.array(white, dtype=np.int64).reshape(-1, 5), np.array(powerball, dtype=np.int64)
+
+
+def _summarize(tier_counts: np.ndarray, tickets: int, jackpot: int) -> Dict:
+    """Hit rates and expected value from per-tier hit counts."""
+    prizes = np.array([t["prize"] if t["prize"] is not None else jackpot for t in PRIZE_TIERS], dtype=np.float64)
+    fixed = np.array([t["prize"] or 0 for t in PRIZE_TIERS], dtype=np.float64)
+    wins = int(tier_counts.sum())
+    return {
+        "tickets": tickets,
+        "tier_hits": {t["tier"]: int(c) for t, c in zip(PRIZE_TIERS, tier_counts)},
+        "tier_rates": {t["tier"]: float(c) / tickets if tickets else 0.0 for t, c in zip(PRIZE_TIERS, tier_counts)},
+        "hit_rate": wins / tickets if tickets else 0.0,
+        "ev_per_ticket": float(tier_counts @ prizes) / tickets - TICKET_PRICE if tickets else 0.0,
+        "ev_excluding_jackpot": float(tier_counts @ fixed) / tickets - TICKET_PRICE if tickets else 0.0,
+    }
+
+
+def _tier_counts(white: np.ndarray, powerball: np.ndarray, draw_white: np.ndarray, draw_pb: np.ndarray) -> np.ndarray:
+    """Tier histogram for lines scored 1:1 against aligned draws."""
+    matches = shared_balls(balls_to_bitsets(white), balls_to_bitsets(draw_white)).astype(np.int64)
+    tiers = CODE_TIER[2 * matches + (powerball == draw_pb)]
+    return np.bincount(tiers, minlength=NO_PRIZE + 1)[:NO_PRIZE]
+
+
+def _simulate_chunk(args) -> np.ndarray:
+    """Process-pool task: score a line pool against `count` simulated draws."""
+    white, powerball, count, seed = args
+    rng = np.random.default_rng(seed)
+    draw_white, draw_pb = random_lines(rng, count)
+    line_bits = balls_to_bitsets(white)
+    draw_bits = balls_to_bitsets(draw_white)
+    counts = np.zeros(NO_PRIZE, dtype=np.int64)
+    for i in range(len(white)):
+        matches = shared_balls(line_bits[i], draw_bits).astype(np.int64)
+        tiers = CODE_TIER[2 * matches + (powerball[i] == draw_pb)]
+        counts += np.bincount(tiers, minlength=NO_PRIZE + 1)[:NO_PRIZE]
+    return counts
+
+
+class BacktestService:
+    """Replays strategies over history and Monte Carlo draws."""
+
+    def replay_history(self, lines_per_draw: int = 5, seed: int = 7, jackpot: int = DEFAULT_JACKPOT,
+                       name: str = "Backtest User", dob: str = "1990-01-01") -> Dict:
+        """
+        Score each strategy against every current-matrix drawing after the
+        first STATS_WINDOW, generating lines with only the information
+        available before that drawing.
+        """
+        n = len(draw_store)
+        base = draw_store.current_era_start()
+        if n - base <= STATS_WINDOW:
+            return {"error": "Not enough current-matrix draws in the local store (run a sync first)"}
+
+        rng = np.random.default_rng(seed)
+        targets = np.arange(base + STATS_WINDOW, n)
+        draw_white = np.repeat(np.asarray(draw_store.white_balls, dtype=np.int64)[targets], lines_per_draw, axis=0)
+        draw_pb = np.repeat(np.asarray(draw_store.powerballs, dtype=np.int64)[targets], lines_per_draw)
+        line_draw = np.repeat(targets, lines_per_draw)
+        tickets = len(line_draw)
+
+        # Lines are generated the evening before each drawing
+        dates = [(date.fromisoformat(day_to_date(d)) - timedelta(days=1)).isoformat()
+                 for d in np.asarray(draw_store.dates)[targets]]
+
+        hot_rank, cold_mask = point_in_time_hot_cold(point_in_time_frequencies()[0])
+        lines = {
+            "delta": delta_lines(dates, lines_per_draw, name, dob),
+            "random": random_lines(rng, tickets),
+            "hot_cold": hot_cold_lines(rng, hot_rank[line_draw - base], cold_mask[line_draw - base]),
+        }
+
+        results = {
+            strategy: _summarize(_tier_counts(white, pb, draw_white, draw_pb), tickets, jackpot)
+            for strategy, (white, pb) in lines.items()
+        }
+        return {
+            "mode": "history",
+            "matrix": CURRENT_ERA.name,
+            "draws": len(targets),
+            "first_draw": day_to_date(draw_store.dates[targets[0]]),
+            "last_draw": day_to_date(draw_store.dates[targets[-1]]),
+            "lines_per_draw": lines_per_draw,
+            "strategies": results,
+            "theoretical_odds": theoretical_odds(),
+        }
+
+    def simulate(self, simulations: int = 1_000_000, pool_size: int = 100, seed: int = 7,
+                 workers: Optional[int] = None, jackpot: int = DEFAULT_JACKPOT,
+                 name: str = "Backtest User", dob: str = "1990-01-01") -> Dict:
+        """
+        Score a pool of lines per strategy against `simulations` uniform
+        draws, split into chunks across a process pool.
+        """
+        rng = np.random.default_rng(seed)
+        today = date.today()
+        per_day = max(1, pool_size // 10)
+        dates = [(today - timedelta(days=i)).isoformat() for i in range(-(-pool_size // per_day))]
+        delta_white, delta_pb = delta_lines(dates, per_day, name, dob)
+
+        # Today's hot/cold numbers (after the newest draw)
+        hot_rank, cold_mask = point_in_time_hot_cold(point_in_time_frequencies()[0])
+        latest = np.full(pool_size, len(hot_rank) - 1)
+        pools = {
+            "delta": (delta_white[:pool_size], delta_pb[:pool_size]),
+            "random": random_lines(rng, pool_size),
+            "hot_cold": hot_cold_lines(rng, hot_rank[latest], cold_mask[latest]),
+        }
+
+        chunks = [min(_SIM_CHUNK, simulations - start) for start in range(0, simulations, _SIM_CHUNK)]
+        chunk_seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+        workers = workers or os.cpu_count() or 1
+
+        results = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for strategy, (white, pb) in pools.items():
+                tasks = [(white, pb, count, s) for count, s in zip(chunks, chunk_seeds)]
+                counts = sum(pool.map(_simulate_chunk, tasks))
+                results[strategy] = _summarize(counts, simulations * len(white), jackpot)
+
+        return {
+            "mode": "simulation",
+            "simulated_draws": simulations,
+            "lines_per_strategy": pool_size,
+            "workers": workers,
+            "strategies": results,
+            "theoretical_odds": theoretical_odds(),
+        }
+
+
+# Singleton instance
+backtest_service = BacktestService()
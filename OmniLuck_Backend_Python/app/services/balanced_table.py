@@ -0,0 +1,135 @@
+"""
+Balanced Powerball Combination Table.
+Every 5-of-69 white ball combination that passes the statistical balance
+filters (harmonic sum, odd/even, low/high), built once and memory-mapped.
+
+Each combination is stored as its rank in the combinatorial number system
+(colex order): for sorted 0-based balls c1 < c2 < ... < c5,
+    rank = C(c1, 1) + C(c2, 2) + C(c3, 3) + C(c4, 4) + C(c5, 5)
+so the table is a sorted uint32 array (~4.2M entries, ~17 MB). A seeded
+index picks a balanced line directly (the personal and daily generators),
+and batches of lines can be snapped to the nearest balanced combination
+with a binary search (the bulk generator) - no rejection loops.
+
+The table is built by the "balanced_table" warm-up step (or
+scripts/build_balanced_table.py) if the file is missing; a request that
+needs it earlier waits for that one build.
+"""
+import os
+import tempfile
+import threading
+from bisect import bisect_right
+from itertools import combinations
+from math import comb
+from typing import Callable, List
+
+import numpy as np
+
+from app.services.draw_store import DATA_DIR
+from app.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+TABLE_FILE = DATA_DIR / "balanced_combinations.npy"
+
+WHITE_BALL_MAX = 69
+
+# BINOM[n, k] = C(n, k) for the rank <-> combination conversions
+BINOM = np.array([[comb(n, k) for k in range(6)] for n in range(WHITE_BALL_MAX + 1)], dtype=np.int64)
+_BINOM_COLUMNS = [BINOM[:, k].tolist() for k in range(6)]  # Scalar path (bisect)
+
+
+def combination_ranks(white_balls: np.ndarray) -> np.ndarray:
+    """(N x 5) sorted white balls (1-69) -> (N,) colex ranks."""
+    c = np.asarray(white_balls, dtype=np.intp) - 1
+    return sum(BINOM[c[:, k], k + 1] for k in range(5))
+
+
+def unrank_combinations(ranks: np.ndarray) -> np.ndarray:
+    """(N,) colex ranks -> (N x 5) sorted white balls (1-69)."""
+    remaining = np.asarray(ranks, dtype=np.int64).copy()
+    white = np.empty((len(remaining), 5), dtype=np.int64)
+    for k in range(5, 0, -1):
+        # Largest c with C(c, k) <= remaining
+        c = np.searchsorted(BINOM[:, k], remaining, side="right") - 1
+        white[:, k - 1] = c + 1
+        remaining -= BINOM[c, k]
+    return white
+
+
+class BalancedCombinationTable:
+    """Sorted colex ranks of every balanced 5-ball combination."""
+
+    def __init__(self, balanced_mask: Callable[[np.ndarray], np.ndarray], path=TABLE_FILE):
+        self.balanced_mask = balanced_mask
+        self.path = path
+        self._ranks = None
+        self._load_lock = threading.Lock()  # One build, however many first callers
+
+    def build(self) -> np.ndarray:
+        """Enumerate all C(69, 5) combinations and keep the balanced ones."""
+        fours = np.array(list(combinations(range(1, WHITE_BALL_MAX + 1), 4)), dtype=np.int64)
+        parts = []
+        for first in range(1, WHITE_BALL_MAX - 3):
+            rest = fours[fours[:, 0] > first]
+            white = np.column_stack([np.full(len(rest), first), rest])
+            parts.append(combination_ranks(white[self.balanced_mask(white)]))
+        ranks = np.sort(np.concatenate(parts)).astype(np.uint32)
+
+        # Unique temp file: every worker may build at warm-up, and the
+        # replace must only ever publish a complete table
+        tmp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.stem, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, ranks)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning("Failed to save balanced combination table", extra={"error": str(e)})
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+        return ranks
+
+    @property
+    def ranks(self) -> np.ndarray:
+        """The table, memory-mapped from disk (built on first use if missing)."""
+        if self._ranks is None:
+            with self._load_lock:
+                if self._ranks is None:
+                    try:
+                        self._ranks = np.load(self.path, mmap_mode='r')
+                    except Exception:
+                        logger.info("Building balanced combination table (one-off)")
+                        self._ranks = self.build()
+        return self._ranks
+
+    def __len__(self) -> int:
+        return len(self.ranks)
+
+    def pick(self, seed: int) -> List[int]:
+        """Balanced line for a seed: table[seed % size] (plain Python, no array setup)."""
+        table = self.ranks
+        remaining = int(table[seed % len(table)])
+        line = []
+        for k in range(5, 0, -1):
+            c = bisect_right(_BINOM_COLUMNS[k], remaining) - 1
+            line.append(c + 1)
+            remaining -= _BINOM_COLUMNS[k][c]
+        return line[::-1]
+
+    def nearest(self, white_balls: np.ndarray) -> np.ndarray:
+        """
+        Snap (N x 5) sorted lines of distinct balls to the balanced
+        combination with the closest rank. Balanced lines map to themselves.
+        """
+        ranks = combination_ranks(white_balls)
+        table = self.ranks
+        # Search with the table's dtype (a mismatch would copy the whole table)
+        upper = np.minimum(np.searchsorted(table, ranks.astype(table.dtype)), len(table) - 1)
+        lower = np.maximum(upper - 1, 0)
+        closer_lower = np.abs(table[lower].astype(np.int64) - ranks) < np.abs(table[upper].astype(np.int64) - ranks)
+        return unrank_combinations(np.where(closer_lower, table[lower], table[upper]))
@@ -0,0 +1,242 @@
+"""
+Batch Luck Scoring.
+Scores many users in one pass (e.g. the morning notification run) instead of
+one /calculate request - and one LLM call - per user.
+
+Inputs that do not depend on the user are computed once per batch:
+- transit planet positions (one ephemeris pass, aspected against every chart)
+- lunar phase and Kp index
+- weather, once per tile of current location (see signals_service); users
+  without a current location get the neutral signals score instead
+Numerology is vectorized across the batch; natal charts are per user. The AI
+pillar is optional and runs with bounded concurrency.
+"""
+import asyncio
+from contextvars import copy_context
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from app.models.schemas import BirthInfo, LuckCalculationRequest, LuckCalculationResponse, LuckComponents
+from app.services.astrology_service import astrology_service, timezone_finder
+from app.services.numerology_service import numerology_service
+from app.services.signals_service import signals_service
+from app.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+AI_CONCURRENCY = 4
+AI_DEFAULT_SCORE = 70  # Same default /calculate uses when the AI gives no score
+SIGNALS_DEFAULT_SCORE = 50  # Same fallback /calculate uses when signals are unavailable
+
+ZODIAC_SYMBOLS = {
+    "Aries": "♈️", "Taurus": "♉️", "Gemini": "♊️", "Cancer": "♋️",
+    "Leo": "♌️", "Virgo": "♍️", "Libra": "♎️", "Scorpio": "♏️",
+    "Sagittarius": "♐️", "Capricorn": "♑️", "Aquarius": "♒️", "Pisces": "♓️"
+}
+
+
+class BatchLuckService:
+    """Bulk computation of the luck pillars"""
+
+    def _astrology_pillars(self, requests: List[LuckCalculationRequest]) -> List[Tuple[int, int, Dict]]:
+        """(astro_score, natal_score, astro_data) per user against one shared transit snapshot."""
+        try:
+            tf = timezone_finder()
+        except Exception as e:
+            logger.warning("Timezone detection unavailable (fallback to UTC)", extra={"error": str(e)})
+            tf = None
+
+        current_time = datetime.now().replace(second=0, microsecond=0)
+        transit_planets = astrology_service.calculate_transit_positions(current_time)
+
+        results = []
+        for request in requests:
+            astro_score, natal_score, astro_data = 50, 50, {}
+            if request.birth_lat and request.birth_lon:
+                try:
+                    birth_timezone = None
+                    if tf is not None:
+                        try:
+                            birth_timezone = tf.timezone_at(lat=request.birth_lat, lng=request.birth_lon)
+                        except Exception as e:
+                            logger.warning("Timezone detection failed (fallback to UTC)", extra={"uid": request.uid, "error": str(e)})
+
+                    birth_info = BirthInfo(
+                        dob=request.dob,
+                        time=request.birth_time or "12:00",
+                        lat=request.birth_lat,
+                        lon=request.birth_lon,
+                        timezone=birth_timezone or "UTC"
+                    )
+                    natal_chart = astrology_service.calculate_natal_chart(birth_info)
+                    transits_result = astrology_service.calculate_daily_transits(
+                        current_time, natal_chart, transit_planets=transit_planets
+                    )
+                    astro_score = transits_result.influence_score
+                    natal_score = natal_chart.strength_score
+                    astro_data = {
+                        "sun_sign": natal_chart.sun_sign,
+                        "moon_sign": natal_chart.moon_sign,
+                        "ascendant": natal_chart.ascendant,
+                        "transits_score": transits_result.influence_score,
+                        "aspects": transits_result.aspects
+                    }
+                except Exception as e:
+                    logger.warning("Astrology error", extra={"uid": request.uid, "error": str(e)})
+            results.append((astro_score, natal_score, astro_data))
+        return results
+
+    def _numerology_pillars(self, requests: List[LuckCalculationRequest]) -> List[Dict]:
+        """Numerology result per user for their date (default today; one vectorized call)."""
+        try:
+            scores = numerology_service.calculate_daily_scores(
+                [r.dob for r in requests], [r.name for r in requests], [r.date for r in requests]
+            )
+            columns = {key: values.tolist() for key, values in scores.items()}
+            return [{key: values[i] for key, values in columns.items()} for i in range(len(requests))]
+        except Exception as e:
+            logger.warning("Numerology error", extra={"error": str(e)})
+            return [{} for _ in requests]
+
+    def _build_response(self, pillars: Dict, ai_result: Optional[Dict]) -> Dict:
+        """OmniLuck Edge weighting (same as /calculate) -> response dict."""
+        astro_score, natal_score = pillars["astro_score"], pillars["natal_score"]
+        numero_score = pillars["numerology"].get("numerology_score", 50)
+        signals_score = pillars["signals_score"]
+        ai_intuition_score = (ai_result or {}).get("score", AI_DEFAULT_SCORE)
+
+        # Weights: Astro Transits (40%), Natal Potential (20%), Numerology (15%), Signals (15%), AI (10%)
+        final_score = (
+            (astro_score * 0.40) +
+            (natal_score * 0.20) +
+            (numero_score * 0.15) +
+            (signals_score * 0.15) +
+            (ai_intuition_score * 0.10)
+        )
+        final_score = max(0, min(100, final_score))
+
+        factors_summary = (
+            f"Astro Transits ({astro_score}/100), "
+            f"Numerology ({numero_score}/100), "
+            f"Natal Potential ({natal_score}/100), "
+            f"Cosmic Weather ({signals_score}/100), "
+            f"AI Intuition ({ai_intuition_score}/100)"
+        )
+        ai_result = ai_result or {}
+
+        return LuckCalculationResponse(
+            luck_score=int(final_score),
+            components=LuckComponents(
+                astrology_score=astro_score,
+                base_numerology=numero_score,
+                natal_potential=natal_score,
+                cosmic_weather=signals_score,
+                personal_trend=ai_intuition_score,
+                total=int(final_score)
+            ),
+            confidence=0.9,
+            caption=ai_result.get("caption"),
+            summary=factors_summary,
+            explanation=ai_result.get("explanation") or factors_summary,
+            recommended_actions=ai_result.get("actions") or [],
+            strategic_advice=ai_result.get("strategic_advice"),
+            lucky_time_slots=ai_result.get("lucky_time_slots") or [],
+            personal_powerball=None,
+            daily_powerballs=[]
+        ).model_dump(mode="json")
+
+    def _ai_context(self, request: LuckCalculationRequest, astro_data: Dict) -> Dict:
+        sun_sign = astro_data.get("sun_sign", "Traveler")
+        return {
+            "name": request.name,
+            "dob": request.dob,
+            "zodiac": f"{ZODIAC_SYMBOLS.get(sun_sign, '✨')} {sun_sign}",
+            "sun_sign": sun_sign,
+            "birth_place": request.birth_place_name or "Unknown",
+            "birth_time": request.birth_time or "Unknown",
+            "timezone": request.timezone or "UTC",
+            "uid": request.uid
+        }
+
+    async def _signals(self, requests: List[LuckCalculationRequest]) -> List[Tuple[int, Dict]]:
+        """(signals_score, signals) per user; located users share the per-tile fetch."""
+        located = [i for i, r in enumerate(requests) if r.current_lat is not None and r.current_lon is not None]
+        results = [(SIGNALS_DEFAULT_SCORE, {})] * len(requests)
+        if not located:
+            return results
+        try:
+            signals = await signals_service.get_signals_for_locations(
+                [(requests[i].current_lat, requests[i].current_lon) for i in located]
+            )
+        except Exception as e:
+            logger.warning("Signals error", extra={"error": str(e)})
+            return results
+        for i, user_signals in zip(located, signals):
+            results[i] = (user_signals.total_influence_score, user_signals.model_dump())
+        return results
+
+    async def score(self, requests: List[LuckCalculationRequest], include_ai: bool = False) -> AsyncIterator[Dict]:
+        """
+        Yield {"index", "uid", "result"} (or "error") per request.
+        Without AI, rows come in request order; with AI, in completion order.
+        """
+        loop = asyncio.get_running_loop()
+
+        # Shared signals (async I/O) while the CPU-bound pillars run in a thread
+        signals, astrology, numerology = await asyncio.gather(
+            self._signals(requests),
+            loop.run_in_executor(None, copy_context().run, self._astrology_pillars, requests),
+            loop.run_in_executor(None, copy_context().run, self._numerology_pillars, requests)
+        )
+
+        pillars = [
+            {
+                "signals_score": signals[i][0],
+                "signals": signals[i][1],
+                "astro_score": astrology[i][0],
+                "natal_score": astrology[i][1],
+                "astro_data": astrology[i][2],
+                "numerology": numerology[i]
+            }
+            for i in range(len(requests))
+        ]
+
+        def row(i: int, ai_result: Optional[Dict]) -> Dict:
+            try:
+                return {"index": i, "uid": requests[i].uid, "result": self._build_response(pillars[i], ai_result)}
+            except Exception as e:
+                logger.warning("Batch scoring error", extra={"uid": requests[i].uid, "error": str(e)})
+                return {"index": i, "uid": requests[i].uid, "error": str(e)}
+
+        if not include_ai:
+            for i in range(len(requests)):
+                yield row(i, None)
+            return
+
+        from app.services.llm_service import llm_service
+        semaphore = asyncio.Semaphore(AI_CONCURRENCY)
+
+        async def with_ai(i: int) -> Dict:
+            async with semaphore:
+                try:
+                    ai_result = await loop.run_in_executor(
+                        None,
+                        copy_context().run,
+                        lambda: llm_service.analyze_luck_and_generate_content(
+                            user_data=self._ai_context(requests[i], pillars[i]["astro_data"]),
+                            cosmic_signals=pillars[i]["signals"],
+                            astrology_data=pillars[i]["astro_data"],
+                            numerology_data=pillars[i]["numerology"]
+                        )
+                    )
+                except Exception as e:
+                    logger.warning("AI error", extra={"uid": requests[i].uid, "error": str(e)})
+                    ai_result = None
+            return row(i, ai_result)
+
+        for next_row in asyncio.as_completed([with_ai(i) for i in range(len(requests))]):
+            yield await next_row
+
+
+# Singleton instance
+batch_luck_service = BatchLuckService()
@@ -0,0 +1,137 @@
+"""
+Daily Check-In Log.
+Check-ins from /api/ml/daily-checkin are kept in an append-only msgpack log,
+written behind the request: submit() only queues the check-in (a few
+microseconds), and the write-behind thread (app/services/write_behind.py)
+appends everything queued as one columnar batch - when BATCH_SIZE check-ins
+are waiting or every FLUSH_INTERVAL seconds. Each batch is fsynced, and the
+queue is flushed on shutdown (main.py's lifespan).
+
+Layout: one file per worker process run, CHECKIN_DIR/<start time ns>-<pid>.msgpack
+(no cross-process locking needed, and a restart never appends after a torn
+write), each a sequence of batches:
+
+    {"uid": [...], "date": [...], "mood_score": [...], "energy_level": [...],
+     "mood_tags": [[...], ...], "journal_text": [...],
+     "journal_sentiment": [...], "saved_at": [unix time, ...]}
+
+A batch is appended all-or-nothing: if the write or fsync fails (disk full,
+I/O error), the file is truncated back to where the batch started - or, if
+even that fails, left behind and the next batch starts a new file - and the
+write-behind queue retries the batch later.
+
+read_batches() replays every file in that shape; a batch cut short by a
+crash mid-write is skipped. Given an offsets dict it resumes where the last
+call stopped, which is how trend_service picks up other workers' check-ins.
+
+    python scripts/bench_checkins.py
+"""
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+import msgpack
+
+from app.config import settings
+from app.models.schemas import DailyCheckIn
+from app.services.write_behind import WriteBehindQueue
+from app.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+CHECKIN_DIR = Path(settings.CHECKIN_DIR) if settings.CHECKIN_DIR else Path(__file__).parent.parent / "data" / "checkins"
+
+COLUMNS = ("uid", "date", "mood_score", "energy_level", "mood_tags", "journal_text", "journal_sentiment", "saved_at")
+
+
+class CheckInService:
+    """Write-behind, append-only log of daily check-ins"""
+
+    def __init__(self, log_dir: Path = CHECKIN_DIR):
+        self.log_dir = Path(log_dir)
+        self.queue = WriteBehindQueue("checkins", self._write)
+        self.path: Optional[Path] = None  # This process's current log file, once written to
+        self._own_paths: Set[Path] = set()  # Every file this process has written
+        self._fd: Optional[int] = None
+
+    def submit(self, checkin: DailyCheckIn, journal_sentiment: Optional[float], saved_at: datetime) -> bool:
+        """Queue a check-in for the log (microseconds; no I/O)."""
+        return self.queue.put((
+            checkin.uid, checkin.date, checkin.mood_score, checkin.energy_level,
+            checkin.mood_tags, checkin.journal_text, journal_sentiment, saved_at.timestamp(),
+        ))
+
+    def _open(self):
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        path = self.log_dir / f"{time.time_ns()}-{os.getpid()}.msgpack"
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.path = path
+        self._own_paths.add(path)
+
+    def _close_file(self):
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _write(self, entries: List[tuple]):
+        data = msgpack.packb(dict(zip(COLUMNS, (list(column) for column in zip(*entries)))))
+        if self._fd is None:
+            self._open()
+        start = os.lseek(self._fd, 0, os.SEEK_END)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view):]
+            os.fsync(self._fd)
+        except OSError:
+            # Drop the partial batch so the retry doesn't follow a torn record
+            try:
+                os.ftruncate(self._fd, start)
+            except OSError:
+                self._close_file()  # Torn tail stays last in this file; retry in a new one
+            raise
+
+    def read_batches(self, offsets: Optional[Dict[str, int]] = None, skip_own: bool = False) -> Iterator[Dict[str, list]]:
+        """
+        Every logged batch, from all workers' files (oldest file first, in write order).
+        
+        offsets (file name -> bytes consumed) is read and advanced past each
+        complete batch, so the next call yields only what was appended since.
+        skip_own leaves out the files this process wrote.
+        """
+        offsets = {} if offsets is None else offsets
+        paths = sorted(self.log_dir.glob("*.msgpack")) if self.log_dir.exists() else []
+        for path in paths:
+            if skip_own and path in self._own_paths:
+                continue
+            start = offsets.get(path.name, 0)
+            if path.stat().st_size <= start:
+                continue
+            with open(path, "rb") as f:
+                f.seek(start)
+                unpacker = msgpack.Unpacker(f, raw=False)
+                try:
+                    for batch in unpacker:
+                        offsets[path.name] = start + unpacker.tell()
+                        if isinstance(batch, dict):
+                            yield batch
+                except (msgpack.UnpackException, ValueError) as e:
+                    logger.warning("Skipping damaged check-in log tail", extra={"path": str(path), "error": str(e)})
+
+    def flush(self) -> int:
+        """Write queued check-ins now."""
+        return self.queue.flush()
+
+    def close(self):
+        """Flush the queue and close the log (shutdown)."""
+        self.queue.close()
+        self._close_file()
+
+
+# Singleton instance
+checkin_service = CheckInService()
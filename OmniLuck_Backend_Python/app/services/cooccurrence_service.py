@@ -0,0 +1,93 @@
+"""
+Powerball Co-occurrence Index.
+Tracks which white balls tend to be drawn together under the current 5/69
+matrix (since 2015-10-07 - the older 5/59 draws could not include 60-69, so
+counting them would bias those balls' companions low):
+- a dense 69x69 pair matrix (how often balls a and b appeared in the same draw)
+- a sparse triple index (for each pair, how often each third ball joined it)
+
+Both are built once from the local draw store and then updated incrementally
+as new draws are ingested. Per-ball companion rankings are kept pre-sorted so
+a top-k lookup is a simple slice.
+"""
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.draw_store import CURRENT_ERA, draw_store
+
+WHITE_BALL_MAX = CURRENT_ERA.white_ball_max
+
+
+class CooccurrenceService:
+    """Pair/triple co-occurrence counts over the current-matrix draw history."""
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        # Index 0 unused so balls index directly
+        self.pairs = np.zeros((WHITE_BALL_MAX + 1, WHITE_BALL_MAX + 1), dtype=np.uint16)
+        self.triples: Dict[Tuple[int, int], Dict[int, int]] = {}
+        self._ranking = np.tile(np.arange(1, WHITE_BALL_MAX + 1, dtype=np.uint8), (WHITE_BALL_MAX + 1, 1))
+        self._indexed = 0          # Number of store rows already seen (older-matrix rows are skipped)
+        self._last_day = None      # Date of the last counted row (detects re-ordering)
+
+    def update(self) -> int:
+        """
+        Index any current-matrix draws added to the store since the last
+        update. Returns the number of draws indexed.
+        """
+        n = len(draw_store)
+        if self._indexed and (n < self._indexed or draw_store.dates[self._indexed - 1] != self._last_day):
+            # History was rewritten (e.g. a back-filled draw) - rebuild
+            self._reset()
+        start = max(self._indexed, draw_store.current_era_start())
+        if n <= start:
+            return 0
+
+        new_white = np.asarray(draw_store.white_balls[start:], dtype=np.intp)
+
+        # Pairs: one-hot rows -> incidence^T @ incidence (vectorized)
+        hits = np.zeros((len(new_white), WHITE_BALL_MAX + 1), dtype=np.uint16)
+        hits[np.arange(len(new_white))[:, None], new_white] = 1
+        pair_delta = hits.T @ hits
+        np.fill_diagonal(pair_delta, 0)
+        self.pairs += pair_delta
+
+        # Triples: every 3-subset of each draw, keyed by each of its pairs
+        for row in new_white.tolist():
+            for a, b, c in combinations(row, 3):
+                for pair, third in (((a, b), c), ((a, c), b), ((b, c), a)):
+                    bucket = self.triples.setdefault(pair, {})
+                    bucket[third] = bucket.get(third, 0) + 1
+
+        # Re-rank only the balls whose rows changed
+        touched = np.unique(new_white)
+        self._ranking[touched] = (np.argsort(-self.pairs[touched, 1:].astype(np.int32), axis=1, kind="stable") + 1)
+
+        self._indexed = n
+        self._last_day = draw_store.dates[n - 1]
+        return len(new_white)
+
+    def top_companions(self, ball: int, k: int = 10, with_ball: Optional[int] = None) -> List[Dict]:
+        """
+        Balls most often drawn together with `ball` (or with the pair
+        `ball` + `with_ball` when given), highest count first.
+        """
+        self.update()
+
+        if with_ball is not None:
+            pair = (min(ball, with_ball), max(ball, with_ball))
+            bucket = self.triples.get(pair, {})
+            ranked = sorted(bucket.items(), key=lambda item: (-item[1], item[0]))[:k]
+            return [{"ball": third, "count": count} for third, count in ranked]
+
+        # The ball itself may appear once in its own ranking - read one extra
+        companions = [c for c in self._ranking[ball, :k + 1].tolist() if c != ball][:k]
+        return [{"ball": c, "count": int(self.pairs[ball, c])} for c in companions]
+
+
+# Singleton instance
+cooccurrence_service = CooccurrenceService()
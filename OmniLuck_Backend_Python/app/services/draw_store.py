@@ -0,0 +1,229 @@
+"""
+Local Powerball Draw Store.
+Keeps the full Powerball drawing history (since 2010) on disk so that
+refreshes only need to download the draws we don't have yet.
+
+Draws are stored column-wise as NumPy arrays (oldest first), memory-mapped
+from .npy files:
+- balls:       uint8  (N x 6)  -> 5 sorted white balls + the Powerball
+- dates:       int32  (N,)     -> days since 1970-01-01
+- multipliers: uint8  (N,)     -> Power Play multiplier (0 = unknown)
+
+The archive spans several Powerball matrices (MATRIX_ERAS): draws before
+2015-10-07 used 59 white balls and 39 (then 35) Powerballs. Statistics over
+current-format picks only use current-matrix draws (current_era_start());
+code scoring the whole archive looks each draw's era up with era_ids().
+"""
+import os
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+DRAWS_DIR = DATA_DIR / "powerball_draws"
+
+EPOCH = date(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class MatrixEra:
+    """Powerball number matrix in force from `start` (YYYY-MM-DD) on"""
+    start: str
+    white_ball_max: int
+    powerball_max: int
+
+    @property
+    def name(self) -> str:
+        return f"5/{self.white_ball_max} + 1/{self.powerball_max}"
+
+
+# Oldest first; the last one is the current matrix
+MATRIX_ERAS = (
+    MatrixEra("2009-01-07", white_ball_max=59, powerball_max=39),
+    MatrixEra("2012-01-15", white_ball_max=59, powerball_max=35),
+    MatrixEra("2015-10-07", white_ball_max=69, powerball_max=26),
+)
+CURRENT_ERA = MATRIX_ERAS[-1]
+# Largest Powerball in any stored draw
+POWERBALL_MAX_EVER = max(era.powerball_max for era in MATRIX_ERAS)
+
+
+def date_to_day(date_str: str) -> int:
+    """YYYY-MM-DD -> days since epoch."""
+    return (date.fromisoformat(date_str[:10]) - EPOCH).days
+
+
+def day_to_date(day: int) -> str:
+    """Days since epoch -> YYYY-MM-DD."""
+    return (EPOCH + timedelta(days=int(day))).isoformat()
+
+
+class DrawStore:
+    """Append-only, date-ordered columnar store of every Powerball drawing."""
+
+    def __init__(self, path: Path = DRAWS_DIR):
+        self.path = path
+        self.balls = np.empty((0, 6), dtype=np.uint8)
+        self.dates = np.empty(0, dtype=np.int32)
+        self.multipliers = np.empty(0, dtype=np.uint8)
+        self.version = 0  # Bumped on every append (for derived caches)
+        self._loaded = False
+        self._signature = None  # dates.npy (mtime, size) when last loaded/saved
+
+    def _file_signature(self) -> tuple:
+        """
+        (mtime, size) of dates.npy. The size too: two saves within one
+        timestamp tick share an mtime, but every save of this append-only
+        store grows the file.
+        """
+        stat = (self.path / "dates.npy").stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self) -> None:
+        """Memory-map the draw history from disk (once)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            if (self.path / "dates.npy").exists():
+                self.balls = np.load(self.path / "balls.npy", mmap_mode='r')
+                self.dates = np.load(self.path / "dates.npy", mmap_mode='r')
+                self.multipliers = np.load(self.path / "multipliers.npy", mmap_mode='r')
+                self._signature = self._file_signature()
+                self.version += 1
+        except Exception as e:
+            logger.warning("Failed to load draw store", extra={"error": str(e)})
+
+    def reload(self) -> bool:
+        """
+        Re-map the files if another process saved newer draws since we
+        loaded them. Returns True if the store was reloaded.
+        """
+        try:
+            signature = self._file_signature()
+        except OSError:
+            return False
+        if signature == self._signature:
+            return False
+        self._loaded = False
+        self.load()
+        return True
+
+    def save(self) -> None:
+        """Persist the columns to disk (write temp file, then rename)."""
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            # dates.npy goes last: its mtime/size tells other processes to reload
+            for name in ("balls", "multipliers", "dates"):
+                tmp_path = self.path / f"{name}.tmp.npy"
+                np.save(tmp_path, getattr(self, name))
+                os.replace(tmp_path, self.path / f"{name}.npy")
+            self._signature = self._file_signature()
+        except Exception as e:
+            logger.warning("Failed to save draw store", extra={"error": str(e)})
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self.dates)
+
+    @property
+    def white_balls(self) -> np.ndarray:
+        """(N x 5) view of the white balls."""
+        self.load()
+        return self.balls[:, :5]
+
+    @property
+    def powerballs(self) -> np.ndarray:
+        """(N,) view of the Powerballs."""
+        self.load()
+        return self.balls[:, 5]
+
+    @property
+    def latest_date(self) -> Optional[str]:
+        """Date (YYYY-MM-DD) of the newest stored drawing, or None if empty."""
+        self.load()
+        return day_to_date(self.dates[-1]) if len(self.dates) else None
+
+    @staticmethod
+    def parse_record(record: Dict) -> Optional[tuple]:
+        """
+        Convert a raw NY Open Data record into (day, balls, multiplier).
+        Format: "03 18 36 41 54 07" (last number is Powerball)
+        """
+        parts = record.get("winning_numbers", "").split()
+        date_str = record.get("draw_date", "")
+        if len(parts) != 6 or not date_str:
+            return None
+        try:
+            multiplier = int(record.get("multiplier") or 0)
+        except ValueError:
+            multiplier = 0
+        balls = sorted(int(p) for p in parts[:5]) + [int(parts[5])]
+        return date_to_day(date_str), balls, multiplier
+
+    def append(self, records: List[Dict]) -> int:
+        """
+        Append raw API records that are not stored yet.
+        Returns the number of draws actually added.
+        """
+        self.load()
+        known = set(self.dates.tolist())
+        rows = []
+        for record in records:
+            parsed = self.parse_record(record)
+            if parsed and parsed[0] not in known:
+                rows.append(parsed)
+                known.add(parsed[0])
+
+        if not rows:
+            return 0
+
+        dates = np.concatenate([self.dates, np.array([r[0] for r in rows], dtype=np.int32)])
+        balls = np.concatenate([self.balls, np.array([r[1] for r in rows], dtype=np.uint8)])
+        multipliers = np.concatenate([self.multipliers, np.array([r[2] for r in rows], dtype=np.uint8)])
+
+        order = np.argsort(dates, kind="stable")
+        self.dates, self.balls, self.multipliers = dates[order], balls[order], multipliers[order]
+        self.version += 1
+        self.save()
+        return len(rows)
+
+    def current_era_start(self) -> int:
+        """Index of the first draw under the current matrix (len(self) if none)."""
+        self.load()
+        return int(np.searchsorted(self.dates, date_to_day(CURRENT_ERA.start)))
+
+    def era_ids(self, dates: Optional[np.ndarray] = None) -> np.ndarray:
+        """(N,) index into MATRIX_ERAS of each draw's matrix (of `dates`, default the stored ones)."""
+        if dates is None:
+            self.load()
+            dates = self.dates
+        starts = np.array([date_to_day(era.start) for era in MATRIX_ERAS], dtype=np.int32)
+        return np.maximum(np.searchsorted(starts, dates, side="right") - 1, 0)
+
+    def to_dict(self, index: int) -> Dict:
+        """Single stored draw in API shape."""
+        multiplier = int(self.multipliers[index])
+        return {
+            "date": day_to_date(self.dates[index]),
+            "white_balls": self.balls[index, :5].tolist(),
+            "powerball": int(self.balls[index, 5]),
+            "multiplier": str(multiplier) if multiplier else None
+        }
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict]:
+        """Most recent draws (as dicts), newest first."""
+        n = len(self)
+        start = 0 if limit is None else max(0, n - limit)
+        return [self.to_dict(i) for i in range(n - 1, start - 1, -1)]
+
+
+# Singleton instance
+draw_store = DrawStore()
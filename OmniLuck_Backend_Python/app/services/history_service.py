@@ -0,0 +1,108 @@
+"""
+Powerball History Queries.
+Cursor-paginated, filterable access to the full local draw archive.
+
+Filters are resolved against indexes instead of scanning draws:
+- date range -> binary search on the sorted draw dates
+- white balls / Powerball -> posting lists from the match index
+Pages use the draw date as the cursor, so pages stay stable while new
+drawings are appended. Exports stream in chunks as NDJSON or CSV.
+"""
+import json
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.draw_store import draw_store, date_to_day
+from app.services.match_service import match_service
+from app.services.timing_service import timing_service
+
+MAX_PAGE_SIZE = 500
+EXPORT_CHUNK = 1000
+
+
+def _format_dates(days: np.ndarray) -> List[str]:
+    """Days since epoch -> YYYY-MM-DD strings (vectorized)."""
+    return np.asarray(days, dtype="int64").astype("datetime64[D]").astype(str).tolist()
+
+
+class HistoryService:
+    """Filtered, paginated views over the draw store."""
+
+    @timing_service.timed("history_query")
+    def find(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+        balls: Sequence[int] = (), powerball: Optional[int] = None
+    ) -> np.ndarray:
+        """Sorted (oldest first) store indices of the draws matching all filters."""
+        draw_store.load()
+        dates = draw_store.dates
+        lo = int(np.searchsorted(dates, date_to_day(start_date))) if start_date else 0
+        hi = int(np.searchsorted(dates, date_to_day(end_date), side="right")) if end_date else len(dates)
+
+        if not balls and powerball is None:
+            return np.arange(lo, hi, dtype=np.int64)
+
+        indices = match_service.draws_with_balls(balls) if balls else None
+        if powerball is not None:
+            pb_draws = match_service.draws_with_powerball(powerball)
+            indices = pb_draws if indices is None else np.intersect1d(indices, pb_draws, assume_unique=True)
+        return indices[(indices >= lo) & (indices < hi)]
+
+    def page(self, indices: np.ndarray, limit: int = 20, cursor: Optional[str] = None,
+             order: str = "desc") -> Dict:
+        """
+        One page of draws after `cursor` (the date of the previous page's
+        last draw). Returns {"drawings", "next_cursor", "total"}.
+        """
+        days = np.asarray(draw_store.dates)[indices]
+        if order == "desc":
+            stop = int(np.searchsorted(days, date_to_day(cursor))) if cursor else len(days)
+            selected = indices[max(stop - limit, 0):stop][::-1]
+            has_more = stop - limit > 0
+        else:
+            start = int(np.searchsorted(days, date_to_day(cursor), side="right")) if cursor else 0
+            selected = indices[start:start + limit]
+            has_more = start + limit < len(days)
+
+        drawings = self.rows(selected)
+        return {
+            "drawings": drawings,
+            "next_cursor": drawings[-1]["date"] if drawings and has_more else None,
+            "total": len(indices),
+        }
+
+    def rows(self, indices: np.ndarray) -> List[Dict]:
+        """Draws at `indices` in API shape (one vectorized gather per column)."""
+        balls = np.asarray(draw_store.balls)[indices].tolist()
+        multipliers = np.asarray(draw_store.multipliers)[indices].tolist()
+        return [
+            {
+                "date": date,
+                "white_balls": row[:5],
+                "powerball": row[5],
+                "multiplier": str(multiplier) if multiplier else None
+            }
+            for date, row, multiplier in zip(_format_dates(np.asarray(draw_store.dates)[indices]), balls, multipliers)
+        ]
+
+    def export(self, indices: np.ndarray, fmt: str = "ndjson", order: str = "desc") -> Iterator[str]:
+        """Stream draws as NDJSON or CSV text chunks (bounded memory)."""
+        if order == "desc":
+            indices = indices[::-1]
+        if fmt == "csv":
+            yield "date,ball_1,ball_2,ball_3,ball_4,ball_5,powerball,multiplier\n"
+
+        for start in range(0, len(indices), EXPORT_CHUNK):
+            rows = self.rows(indices[start:start + EXPORT_CHUNK])
+            if fmt == "csv":
+                yield "".join(
+                    f"{r['date']},{','.join(map(str, r['white_balls']))},{r['powerball']},{r['multiplier'] or ''}\n"
+                    for r in rows
+                )
+            else:
+                yield "".join(json.dumps(r) + "\n" for r in rows)
+
+
+# Singleton instance
+history_service = HistoryService()
@@ -5,9 +5,14 @@ Uses Google Gemini API (free tier).
 import os
 from datetime import datetime
 from typing import Dict, List, Optional
-import requests
 import json
+import threading
 from app.config import settings
+from app.services.metrics_service import metrics_service
+from app.services.timing_service import timing_service
+from app.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 
 
 class LLMService:
@@ -17,49 +22,73 @@ class LLMService:
         self.use_local = settings.USE_LOCAL_LLM
         self.gemini_key = settings.GEMINI_API_KEY
         self.groq_key = settings.GROQ_API_KEY
-        self.gemini_client = None
+        # Provider SDKs are imported on first use (see load_clients); they
+        # dominate import time and most cold starts never reach the LLM
+        self._gemini_client = None
         self.gemini_model_id = None
-        self.groq_client = None
+        self._groq_client = None
+        self._clients_loaded = False
+        self._clients_lock = threading.Lock()
         
         # Simple in-memory cache for AI responses (resets on server restart)
         self._response_cache = {}
         
-        print(f"🔧 LLM Service: use_local={self.use_local}, has_gemini={bool(self.gemini_key)}, has_groq={bool(self.groq_key)}")
+        logger.info("LLM service configured", extra={"use_local": self.use_local, "has_gemini": bool(self.gemini_key), "has_groq": bool(self.groq_key)})
         
         # DEBUG: Print environment keys to verify injection
-        import os
-        print(f"🔍 Environment Keys Available: {[k for k in os.environ.keys() if 'KEY' in k or 'GEMINI' in k]}")
+        logger.debug("Environment keys available", extra={"keys": [k for k in os.environ.keys() if 'KEY' in k or 'GEMINI' in k]})
 
         if not self.use_local:
-            # Initialize Gemini
-            if self.gemini_key:
-                try:
-                    from google import genai
-                    self.gemini_client = genai.Client(api_key=self.gemini_key)
-                    self.gemini_model_id = 'gemini-2.0-flash'
-                    print("✅ Google Gemini 2.0 Flash configured")
-                except Exception as e:
-                    print(f"❌ Gemini configuration failed: {e}")
-                    self.gemini_client = None
-
-            # Initialize Groq as fallback
-            if self.groq_key:
-                try:
-                    from groq import Groq
-                    self.groq_client = Groq(api_key=self.groq_key)
-                    print("✅ Groq (Llama 3) configured as fallback")
-                except Exception as e:
-                    print(f"❌ Groq configuration failed: {e}")
-                    self.groq_client = None
-            
             if not self.gemini_key and not self.groq_key:
-                 print("⚠️  No cloud API keys found - using fallback templates")
+                 logger.warning("No cloud API keys found - using fallback templates")
 
         else:
              # Setup for Local LLM (Ollama)
              self.ollama_url = "http://localhost:11434/api/generate"
              self.local_model = "llama3"
-             print(f"ℹ️  Local LLM enabled. pointing to {self.ollama_url}")
+             logger.info("Local LLM enabled", extra={"url": self.ollama_url})
+    
+    @property
+    def gemini_client(self):
+        if not self._clients_loaded:
+            self.load_clients()
+        return self._gemini_client
+    
+    @property
+    def groq_client(self):
+        if not self._clients_loaded:
+            self.load_clients()
+        return self._groq_client
+    
+    def load_clients(self):
+        """Import the provider SDKs and build their clients (once, on first use)."""
+        with self._clients_lock:
+            if self._clients_loaded:
+                return
+            
+            if not self.use_local:
+                # Initialize Gemini
+                if self.gemini_key:
+                    try:
+                        from google import genai
+                        self._gemini_client = genai.Client(api_key=self.gemini_key)
+                        self.gemini_model_id = 'gemini-2.0-flash'
+                        logger.info("Google Gemini 2.0 Flash configured")
+                    except Exception as e:
+                        logger.error("Gemini configuration failed", extra={"error": str(e)})
+                        self._gemini_client = None
+
+                # Initialize Groq as fallback
+                if self.groq_key:
+                    try:
+                        from groq import Groq
+                        self._groq_client = Groq(api_key=self.groq_key)
+                        logger.info("Groq (Llama 3) configured as fallback")
+                    except Exception as e:
+                        logger.error("Groq configuration failed", extra={"error": str(e)})
+                        self._groq_client = None
+            
+            self._clients_loaded = True
     
     def generate_fortune_explanation(
         self,
@@ -89,20 +118,20 @@ class LLMService:
             # Try Gemini first
         if self.gemini_client:
             try:
-                response = self.gemini_client.models.generate_content(
+                response = self._gemini_generate(
                     model=self.gemini_model_id,
                     contents=prompt
                 )
                 return response.text.strip()
             except Exception as e:
-                print(f"⚠️ Gemini API error: {e}")
+                logger.warning("Gemini API error", extra={"error": str(e)})
                 # Fall through to Groq
         
         # Try Groq (Llama 3) fallback
         if self.groq_client:
             try:
-                print("🔄 Falling back to Groq (Llama 3)...")
-                chat_completion = self.groq_client.chat.completions.create(
+                logger.info("Falling back to Groq (Llama 3)")
+                chat_completion = self._groq_complete(
                     messages=[
                         {
                             "role": "system",
@@ -118,7 +147,7 @@ class LLMService:
                 )
                 return chat_completion.choices[0].message.content.strip()
             except Exception as e:
-                print(f"❌ Groq API error: {e}")
+                logger.error("Groq API error", extra={"error": str(e)})
                 return self._fallback_template(luck_score, user_data)
                 
         # Fallback to templates
@@ -217,6 +246,7 @@ Fortune message:"""
             "summary": "Your numbers align for steady progress."
         }
     
+    @timing_service.timed("llm")
     def analyze_luck_and_generate_content(
         self,
         user_data: Dict,
@@ -237,8 +267,10 @@ Fortune message:"""
         cache_key = f"{uid}_{today}"
         
         # Check cache first (instant return!)
-        if cache_key in self._response_cache:
-            print(f"✅ Using cached AI response for {uid}")
+        cached = cache_key in self._response_cache
+        metrics_service.cache_lookup("llm_response", cached)
+        if cached:
+            logger.debug("Using cached AI response", extra={"uid": uid})
             return self._response_cache[cache_key]
         
         # Build comprehensive analysis prompt
@@ -247,7 +279,7 @@ Fortune message:"""
         # If using local LLM
         if self.use_local:
             try:
-                print("🔄 Using Local LLM (Ollama)...")
+                logger.debug("Using local LLM (Ollama)")
                 response_text = self._call_local_llm(prompt, json_mode=True)
                 if response_text:
                     parsed_data = json.loads(response_text)
@@ -261,7 +293,7 @@ Fortune message:"""
                         "lucky_time_slots": parsed_data.get("schedule", [])
                     }
             except Exception as e:
-                print(f"❌ Local LLM error: {e}")
+                logger.error("Local LLM error", extra={"error": str(e)})
             
             # Fallback if local fails
             score = self._calculate_numerology_fallback(user_data)
@@ -289,7 +321,7 @@ Fortune message:"""
             # Try Gemini first if available
             if self.gemini_client:
                 # Use SDK to generate content
-                response = self.gemini_client.models.generate_content(
+                response = self._gemini_generate(
                 model=self.gemini_model_id,
                 contents=prompt,
                 config={
@@ -302,7 +334,7 @@ Fortune message:"""
             
             text_response = response.text
             if not text_response:
-                print(f"⚠️ Gemini connected but returned no text. Response candidates: {response.candidates}")
+                logger.warning("Gemini returned no text", extra={"candidates": str(response.candidates)})
                 raise ValueError("Empty response from Gemini")
 
             # Clean and parse JSON from Markdown response
@@ -328,15 +360,15 @@ Fortune message:"""
             return result
             
         except Exception as e:
-            print(f"⚠️ Gemini Analysis error: {e}")
+            logger.warning("Gemini analysis error", extra={"error": str(e)})
             
             # Try Groq Fallback
             if self.groq_client:
                 try:
                     import json
-                    print("🔄 Falling back to Groq (Analysis)...")
+                    logger.info("Falling back to Groq (analysis)")
                     
-                    chat_completion = self.groq_client.chat.completions.create(
+                    chat_completion = self._groq_complete(
                         messages=[
                             {
                                 "role": "system",
@@ -378,10 +410,10 @@ Fortune message:"""
                     self._response_cache[f"{uid}_{today}"] = result
                     return result
                 except Exception as groq_e:
-                    print(f"❌ Groq failed: {groq_e}")
+                    logger.error("Groq analysis failed", extra={"error": str(groq_e)})
             
         except Exception as e:
-            print(f"⚠️ Combined AI Analysis error: {e}")
+            logger.warning("Combined AI analysis error", extra={"error": str(e)})
             
             # Final Hard Fallback
             score = self._calculate_numerology_fallback(user_data)
@@ -483,7 +515,7 @@ Format as a simple list, each action 5-10 words maximum. Examples:
 
 Lucky actions:"""
                 
-                response = self.gemini_client.models.generate_content(
+                response = self._gemini_generate(
                     model=self.gemini_model_id,
                     contents=prompt
                 )
@@ -491,13 +523,13 @@ Lucky actions:"""
                 actions = [line.strip("- ").strip() for line in text.strip().split("\n") if line.strip()]
                 return actions[:3]
             except Exception as e:
-                print(f"⚠️ Gemini Actions error: {e}")
+                logger.warning("Gemini actions error", extra={"error": str(e)})
                 
                 # Try Groq Fallback
                 if self.groq_client:
                     try:
-                        print("🔄 Falling back to Groq (Actions)...")
-                        chat_completion = self.groq_client.chat.completions.create(
+                        logger.info("Falling back to Groq (actions)")
+                        chat_completion = self._groq_complete(
                             messages=[
                                 {
                                     "role": "user",
@@ -511,7 +543,7 @@ Lucky actions:"""
                         actions = [line.strip("- ").strip() for line in text.strip().split("\n") if line.strip()]
                         return actions[:3]
                     except Exception as ge:
-                        print(f"❌ Groq Actions error: {ge}")
+                        logger.error("Groq actions error", extra={"error": str(ge)})
                         pass
         
         # Fallback actions
@@ -523,9 +555,21 @@ Lucky actions:"""
 
 
     
+    def _gemini_generate(self, **kwargs):
+        """Gemini generate_content (counted as the "gemini" upstream)"""
+        with metrics_service.upstream("gemini"):
+            return self.gemini_client.models.generate_content(**kwargs)
+    
+    def _groq_complete(self, **kwargs):
+        """Groq chat completion (counted as the "groq" upstream)"""
+        with metrics_service.upstream("groq"):
+            return self.groq_client.chat.completions.create(**kwargs)
+    
     def _call_local_llm(self, prompt: str, json_mode: bool = False) -> Optional[str]:
         """Call local Ollama instance"""
         try:
+            import requests  # Only the local setup needs it
+            
             payload = {
                 "model": self.local_model,
                 "prompt": prompt,
@@ -535,13 +579,14 @@ Lucky actions:"""
             if json_mode:
                 payload["format"] = "json"
                 
-            response = requests.post(self.ollama_url, json=payload, timeout=30)
-            response.raise_for_status()
+            with metrics_service.upstream("ollama"):
+                response = requests.post(self.ollama_url, json=payload, timeout=30)
+                response.raise_for_status()
             
             data = response.json()
             return data.get("response", "").strip()
         except Exception as e:
-            print(f"⚠️ Failed to call Local LLM (Ollama): {e}")
+            logger.warning("Failed to call local LLM (Ollama)", extra={"error": str(e)})
             return None
 
 
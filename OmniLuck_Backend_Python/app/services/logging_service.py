@@ -0,0 +1,204 @@
+"""
+Structured Logging.
+Non-blocking, rate-limited JSON logging for the services and routes.
+
+- Callers only enqueue records (QueueHandler); a background QueueListener
+  thread formats and writes them, so stdout never blocks the event loop.
+- Every message template gets LOG_RATE_BURST records per LOG_RATE_WINDOW
+  seconds; beyond that only 1 in LOG_SAMPLE_EVERY passes, carrying a
+  `suppressed` count of what was dropped. Templates are the unformatted
+  message, so "Using cached AI response" is one stream across all users.
+- Output is one JSON object per line (LOG_FORMAT=json, default) with any
+  `extra=` fields as keys, or plain text (LOG_FORMAT=text).
+- shutdown() drains the queue and stops the thread; anything logged after
+  that is written directly, and the next configure() (e.g. from a later
+  get_logger()) brings the queue back.
+
+    from app.services.logging_service import get_logger
+    logger = get_logger(__name__)
+    logger.warning("Weather API error", extra={"error": str(e)})
+
+LOG_LEVEL=OFF disables logging entirely.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.config import settings
+
+ROOT_LOGGER = "omniluck"
+
+# Attributes every LogRecord has; anything else came from `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """LogRecord -> one-line JSON object"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = " ".join(f"{k}={v}" for k, v in record.__dict__.items() if k not in _RECORD_ATTRS)
+        line = f"{datetime.fromtimestamp(record.created):%H:%M:%S} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if fields:
+            line += f" [{fields}]"
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class RateLimitFilter(logging.Filter):
+    """Per-template token window with 1-in-N sampling beyond the burst"""
+
+    def __init__(self, burst: int, window: float, sample_every: int):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.sample_every = max(1, sample_every)
+        # template -> [window start, records in window, suppressed since last pass]
+        self._state: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR and record.exc_info:
+            return True  # Never drop tracebacks
+
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                state = self._state[key] = [now, 0, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+            state[1] += 1
+            seen = state[1]
+            if seen > self.burst and (seen - self.burst) % self.sample_every:
+                state[2] += 1
+                return False
+            if state[2]:
+                record.suppressed = state[2]
+                state[2] = 0
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records with the message and traceback rendered but fields kept"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock handler folds the traceback into msg; keep it separate
+        # so the JSON formatter can emit it as its own "exc" field
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LoggingService:
+    """Owns the queue, listener thread and handler configuration"""
+
+    def __init__(self):
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._handler: Optional[logging.Handler] = None  # The one installed on the root app logger
+        self._stream = None
+        self._configured = False
+        self._exit_hook = False
+        self._lock = threading.Lock()
+
+    def _install(self, handler: logging.Handler):
+        logger = logging.getLogger(ROOT_LOGGER)
+        if self._handler is not None:
+            logger.removeHandler(self._handler)
+        logger.addHandler(handler)
+        self._handler = handler
+
+    def configure(self, stream=None):
+        """Install the queue handler on the root app logger (idempotent until shutdown())."""
+        with self._lock:
+            if self._configured:
+                return
+            self._configured = True
+
+            logger = logging.getLogger(ROOT_LOGGER)
+            logger.propagate = False
+            level = settings.LOG_LEVEL.upper()
+            if level == "OFF":
+                # Above CRITICAL: every app logger's isEnabledFor() is False,
+                # and the NullHandler keeps logging's lastResort from printing
+                logger.setLevel(logging.CRITICAL + 1)
+                self._install(logging.NullHandler())
+                return
+            logger.setLevel(level)
+
+            self._stream = stream or self._stream or sys.stdout
+            output = logging.StreamHandler(self._stream)
+            output.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            queue_handler = _QueueHandler(log_queue)
+            queue_handler.addFilter(RateLimitFilter(
+                settings.LOG_RATE_BURST, settings.LOG_RATE_WINDOW, settings.LOG_SAMPLE_EVERY
+            ))
+            self._install(queue_handler)
+
+            self._listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+            self._listener.start()
+            if not self._exit_hook:
+                self._exit_hook = True
+                atexit.register(self.shutdown)
+
+    def shutdown(self):
+        """Flush queued records and stop the writer thread; later records are written directly."""
+        with self._lock:
+            listener, self._listener = self._listener, None
+            if listener is None:
+                return
+            # Swap in a direct handler before stopping the listener, so
+            # nothing is queued behind the stop sentinel and lost
+            direct = logging.StreamHandler(self._stream)
+            direct.setFormatter(listener.handlers[0].formatter)
+            for rate_filter in self._handler.filters:
+                direct.addFilter(rate_filter)
+            self._install(direct)
+            self._configured = False
+        listener.stop()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the app root (app.services.x -> omniluck.services.x)."""
+    logging_service.configure()
+    short_name = name[len("app."):] if name.startswith("app.") else name
+    return logging.getLogger(f"{ROOT_LOGGER}.{short_name}")
+
+
+# Singleton instance
+logging_service = LoggingService()
@@ -5,19 +5,48 @@ Data source: New York State Open Data (Official Powerball Results)
 
 Now with FILE-BASED PERSISTENCE - survives server restarts!
 Cache refreshes only after Powerball drawings (Mon, Wed, Sat at 10:59 PM ET).
+Draw history is ingested incrementally into the local draw store, so a refresh
+only downloads the drawings newer than the latest one we already have.
 """
+import asyncio
 import httpx
 import json
+import msgpack
 import os
+import tempfile
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
-from collections import Counter
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
 from pathlib import Path
+import numpy as np
 import pytz
+from filelock import FileLock, Timeout
+
+from app.services.draw_store import CURRENT_ERA, draw_store
+from app.services.cooccurrence_service import cooccurrence_service
+from app.services.match_service import match_service
+from app.services.history_service import history_service
+from app.services.timing_service import timing_service
+from app.services.metrics_service import metrics_service
+from app.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 
 # Cache file location (in app/data directory)
 CACHE_DIR = Path(__file__).parent.parent / "data"
-CACHE_FILE = CACHE_DIR / "lottery_cache.json"
+CACHE_FILE = CACHE_DIR / "lottery_cache.msgpack"
+LEGACY_CACHE_FILE = CACHE_DIR / "lottery_cache.json"  # Read if no msgpack cache yet
+LOCK_FILE = CACHE_DIR / "lottery_cache.lock"
+
+# How long a worker waits for another worker's refresh before serving stale stats
+REFRESH_LOCK_TIMEOUT = 60
+
+# Background refresher: results are usually published within the hour after
+# a drawing, so wake a little after it and back off until the draw appears
+POST_DRAWING_DELAY = timedelta(minutes=20)
+RETRY_INITIAL_DELAY = 5 * 60
+RETRY_MAX_DELAY = 2 * 60 * 60
 
 # Powerball drawing schedule: Monday, Wednesday, Saturday at 10:59 PM ET
 # Drawing days: 0=Mon, 2=Wed, 5=Sat
@@ -31,10 +60,21 @@ _memory_cache = {
     "cold_numbers": None,
     "hot_powerballs": None,
     "cold_powerballs": None,
-    "historical_drawings": None,  # NEW: Cached historical drawings
     "last_updated": None,
 }
 
+# When the draw store was last synced with the API (memory only)
+_last_draw_sync = None
+
+# One refresh at a time: asyncio lock within a worker, file lock across workers
+_refresh_lock = asyncio.Lock()
+_file_lock = FileLock(str(LOCK_FILE))
+
+# Bumped whenever the cached hot/cold numbers change (stamps StatsSnapshot)
+_stats_version = 0
+_stats_snapshot = None
+STATS_KEYS = ("hot_numbers", "cold_numbers", "hot_powerballs", "cold_powerballs")
+
 
 def _get_last_drawing_time() -> datetime:
     """Get the datetime of the most recent Powerball drawing."""
@@ -85,42 +125,87 @@ def _get_next_drawing_time() -> datetime:
 
 
 def _load_cache_from_file() -> Dict:
-    """Load cached stats from JSON file."""
-    global _memory_cache
-    
+    """Load cached stats from the msgpack file (or the legacy JSON file)."""
     try:
         if CACHE_FILE.exists():
-            with open(CACHE_FILE, 'r') as f:
+            with open(CACHE_FILE, 'rb') as f:
+                data = msgpack.unpackb(f.read())
+        elif LEGACY_CACHE_FILE.exists():
+            with open(LEGACY_CACHE_FILE, 'r') as f:
                 data = json.load(f)
-                # Convert last_updated back to datetime
-                if data.get("last_updated"):
-                    data["last_updated"] = datetime.fromisoformat(data["last_updated"])
-                # Update memory cache
-                _memory_cache.update(data)
-                return data
+        else:
+            return {}
+        # Convert last_updated back to datetime
+        if data.get("last_updated"):
+            data["last_updated"] = datetime.fromisoformat(data["last_updated"])
+        # Update memory cache
+        _update_memory_cache(data)
+        return data
     except Exception as e:
-        print(f"⚠️ Failed to load cache file: {e}")
+        logger.warning("Failed to load lottery cache file", extra={"error": str(e)})
     
     return {}
 
 
+def _update_memory_cache(data: Dict) -> None:
+    """Merge into the memory cache; bump _stats_version only if the hot/cold numbers changed."""
+    global _stats_version
+    
+    changed = any(key in data and data[key] != _memory_cache.get(key) for key in STATS_KEYS)
+    _memory_cache.update(data)
+    if changed:
+        _stats_version += 1
+
+
 def _save_cache_to_file(data: Dict):
-    """Save stats to JSON file for persistence."""
+    """
+    Save stats to the msgpack file for persistence.
+    Written to a temp file and renamed, so readers never see a partial file.
+    Callers hold _file_lock.
+    """
     try:
         # Ensure directory exists
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
         
-        # Prepare data for JSON (convert datetime to string)
+        # Prepare data (convert datetime to string)
         save_data = data.copy()
         if isinstance(save_data.get("last_updated"), datetime):
             save_data["last_updated"] = save_data["last_updated"].isoformat()
         
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(save_data, f, indent=2)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=".lottery_cache.", suffix=".tmp")
+        try:
+            os.chmod(tmp_path, 0o644)  # mkstemp creates 0600
+            with os.fdopen(fd, 'wb') as f:
+                f.write(msgpack.packb(save_data))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, CACHE_FILE)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
         
-        print(f"💾 Lottery stats saved to {CACHE_FILE}")
+        logger.info("Lottery stats saved", extra={"path": str(CACHE_FILE)})
     except Exception as e:
-        print(f"⚠️ Failed to save cache file: {e}")
+        logger.warning("Failed to save lottery cache file", extra={"error": str(e)})
+
+
+def _has_draw(date_str: str) -> bool:
+    """Whether the local draw store already holds the drawing on date_str."""
+    latest = draw_store.latest_date
+    return bool(latest) and latest >= date_str
+
+
+async def _acquire_file_lock(timeout: float) -> bool:
+    """Poll the cross-process lock without blocking the event loop."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        try:
+            _file_lock.acquire(timeout=0)
+            return True
+        except Timeout:
+            if asyncio.get_running_loop().time() >= deadline:
+                return False
+            await asyncio.sleep(0.25)
 
 
 class LotteryStatsService:
@@ -132,19 +217,26 @@ class LotteryStatsService:
     
     # NY State Open Data API - Official Powerball Results
     API_URL = "https://data.ny.gov/resource/d6yy-54nr.json"
+    # Upper bound for a single ingest request (full history is ~2k draws)
+    MAX_INGEST_RECORDS = 50000
     
     def __init__(self):
-        self.white_ball_max = 69
-        self.powerball_max = 26
+        self.white_ball_max = CURRENT_ERA.white_ball_max
+        self.powerball_max = CURRENT_ERA.powerball_max
+        self._cum_cache = {}  # Cumulative counts derived from the draw store
+        self._refresh_task = None  # Background refresh kicked by a stale request
+        # Failed background refreshes back off (time.monotonic() of the next allowed attempt)
+        self._next_background_refresh = 0.0
+        self._background_refresh_delay = RETRY_INITIAL_DELAY
         # Load cache from file on startup
         _load_cache_from_file()
         if _memory_cache.get("hot_numbers"):
-            print(f"📂 Loaded lottery stats from file cache")
+            logger.info("Loaded lottery stats from file cache")
     
     async def fetch_recent_draws(self, limit: int = 100) -> List[Dict]:
         """Fetch the last N Powerball draws from official API."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with httpx.AsyncClient(timeout=10.0, transport=metrics_service.transport()) as client:
                 response = await client.get(
                     self.API_URL,
                     params={"$limit": limit, "$order": "draw_date DESC"}
@@ -152,9 +244,40 @@ class LotteryStatsService:
                 response.raise_for_status()
                 return response.json()
         except Exception as e:
-            print(f"⚠️ Lottery API Error: {e}")
+            logger.warning("Lottery API error", extra={"error": str(e)})
             return []
     
+    async def sync_draws(self) -> int:
+        """
+        Incrementally ingest new draws into the local draw store.
+        Only asks the API for draws newer than the newest stored draw_date,
+        so a refresh after a drawing transfers a single record.
+        Returns the number of new draws stored.
+        """
+        global _last_draw_sync
+        
+        params = {"$order": "draw_date ASC", "$limit": self.MAX_INGEST_RECORDS}
+        latest = draw_store.latest_date
+        if latest:
+            params["$where"] = f"draw_date > '{latest}T00:00:00.000'"
+        
+        try:
+            async with httpx.AsyncClient(timeout=30.0, transport=metrics_service.transport()) as client:
+                response = await client.get(self.API_URL, params=params)
+                response.raise_for_status()
+                records = response.json()
+        except Exception as e:
+            logger.warning("Lottery API error", extra={"error": str(e)})
+            return 0
+        
+        added = draw_store.append(records)
+        _last_draw_sync = datetime.now()
+        if added:
+            cooccurrence_service.update()
+            match_service.update()
+            logger.info("Ingested new Powerball draws", extra={"added": added, "total": len(draw_store)})
+        return added
+    
     def parse_winning_numbers(self, draw: Dict) -> Tuple[List[int], int]:
         """
         Parse a draw record into white balls and powerball.
@@ -169,190 +292,316 @@ class LotteryStatsService:
         powerball = int(parts[5])
         return white_balls, powerball
     
-    def calculate_frequency(self, draws: List[Dict]) -> Dict:
+    def _cumulative_counts(self) -> Dict:
         """
-        Calculate frequency of each number appearing.
-        Returns hot (most frequent) and cold (least frequent) numbers.
+        Per-draw cumulative ball counts over the current-matrix draws (older
+        draws had other ball ranges), cached per draw store version.
+        Row i holds how often each ball appeared in the first i of those
+        draws, so the frequency over any window is a single row subtraction.
         """
-        white_counter = Counter()
-        powerball_counter = Counter()
+        if self._cum_cache.get("version") == draw_store.version:
+            return self._cum_cache
         
-        for draw in draws:
-            white_balls, powerball = self.parse_winning_numbers(draw)
-            if white_balls:
-                white_counter.update(white_balls)
-                powerball_counter[powerball] += 1
+        base = draw_store.current_era_start()
+        n = len(draw_store) - base
+        rows = np.arange(n)
+        white_hits = np.zeros((n, self.white_ball_max + 1), dtype=np.int32)
+        white_hits[rows[:, None], draw_store.white_balls[base:]] = 1
+        pb_hits = np.zeros((n, self.powerball_max + 1), dtype=np.int32)
+        pb_hits[rows, draw_store.powerballs[base:]] = 1
         
-        # Sort by frequency
-        white_sorted = white_counter.most_common()
-        powerball_sorted = powerball_counter.most_common()
+        def last_seen(hits: np.ndarray) -> np.ndarray:
+            # Index of the latest draw containing each ball (-1 = never)
+            seen = hits.any(axis=0)
+            return np.where(seen, n - 1 - np.argmax(hits[::-1], axis=0), -1)
         
-        # Top 16 hot, Bottom 10 cold for white balls
-        hot_white = [num for num, count in white_sorted[:16]]
-        cold_white = [num for num, count in white_sorted[-10:]]
+        self._cum_cache = {
+            "version": draw_store.version,
+            "base": base,
+            "draws": n,
+            "white": np.concatenate([np.zeros((1, white_hits.shape[1]), dtype=np.int32), white_hits.cumsum(axis=0)]),
+            "powerball": np.concatenate([np.zeros((1, pb_hits.shape[1]), dtype=np.int32), pb_hits.cumsum(axis=0)]),
+            "white_last": last_seen(white_hits),
+            "powerball_last": last_seen(pb_hits),
+        }
+        return self._cum_cache
+    
+    def calculate_frequency(self, window: Optional[int] = 100) -> Dict:
+        """
+        Calculate frequency statistics over the last `window` current-matrix
+        draws (None = all of them, i.e. since 2015-10-07), fully vectorized.
+        Returns hot (most frequent) and cold (least frequent) numbers, plus
+        last-seen gaps and rolling-window momentum for every ball.
+        """
+        cum = self._cumulative_counts()
+        n = cum["draws"]
+        w = n if not window else min(window, n)
+        start = n - w
+        
+        white_freq = (cum["white"][n] - cum["white"][start])[1:]
+        pb_freq = (cum["powerball"][n] - cum["powerball"][start])[1:]
         
-        # Top 5 hot, Bottom 5 cold for powerball
-        hot_pb = [num for num, count in powerball_sorted[:5]]
-        cold_pb = [num for num, count in powerball_sorted[-5:]]
+        # Sort by frequency (ties -> lower number first)
+        white_sorted = np.argsort(-white_freq, kind="stable") + 1
+        pb_sorted = np.argsort(-pb_freq, kind="stable") + 1
+        
+        # Last-seen gap in draws (0 = latest draw), None if not seen in window
+        def gaps(last: np.ndarray) -> Dict[int, Optional[int]]:
+            return {
+                ball: (int(n - 1 - idx) if idx >= start else None)
+                for ball, idx in enumerate(last[1:].tolist(), start=1)
+            }
+        
+        # Rolling momentum: count in this window minus the previous equal window
+        momentum = None
+        if start >= w > 0:
+            prev = (cum["white"][start] - cum["white"][start - w])[1:]
+            momentum = dict(zip(range(1, self.white_ball_max + 1), (white_freq - prev).tolist()))
+        
+        white = draw_store.white_balls[cum["base"] + start:].astype(np.int32)
+        sums = white.sum(axis=1)
         
         return {
-            "hot_numbers": hot_white,
-            "cold_numbers": cold_white,
-            "hot_powerballs": hot_pb,
-            "cold_powerballs": cold_pb,
-            "white_frequency": dict(white_counter),
-            "powerball_frequency": dict(powerball_counter),
-            "total_draws_analyzed": len(draws)
+            "window": w,
+            "matrix": CURRENT_ERA.name,
+            # Top 16 hot, Bottom 10 cold for white balls
+            "hot_numbers": white_sorted[:16].tolist(),
+            "cold_numbers": white_sorted[-10:].tolist(),
+            # Top 5 hot, Bottom 5 cold for powerball
+            "hot_powerballs": pb_sorted[:5].tolist(),
+            "cold_powerballs": pb_sorted[-5:].tolist(),
+            "white_frequency": dict(zip(range(1, self.white_ball_max + 1), white_freq.tolist())),
+            "powerball_frequency": dict(zip(range(1, self.powerball_max + 1), pb_freq.tolist())),
+            "last_seen": {
+                "white": gaps(cum["white_last"]),
+                "powerball": gaps(cum["powerball_last"]),
+            },
+            "rolling": {
+                "white_momentum": momentum,
+                "avg_sum": round(float(sums.mean()), 2) if w else None,
+                "avg_odd_count": round(float((white % 2).sum(axis=1).mean()), 2) if w else None,
+                "avg_low_count": round(float((white <= 34).sum(axis=1).mean()), 2) if w else None,
+            },
+            "total_draws_analyzed": w
         }
     
+    @timing_service.timed("lottery_refresh")
+    async def refresh(self, force: bool = False, require_draw: Optional[str] = None) -> bool:
+        """
+        Sync new draws and recompute the hot/cold stats - at most once per
+        drawing across all requests and worker processes.
+        Waiters re-check the cache after getting the lock, so a stampede
+        after a drawing still makes a single API call.
+        require_draw (YYYY-MM-DD) also treats the cache as stale until that
+        drawing is in the draw store (results are published after the draw).
+        Returns True if this call performed the refresh.
+        """
+        global _last_draw_sync
+        
+        def is_current(last_updated) -> bool:
+            return not force and _is_cache_valid(last_updated) and (not require_draw or _has_draw(require_draw))
+        
+        async with _refresh_lock:
+            # Another request in this worker may have refreshed while we waited
+            if is_current(_last_draw_sync) and is_current(_memory_cache.get("last_updated")):
+                return False
+            
+            if not await _acquire_file_lock(REFRESH_LOCK_TIMEOUT):
+                logger.warning("Lottery refresh lock busy - serving cached stats")
+                return False
+            try:
+                # Another worker may have refreshed (and saved draws) meanwhile
+                _load_cache_from_file()
+                if draw_store.reload():
+                    cooccurrence_service.update()
+                    match_service.update()
+                last_updated = _memory_cache.get("last_updated")
+                if is_current(last_updated):
+                    _last_draw_sync = last_updated
+                    return False
+                
+                # Pull any new draws, then analyze the latest 100 from the local store
+                logger.info("Syncing live Powerball statistics")
+                await self.sync_draws()
+                if not len(draw_store):
+                    return False
+                
+                stats = self.calculate_frequency(window=100)
+                self._swap_stats(stats)
+                
+                # Only mark fresh if the sync succeeded (otherwise retry next call)
+                if _is_cache_valid(_last_draw_sync):
+                    _memory_cache["last_updated"] = _last_draw_sync
+                    # Save to file for persistence
+                    _save_cache_to_file(_memory_cache)
+                
+                logger.info("Lottery stats updated", extra={"hot": stats['hot_numbers'][:5]})
+                return True
+            finally:
+                _file_lock.release()
+    
+    def _swap_stats(self, stats: Dict) -> None:
+        """Replace the cached hot/cold numbers in one step (readers never see a mix)."""
+        _update_memory_cache({key: stats[key] for key in STATS_KEYS})
+    
+    def refresh_in_background(self) -> None:
+        """
+        Start a refresh task unless one is already running or the last one
+        failed less than the current backoff ago (callers don't wait).
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        if time.monotonic() < self._next_background_refresh:
+            return
+        self._refresh_task = asyncio.create_task(self._background_refresh())
+    
+    async def _background_refresh(self) -> None:
+        """Refresh once; back off (5 min, doubling) while the draw store stays stale."""
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning("Background lottery refresh failed", extra={"error": str(e)})
+        if _is_cache_valid(_last_draw_sync):
+            self._background_refresh_delay = RETRY_INITIAL_DELAY
+            self._next_background_refresh = 0.0
+            return
+        logger.info("Lottery refresh failed - backing off", extra={"retry_in_s": self._background_refresh_delay})
+        self._next_background_refresh = time.monotonic() + self._background_refresh_delay
+        self._background_refresh_delay = min(self._background_refresh_delay * 2, RETRY_MAX_DELAY)
+    
+    async def run_refresh_scheduler(self) -> None:
+        """
+        Background refresher (started in the app lifespan).
+        Wakes shortly after each Mon/Wed/Sat drawing, retries with backoff
+        until the new draw is published, then sleeps until the next drawing.
+        """
+        while True:
+            await self._refresh_until_published()
+            wake_at = _get_next_drawing_time() + POST_DRAWING_DELAY
+            delay = (wake_at - datetime.now(ET_TIMEZONE)).total_seconds()
+            logger.info("Next lottery refresh scheduled", extra={"at": wake_at.isoformat()})
+            await asyncio.sleep(max(delay, 0))
+    
+    async def _refresh_until_published(self) -> None:
+        """Refresh until the latest drawing is in the draw store."""
+        delay = RETRY_INITIAL_DELAY
+        while True:
+            drawing_date = _get_last_drawing_time().date().isoformat()
+            try:
+                await self.refresh(require_draw=drawing_date)
+            except Exception as e:
+                logger.warning("Scheduled lottery refresh failed", extra={"error": str(e)})
+            if _has_draw(drawing_date):
+                return
+            logger.info("Drawing not published yet - retrying", extra={"drawing_date": str(drawing_date), "retry_in_s": delay})
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RETRY_MAX_DELAY)
+    
     async def get_live_stats(self, force_refresh: bool = False) -> Dict:
         """
         Get hot/cold numbers. Uses cache until next Powerball drawing!
         Cache is stored in file and survives server restarts!
-        Refreshes only after drawings (Mon/Wed/Sat at 10:59 PM ET).
+        Refreshes only after drawings (Mon/Wed/Sat at 10:59 PM ET), in the
+        background - requests never wait on the API unless force_refresh.
         """
-        global _memory_cache
-        
-        now = datetime.now()
-        
         # Try to load from file if memory cache is empty
         if not _memory_cache.get("last_updated"):
             _load_cache_from_file()
         
-        # Check if cache is valid (no new drawing since last update)
-        if not force_refresh and _memory_cache.get("last_updated"):
-            last_updated = _memory_cache["last_updated"]
-            if isinstance(last_updated, str):
-                last_updated = datetime.fromisoformat(last_updated)
-            
-            if _is_cache_valid(last_updated):
-                last_drawing = _get_last_drawing_time()
-                print(f"📊 Using cached lottery stats (last drawing: {last_drawing.strftime('%a %m/%d %I:%M %p ET')})")
-                return {
-                    "hot_numbers": _memory_cache["hot_numbers"],
-                    "cold_numbers": _memory_cache["cold_numbers"],
-                    "hot_powerballs": _memory_cache["hot_powerballs"],
-                    "cold_powerballs": _memory_cache["cold_powerballs"],
-                    "last_updated": last_updated.isoformat() if isinstance(last_updated, datetime) else last_updated,
-                    "next_refresh": _get_next_drawing_time().isoformat(),
-                    "cached": True
-                }
-        
-        # Fetch fresh data
-        print("🔄 Fetching live Powerball statistics...")
-        draws = await self.fetch_recent_draws(limit=100)
+        last_updated = _memory_cache.get("last_updated")
+        stale = not _is_cache_valid(last_updated)
+        metrics_service.cache_lookup("lottery_stats", not stale and not force_refresh)
+        if force_refresh:
+            await self.refresh(force=True)
+            last_updated, stale = _memory_cache.get("last_updated"), False
+        elif stale:
+            self.refresh_in_background()
         
-        if not draws:
-            # Fallback to hardcoded if API fails
-            print("⚠️ Using fallback statistics")
+        if not _memory_cache.get("hot_numbers"):
+            # Fallback to hardcoded until the first refresh lands
+            logger.warning("Using fallback lottery statistics")
             return {
                 "hot_numbers": [61, 32, 63, 21, 69, 36, 62, 39, 37, 23, 10, 24, 59, 20, 3, 27],
                 "cold_numbers": [13, 34, 4, 46, 51, 26, 60, 16, 35, 29],
                 "hot_powerballs": [6, 9, 14, 18, 21],
                 "cold_powerballs": [1, 12, 15, 17, 25],
-                "last_updated": now.isoformat(),
+                "last_updated": datetime.now().isoformat(),
                 "cached": False,
                 "fallback": True
             }
         
-        # Calculate stats
-        stats = self.calculate_frequency(draws)
-        
-        # Update memory cache
-        _memory_cache["hot_numbers"] = stats["hot_numbers"]
-        _memory_cache["cold_numbers"] = stats["cold_numbers"]
-        _memory_cache["hot_powerballs"] = stats["hot_powerballs"]
-        _memory_cache["cold_powerballs"] = stats["cold_powerballs"]
-        _memory_cache["last_updated"] = now
-        
-        # Save to file for persistence
-        _save_cache_to_file(_memory_cache)
-        
-        print(f"✅ Lottery stats updated! Hot: {stats['hot_numbers'][:5]}...")
-        
-        return {
-            "hot_numbers": stats["hot_numbers"],
-            "cold_numbers": stats["cold_numbers"],
-            "hot_powerballs": stats["hot_powerballs"],
-            "cold_powerballs": stats["cold_powerballs"],
-            "white_frequency": stats["white_frequency"],
-            "powerball_frequency": stats["powerball_frequency"],
-            "total_draws": stats["total_draws_analyzed"],
-            "last_updated": now.isoformat(),
-            "cached": False
+        if not stale:
+            last_drawing = _get_last_drawing_time()
+            logger.debug("Using cached lottery stats", extra={"last_drawing": last_drawing.isoformat()})
+        result = {
+            "hot_numbers": _memory_cache["hot_numbers"],
+            "cold_numbers": _memory_cache["cold_numbers"],
+            "hot_powerballs": _memory_cache["hot_powerballs"],
+            "cold_powerballs": _memory_cache["cold_powerballs"],
+            "last_updated": last_updated.isoformat() if last_updated else None,
+            "next_refresh": _get_next_drawing_time().isoformat(),
+            "cached": True
         }
+        if stale:
+            result["stale"] = True
+        return result
     
-    async def get_historical_drawings(self, limit: int = 20, force_refresh: bool = False) -> Dict:
+    async def get_window_stats(self, window: Optional[int] = None) -> Dict:
         """
-        Get recent Powerball drawing history with smart caching.
-        Uses same refresh logic as hot/cold numbers (only after new drawings).
+        Get frequency, hot/cold, last-seen gap and rolling stats for any
+        window of recent draws (e.g. 10, 50, 100, 500; None = every
+        current-matrix draw).
         """
-        global _memory_cache
-        
-        now = datetime.now()
-        
-        # Try to load from file if memory cache is empty
-        if not _memory_cache.get("last_updated"):
-            _load_cache_from_file()
-        
-        # Check if cache is valid (no new drawing since last update)
-        if not force_refresh and _memory_cache.get("historical_drawings") and _memory_cache.get("last_updated"):
-            last_updated = _memory_cache["last_updated"]
-            if isinstance(last_updated, str):
-                last_updated = datetime.fromisoformat(last_updated)
-            
-            if _is_cache_valid(last_updated):
-                print(f"📊 Using cached historical drawings ({len(_memory_cache['historical_drawings'])} draws)")
-                return {
-                    "drawings": _memory_cache["historical_drawings"][:limit],
-                    "last_updated": last_updated.isoformat() if isinstance(last_updated, datetime) else last_updated,
-                    "next_refresh": _get_next_drawing_time().isoformat(),
-                    "cached": True
-                }
+        live = await self.get_live_stats()
+        if not len(draw_store):
+            return live
         
-        # Fetch fresh data
-        print("🔄 Fetching historical Powerball drawings...")
-        draws = await self.fetch_recent_draws(limit=limit)
-        
-        if not draws:
-            # Return cached data if available, even if stale
-            if _memory_cache.get("historical_drawings"):
-                return {
-                    "drawings": _memory_cache["historical_drawings"][:limit],
-                    "last_updated": now.isoformat(),
-                    "cached": True,
-                    "stale": True
-                }
-            return {"drawings": [], "error": "Failed to fetch drawings"}
-        
-        # Parse draws into a cleaner format
-        parsed_drawings = []
-        for draw in draws:
-            numbers_str = draw.get("winning_numbers", "")
-            parts = numbers_str.split()
-            if len(parts) == 6:
-                parsed_drawings.append({
-                    "date": draw.get("draw_date", "")[:10],
-                    "white_balls": [int(p) for p in parts[:5]],
-                    "powerball": int(parts[5]),
-                    "multiplier": draw.get("multiplier")
-                })
-        
-        # Update memory cache
-        _memory_cache["historical_drawings"] = parsed_drawings
-        _memory_cache["last_updated"] = now
-        
-        # Save to file for persistence
-        _save_cache_to_file(_memory_cache)
+        stats = self.calculate_frequency(window=window)
+        stats.update({
+            "last_updated": live.get("last_updated"),
+            "next_refresh": _get_next_drawing_time().isoformat(),
+            "cached": live.get("cached", False)
+        })
+        return stats
+    
+    async def check_history_freshness(self, force_refresh: bool = False) -> bool:
+        """
+        Start a background refresh if a drawing happened since the last sync
+        (or refresh now if forced). Returns True if the store is stale.
+        """
+        if force_refresh:
+            await self.refresh(force=True)
+        elif not _is_cache_valid(_last_draw_sync):
+            self.refresh_in_background()
+        return not _is_cache_valid(_last_draw_sync)
+    
+    async def get_historical_drawings(
+        self, limit: int = 20, force_refresh: bool = False, cursor: Optional[str] = None,
+        start_date: Optional[str] = None, end_date: Optional[str] = None,
+        balls: Sequence[int] = (), powerball: Optional[int] = None, order: str = "desc"
+    ) -> Dict:
+        """
+        Get a page of Powerball drawing history from the local draw store.
+        Uses same refresh logic as hot/cold numbers (only after new drawings,
+        in the background), and a refresh only ingests the draws we don't have yet.
+        Pass the returned next_cursor back as `cursor` for the next page.
+        """
+        stale = await self.check_history_freshness(force_refresh)
         
-        print(f"✅ Historical drawings updated! {len(parsed_drawings)} draws cached")
+        if not len(draw_store):
+            return {"drawings": [], "error": "Drawing history is still loading"}
         
-        return {
-            "drawings": parsed_drawings[:limit],
-            "last_updated": now.isoformat(),
+        indices = history_service.find(start_date, end_date, balls, powerball)
+        result = history_service.page(indices, limit=limit, cursor=cursor, order=order)
+        result.update({
+            "last_updated": _last_draw_sync.isoformat() if _last_draw_sync else None,
             "next_refresh": _get_next_drawing_time().isoformat(),
-            "cached": False
-        }
+            "cached": True
+        })
+        if stale:
+            # Refresh pending or failed - serve what we have, even if stale
+            result["stale"] = True
+        return result
 
 
 # Singleton instance
@@ -381,3 +630,52 @@ def get_hot_cold_numbers() -> Tuple[List[int], List[int]]:
         [61, 32, 63, 21, 69, 36, 62, 39, 37, 23, 10, 24, 59, 20, 3, 27],
         [13, 34, 4, 46, 51, 26, 60, 16, 35, 29]
     )
+
+
+@dataclass(frozen=True)
+class StatsSnapshot:
+    """
+    Immutable view of the hot/cold numbers, taken once per generation call.
+    nearest_hot[ball] is the first hot number within 1 of `ball` (in hot-list
+    order), or `ball` itself when there is none.
+    """
+    version: int
+    hot_numbers: Tuple[int, ...]
+    cold_numbers: Tuple[int, ...]
+    hot_set: FrozenSet[int]
+    cold_set: FrozenSet[int]
+    nearest_hot: Tuple[int, ...]
+
+    @classmethod
+    def build(cls, hot: List[int], cold: List[int], version: int = 0, white_ball_max: int = 69) -> "StatsSnapshot":
+        nearest = list(range(white_ball_max + 2))
+        for ball in range(1, white_ball_max + 1):
+            for h in hot:
+                if abs(ball - h) <= 1:
+                    nearest[ball] = h
+                    break
+        return cls(
+            version=version,
+            hot_numbers=tuple(hot),
+            cold_numbers=tuple(cold),
+            hot_set=frozenset(hot),
+            cold_set=frozenset(cold),
+            nearest_hot=tuple(nearest),
+        )
+
+
+def get_stats_snapshot() -> StatsSnapshot:
+    """
+    Current hot/cold numbers as a StatsSnapshot.
+    Rebuilt only when the cached stats change (tracked by version).
+    """
+    global _stats_snapshot
+    
+    if _stats_snapshot is not None and _stats_snapshot.version == _stats_version:
+        metrics_service.cache_lookup("stats_snapshot", True)
+        return _stats_snapshot
+    
+    metrics_service.cache_lookup("stats_snapshot", False)
+    hot, cold = get_hot_cold_numbers()  # May load the file cache (bumps the version if it differs)
+    _stats_snapshot = StatsSnapshot.build(hot, cold, _stats_version)
+    return _stats_snapshot
@@ -0,0 +1,368 @@
+"""
+Ticket-vs-History Match Index.
+Answers "would these lines ever have won?" against the full draw history.
+
+Index layout (built from the local draw store, updated as draws are ingested):
+- one 128-bit white-ball bitset per draw (two uint64 words, bit b = ball b)
+- inverted indexes from each white ball / Powerball to the draws containing it
+- a sorted white-ball triple index (every 3-subset of every draw)
+- an exact-combination map for O(1) "has this 5-ball set ever been drawn"
+
+Every prize needs either the Powerball or 3+ white balls, so a line is only
+ever compared against the draws reachable through the Powerball postings or
+one of its 10 white-ball triples. Those candidates are scored with bitset
+popcounts and mapped to prize tiers, all vectorized across lines.
+
+update() is serialized by a lock and publishes each index generation as a
+whole (_MatchIndex), so checks running in executor threads never see a
+half-built index.
+
+Draws are tagged with their matrix era (draw_store.MATRIX_ERAS): the tier
+structure is the same in every era, but fixed prizes are paid from the
+prize table of the draw's own era (ERA_PRIZES), and Powerballs up to 39 can
+be checked against the pre-2015 draws that used them.
+"""
+import threading
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.draw_store import CURRENT_ERA, MATRIX_ERAS, POWERBALL_MAX_EVER, draw_store, day_to_date
+from app.services.timing_service import timing_service
+
+WHITE_BALL_MAX = CURRENT_ERA.white_ball_max
+POWERBALL_MAX = CURRENT_ERA.powerball_max
+
+# Prize tiers (current Powerball rules): (white matches, powerball match) -> tier
+PRIZE_TIERS = [
+    {"tier": "Jackpot", "white": 5, "powerball": True, "prize": None},
+    {"tier": "Match 5", "white": 5, "powerball": False, "prize": 1_000_000},
+    {"tier": "Match 4 + PB", "white": 4, "powerball": True, "prize": 50_000},
+    {"tier": "Match 4", "white": 4, "powerball": False, "prize": 100},
+    {"tier": "Match 3 + PB", "white": 3, "powerball": True, "prize": 100},
+    {"tier": "Match 3", "white": 3, "powerball": False, "prize": 7},
+    {"tier": "Match 2 + PB", "white": 2, "powerball": True, "prize": 7},
+    {"tier": "Match 1 + PB", "white": 1, "powerball": True, "prize": 4},
+    {"tier": "Match 0 + PB", "white": 0, "powerball": True, "prize": 4},
+]
+NO_PRIZE = len(PRIZE_TIERS)
+
+# Fixed prize per tier (PRIZE_TIERS order) for each of draw_store.MATRIX_ERAS
+ERA_PRIZES = {
+    "2009-01-07": [None, 200_000, 10_000, 100, 100, 7, 7, 4, 3],
+    "2012-01-15": [None, 1_000_000, 10_000, 100, 100, 7, 7, 4, 4],
+    CURRENT_ERA.start: [t["prize"] for t in PRIZE_TIERS],
+}
+# (eras x tiers + 1) fixed prize lookup; jackpots and "no prize" pay 0 here
+_ERA_PRIZE_TABLE = np.array(
+    [[prize or 0 for prize in ERA_PRIZES[era.start]] + [0] for era in MATRIX_ERAS], dtype=np.int64
+)
+
+# CODE_TIER[2 * white_matches + powerball_match] -> index into PRIZE_TIERS (NO_PRIZE = none)
+CODE_TIER = np.full(12, NO_PRIZE, dtype=np.int64)
+for _i, _t in enumerate(PRIZE_TIERS):
+    CODE_TIER[2 * _t["white"] + int(_t["powerball"])] = _i
+
+# Index positions of the 10 triples inside a sorted 5-ball line
+_TRIPLE_POSITIONS = np.array(list(combinations(range(5), 3)), dtype=np.intp)
+
+# Popcount for uint64 arrays (np.bitwise_count needs NumPy 2.0+)
+if hasattr(np, "bitwise_count"):
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(words)
+else:
+    _BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        as_bytes = np.ascontiguousarray(words).view(np.uint8).reshape(words.shape + (8,))
+        return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.uint8)
+
+
+def balls_to_bitsets(white_balls: np.ndarray) -> np.ndarray:
+    """(N x 5) white balls -> (N x 2) uint64 bitsets (bit b set for ball b)."""
+    white = np.asarray(white_balls, dtype=np.uint64)
+    bits = np.uint64(1) << (white % np.uint64(64))
+    low = np.where(white < 64, bits, np.uint64(0))
+    high = np.where(white >= 64, bits, np.uint64(0))
+    return np.stack([np.bitwise_or.reduce(low, axis=1), np.bitwise_or.reduce(high, axis=1)], axis=1)
+
+
+def shared_balls(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Number of white balls shared by two broadcastable arrays of bitsets."""
+    return _popcount(a[..., 0] & b[..., 0]) + _popcount(a[..., 1] & b[..., 1])
+
+
+def _triple_keys(white: np.ndarray) -> np.ndarray:
+    """(N x 5) sorted white balls -> (N x 10) integer keys of their triples."""
+    triples = np.asarray(white, dtype=np.int64)[:, _TRIPLE_POSITIONS]
+    return (triples[..., 0] * 70 + triples[..., 1]) * 70 + triples[..., 2]
+
+
+def _build_postings(keys: np.ndarray, draws: np.ndarray, max_key: int):
+    """Group draw indices by key -> (postings, offsets) in CSR layout."""
+    order = np.argsort(keys, kind="stable")
+    counts = np.bincount(keys, minlength=max_key + 1)
+    return draws[order], np.concatenate([[0], np.cumsum(counts)])
+
+
+def _expand_ranges(postings: np.ndarray, starts: np.ndarray, stops: np.ndarray):
+    """
+    Concatenate postings[start:stop] for many ranges without a Python loop.
+    Returns (entries, index of the range each entry came from).
+    """
+    lengths = stops - starts
+    owner = np.repeat(np.arange(len(starts)), lengths)
+    # Position inside each run = global position - start of that run
+    run_starts = np.cumsum(lengths) - lengths
+    within = np.arange(lengths.sum()) - np.repeat(run_starts, lengths)
+    return postings[starts[owner] + within].astype(np.int64), owner
+
+
+class _MatchIndex:
+    """
+    One generation of the index. Never modified once published: update()
+    builds the next generation from it and swaps it in as a whole, so a
+    reader that took a reference sees consistent arrays throughout.
+    """
+
+    __slots__ = ("size", "dates", "bitsets", "bits_low", "bits_high", "powerballs", "eras", "combo_draws",
+                 "ball_draws", "ball_offsets", "pb_draws", "pb_offsets", "triple_keys", "triple_draws")
+
+    def __init__(self):
+        self.size = 0
+        self.dates = np.empty(0, dtype=np.int32)
+        self.bitsets = np.empty((0, 2), dtype=np.uint64)
+        self.bits_low = self.bits_high = np.empty(0, dtype=np.uint64)
+        self.powerballs = np.empty(0, dtype=np.uint8)
+        self.eras = np.empty(0, dtype=np.int64)  # Index into MATRIX_ERAS per draw
+        self.combo_draws: Dict[tuple, List[int]] = {}
+        self.ball_draws, self.ball_offsets = np.empty(0, np.int64), np.zeros(WHITE_BALL_MAX + 2, np.int64)
+        self.pb_draws, self.pb_offsets = np.empty(0, np.int64), np.zeros(POWERBALL_MAX_EVER + 2, np.int64)
+        self.triple_keys = np.empty(0, dtype=np.int64)
+        self.triple_draws = np.empty(0, dtype=np.int64)
+
+    def extended(self, balls: np.ndarray, dates: np.ndarray) -> "_MatchIndex":
+        """A new generation covering all of `balls` / `dates` (which start with this one's draws)."""
+        n = len(dates)
+        new_white = balls[self.size:n, :5]
+        index = _MatchIndex()
+        index.size = n
+        index.dates = dates.copy()
+        index.bitsets = np.concatenate([self.bitsets, balls_to_bitsets(new_white)])
+        index.bits_low = np.ascontiguousarray(index.bitsets[:, 0])
+        index.bits_high = np.ascontiguousarray(index.bitsets[:, 1])
+        index.powerballs = balls[:n, 5].copy()
+        index.eras = draw_store.era_ids(dates).astype(np.int64)
+        # Fresh lists for the combinations that gain a draw; the rest are shared
+        index.combo_draws = dict(self.combo_draws)
+        for offset, row in enumerate(new_white.tolist()):
+            key = tuple(row)
+            index.combo_draws[key] = index.combo_draws.get(key, []) + [self.size + offset]
+
+        # Inverted indexes (CSR): draws of ball b are ball_draws[offsets[b]:offsets[b+1]]
+        white = balls[:n, :5].astype(np.int64)
+        draw_ids = np.arange(n, dtype=np.int64)
+        index.ball_draws, index.ball_offsets = _build_postings(white.ravel(), np.repeat(draw_ids, 5), WHITE_BALL_MAX)
+        index.pb_draws, index.pb_offsets = _build_postings(index.powerballs.astype(np.int64), draw_ids, POWERBALL_MAX_EVER)
+
+        # Triple index: sorted triple keys with the draw each came from
+        keys = _triple_keys(white).ravel()
+        order = np.argsort(keys, kind="stable")
+        index.triple_keys = keys[order]
+        index.triple_draws = np.repeat(draw_ids, len(_TRIPLE_POSITIONS))[order]
+        return index
+
+    def draws_with_ball(self, ball: int) -> np.ndarray:
+        return self.ball_draws[self.ball_offsets[ball]:self.ball_offsets[ball + 1]]
+
+    def draws_with_powerball(self, powerball: int) -> np.ndarray:
+        return self.pb_draws[self.pb_offsets[powerball]:self.pb_offsets[powerball + 1]]
+
+    def exact_hits(self, white_balls: Sequence[int]) -> List[str]:
+        return [day_to_date(self.dates[i]) for i in self.combo_draws.get(tuple(sorted(white_balls)), [])]
+
+
+class MatchService:
+    """Bitset + inverted index over historical draws for batch ticket checks."""
+
+    def __init__(self):
+        self._index = _MatchIndex()
+        # update() runs on the event loop and in executor threads (ticket checks)
+        self._update_lock = threading.Lock()
+
+    def update(self) -> int:
+        """Index any draws added to the store since the last update."""
+        with self._update_lock:
+            index = self._index
+            draw_store.load()
+            dates, balls = np.asarray(draw_store.dates), np.asarray(draw_store.balls)
+            n = min(len(dates), len(balls))  # One consistent view if the store is swapped meanwhile
+            dates, balls = dates[:n], balls[:n]
+            if index.size and (n < index.size or dates[index.size - 1] != index.dates[-1]):
+                # History was rewritten (e.g. a back-filled draw) - rebuild
+                index = _MatchIndex()
+            if n == index.size:
+                self._index = index
+                return 0
+            self._index = index.extended(balls, dates)
+            return n - index.size
+
+    def _current(self) -> _MatchIndex:
+        """The up-to-date index generation; use it for a whole query."""
+        self.update()
+        return self._index
+
+    def draws_with_ball(self, ball: int) -> np.ndarray:
+        """Sorted indices of the draws that contained a white ball."""
+        return self._current().draws_with_ball(ball)
+
+    def draws_with_powerball(self, powerball: int) -> np.ndarray:
+        """Sorted indices of the draws with a given Powerball."""
+        return self._current().draws_with_powerball(powerball)
+
+    def draws_with_balls(self, balls: Sequence[int]) -> np.ndarray:
+        """Sorted indices of the draws that contained ALL the given white balls."""
+        index = self._current()
+        if not balls:
+            return np.arange(index.size, dtype=np.int64)
+        # Intersect the shortest posting lists first
+        postings = sorted((index.draws_with_ball(b) for b in balls), key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            result = np.intersect1d(result, posting, assume_unique=True)
+        return result
+
+    def exact_hits(self, white_balls: Sequence[int]) -> List[str]:
+        """Dates on which this exact 5-ball combination was drawn."""
+        return self._current().exact_hits(white_balls)
+
+    @staticmethod
+    def _candidates(index: _MatchIndex, white: np.ndarray, powerball: np.ndarray):
+        """
+        All (line, draw) pairs that can pay out: the draws sharing the line's
+        Powerball plus the draws sharing any of its white-ball triples.
+        Returns (lines, draws, tiers) arrays.
+        """
+        n = index.size
+        line_bits = balls_to_bitsets(white)
+
+        # Draws sharing the Powerball (every one is a prize)
+        pb_draws, pb_lines = _expand_ranges(index.pb_draws, index.pb_offsets[powerball], index.pb_offsets[powerball + 1])
+
+        # Draws sharing a triple (3+ white matches) that the Powerball pass missed
+        keys = _triple_keys(white).ravel()
+        starts = np.searchsorted(index.triple_keys, keys, side="left")
+        stops = np.searchsorted(index.triple_keys, keys, side="right")
+        tri_draws, owner = _expand_ranges(index.triple_draws, starts, stops)
+        tri_lines = owner // len(_TRIPLE_POSITIONS)
+        keep = index.powerballs[tri_draws] != powerball[tri_lines]
+        # A 4- or 5-ball match is reached through several triples - dedupe
+        pairs = np.unique(tri_lines[keep] * n + tri_draws[keep])
+        tri_lines, tri_draws = pairs // n, pairs % n
+
+        lines = np.concatenate([pb_lines, tri_lines])
+        draws = np.concatenate([pb_draws, tri_draws])
+        # Gather each bitset word from contiguous 1-D arrays (much faster than 2-D rows)
+        matches = _popcount(line_bits[:, 0][lines] & index.bits_low[draws])
+        matches += _popcount(line_bits[:, 1][lines] & index.bits_high[draws])
+        matches = matches.astype(np.int64)
+        pb_match = np.concatenate([np.ones(len(pb_lines), np.int64), np.zeros(len(tri_lines), np.int64)])
+        return lines, draws, CODE_TIER[2 * matches + pb_match]
+
+    @timing_service.timed("ticket_check")
+    def check_lines(self, lines: List[Dict], include_dates: bool = True) -> Dict:
+        """
+        Score lines ({"white_balls": [...], "powerball": n}) against every
+        historical draw. Returns per-line prize-tier hit counts (also split
+        by matrix era), best result and total fixed-prize winnings, each hit
+        paid from its draw's era prize table (jackpots counted separately).
+        """
+        index = self._current()
+        n_lines = len(lines)
+        white = np.sort(np.array([line["white_balls"] for line in lines], dtype=np.int64).reshape(-1, 5), axis=1)
+        powerball = np.array([line["powerball"] for line in lines], dtype=np.int64)
+        n_eras = len(MATRIX_ERAS)
+
+        tier_counts = np.zeros((n_lines, NO_PRIZE), dtype=np.int64)
+        era_counts = np.zeros((n_lines, n_eras), dtype=np.int64)
+        fixed_totals = np.zeros(n_lines, dtype=np.int64)
+        best_tier = np.full(n_lines, NO_PRIZE, dtype=np.int64)
+        best_draw = np.full(n_lines, -1, dtype=np.int64)
+
+        if index.size and n_lines:
+            cand_lines, cand_draws, cand_tiers = self._candidates(index, white, powerball)
+            tier_counts[:] = np.bincount(
+                cand_lines * NO_PRIZE + cand_tiers, minlength=n_lines * NO_PRIZE
+            ).reshape(n_lines, NO_PRIZE)
+            cand_eras = index.eras[cand_draws]
+            era_counts[:] = np.bincount(cand_lines * n_eras + cand_eras, minlength=n_lines * n_eras).reshape(n_lines, n_eras)
+            fixed_totals[:] = np.bincount(
+                cand_lines, weights=_ERA_PRIZE_TABLE[cand_eras, cand_tiers], minlength=n_lines
+            ).astype(np.int64)
+            # Best tier per line (lowest index), latest draw breaks ties:
+            # minimize tier * n + (n - 1 - draw) per line in one pass
+            n = index.size
+            best_key = np.full(n_lines, NO_PRIZE * n, dtype=np.int64)
+            np.minimum.at(best_key, cand_lines, cand_tiers * n + (n - 1 - cand_draws))
+            best_tier[:] = best_key // n
+            best_draw[:] = n - 1 - best_key % n
+
+        # Plain lists from here on - per-element NumPy access is slow
+        tier_names = [t["tier"] for t in PRIZE_TIERS]
+        era_names = [era.name for era in MATRIX_ERAS]
+        counts_list = tier_counts.tolist()
+        era_counts_list = era_counts.tolist()
+        fixed_totals = fixed_totals.tolist()
+        best_tiers = best_tier.tolist()
+        best_days = index.dates[best_draw].tolist() if index.size else []
+        white_list = white.tolist()
+        powerball_list = powerball.tolist()
+
+        results = []
+        for i, line in enumerate(lines):
+            has_hit = best_tiers[i] < NO_PRIZE
+            result = {
+                "white_balls": white_list[i],
+                "powerball": powerball_list[i],
+                "tiers": {name: c for name, c in zip(tier_names, counts_list[i]) if c},
+                "total_wins": sum(counts_list[i]),
+                "wins_by_matrix": {name: c for name, c in zip(era_names, era_counts_list[i]) if c},
+                "fixed_prize_total": fixed_totals[i],
+                "best_tier": tier_names[best_tiers[i]] if has_hit else None,
+                "best_date": day_to_date(best_days[i]) if has_hit else None,
+            }
+            if include_dates:
+                result["exact_white_hits"] = index.exact_hits(line["white_balls"])
+            results.append(result)
+
+        return {
+            "draws_checked": index.size,
+            "first_draw": day_to_date(index.dates[0]) if index.size else None,
+            "last_draw": day_to_date(index.dates[-1]) if index.size else None,
+            "matrices": [
+                {"matrix": era.name, "from": era.start, "draws": int(count)}
+                for era, count in zip(MATRIX_ERAS, np.bincount(index.eras, minlength=n_eras).tolist())
+                if count
+            ],
+            "results": results,
+        }
+
+    @staticmethod
+    def validate_line(line: Dict) -> Optional[str]:
+        """
+        Return an error message if a line is not a valid pick under any
+        matrix (white balls 1-69; Powerball 1-39, as drawn before 2015).
+        """
+        white = line.get("white_balls") or []
+        if len(white) != 5 or len(set(white)) != 5:
+            return "Each line needs 5 distinct white balls"
+        if not all(1 <= b <= WHITE_BALL_MAX for b in white):
+            return f"White balls must be between 1 and {WHITE_BALL_MAX}"
+        if not 1 <= line.get("powerball", 0) <= POWERBALL_MAX_EVER:
+            return f"Powerball must be between 1 and {POWERBALL_MAX_EVER}"
+        return None
+
+
+# Singleton instance
+match_service = MatchService()
@@ -0,0 +1,385 @@
+"""
+Prometheus Metrics.
+Counters, gauges and histograms rendered in the Prometheus text exposition
+format at GET /metrics - no client library or push gateway needed.
+
+Recorded:
+- HTTP request latency per route template / method / status
+- upstream calls (OpenWeather, NOAA, NY Open Data, Gemini, Groq, Ollama,
+  Firebase): count by outcome, latency, errors
+- cache hits/misses (and hit ratio) for the LLM response cache, the lottery
+  stats memory cache and snapshot, and the numerology memo caches
+- event-loop lag (sampled by a background task)
+- per-stage latency from timing_service
+- write-behind queues (luck history, check-ins): records written/dropped,
+  batch write latency
+
+Multi-worker safe: each worker process periodically writes its own snapshot
+to METRICS_DIR/<pid>.msgpack (atomic replace), and /metrics merges the
+files of the live workers. Counters and histograms are summed across
+workers; gauges are reported per worker with a `pid` label. A worker deletes
+its file at shutdown (close()), and files left by workers that died without
+one are pruned when /metrics finds their pid gone, so totals drop with the
+worker as they would for a restarted single process (Prometheus' rate()
+treats that as a counter reset).
+"""
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+import msgpack
+
+from app.config import settings
+from app.services.timing_service import NUM_BUCKETS as STAGE_BUCKETS, timing_service
+from app.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+METRICS_DIR = Path(settings.METRICS_DIR) if settings.METRICS_DIR else Path(__file__).parent.parent / "data" / "metrics"
+FLUSH_INTERVAL = 5.0  # Seconds between snapshot writes per worker
+LOOP_LAG_INTERVAL = 0.5  # Event-loop lag sampling period (seconds)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+STAGE_BUCKET_SECONDS = tuple(2 ** b / 1e6 for b in range(STAGE_BUCKETS - 1))
+
+PREFIX = "omniluck_"
+
+# Upstream label for hosts called through UpstreamMetricsTransport
+UPSTREAM_HOSTS = {
+    "api.openweathermap.org": "openweather",
+    "services.swpc.noaa.gov": "noaa",
+    "data.ny.gov": "ny_open_data",
+    "identitytoolkit.googleapis.com": "firebase",
+    "firestore.googleapis.com": "firebase",
+}
+
+# name -> (type, help)
+METRICS = {
+    "http_request_duration_seconds": ("histogram", "HTTP request latency by route template"),
+    "upstream_requests_total": ("counter", "Calls to upstream services by outcome"),
+    "upstream_errors_total": ("counter", "Failed calls to upstream services"),
+    "upstream_request_duration_seconds": ("histogram", "Upstream call latency"),
+    "cache_hits_total": ("counter", "Cache hits"),
+    "cache_misses_total": ("counter", "Cache misses"),
+    "cache_hit_ratio": ("gauge", "Cache hits / lookups (all workers)"),
+    "event_loop_lag_seconds": ("histogram", "Event-loop scheduling delay"),
+    "event_loop_lag_last_seconds": ("gauge", "Most recent event-loop lag sample per worker"),
+    "stage_duration_seconds": ("histogram", "Per-stage latency from timing spans"),
+    "write_behind_records_total": ("counter", "Records through write-behind queues by outcome"),
+    "write_behind_flush_seconds": ("histogram", "Write-behind batch write latency"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(**labels) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class MetricsService:
+    """In-process metric registry with file-based cross-worker aggregation"""
+
+    def __init__(self, metrics_dir: Path = METRICS_DIR):
+        self.metrics_dir = metrics_dir
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._gauges: Dict[Tuple[str, Labels], float] = {}
+        # (name, labels) -> [bucket bounds, counts per bucket (+Inf last), sum]
+        self._histograms: Dict[Tuple[str, Labels], list] = {}
+        # Caches that keep their own hit/miss counts (e.g. functools.lru_cache)
+        self._cache_collectors: Dict[str, Callable[[], Tuple[int, int]]] = {}
+        self._last_flush = 0.0
+
+    # --- Recording ---
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, _labels(**labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges[(name, _labels(**labels))] = value
+
+    def observe(self, name: str, value: float, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, _labels(**labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [list(buckets), [0] * (len(buckets) + 1), 0.0]
+            bounds, counts = histogram[0], histogram[1]
+            index = len(bounds)
+            for i, bound in enumerate(bounds):
+                if value <= bound:
+                    index = i
+                    break
+            counts[index] += 1
+            histogram[2] += value
+
+    def observe_request(self, route: str, method: str, status: int, seconds: float):
+        self.observe("http_request_duration_seconds", seconds, route=route, method=method, status=status)
+
+    def record_upstream(self, name: str, outcome: str, seconds: float):
+        """One upstream call; outcome is "2xx".."5xx" or "error" (no response)."""
+        self.inc("upstream_requests_total", upstream=name, outcome=outcome)
+        if outcome in ("error", "5xx"):
+            self.inc("upstream_errors_total", upstream=name)
+        self.observe("upstream_request_duration_seconds", seconds, upstream=name)
+
+    @contextmanager
+    def upstream(self, name: str):
+        """
+        Time an upstream SDK call: `with metrics_service.upstream("gemini"): ...`
+        A call that returns counts as "2xx" (same outcome labels as the httpx
+        transport); exceptions count as "error" and are re-raised.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.record_upstream(name, "error", time.perf_counter() - start)
+            raise
+        self.record_upstream(name, "2xx", time.perf_counter() - start)
+
+    def transport(self, upstream: Optional[str] = None) -> "UpstreamMetricsTransport":
+        """httpx transport that records every call (httpx.AsyncClient(transport=...))."""
+        return UpstreamMetricsTransport(upstream=upstream)
+
+    def cache_lookup(self, cache: str, hit: bool):
+        self.inc("cache_hits_total" if hit else "cache_misses_total", cache=cache)
+
+    def register_cache(self, cache: str, collector: Callable[[], Tuple[int, int]]):
+        """Register a cache that counts its own (hits, misses)."""
+        self._cache_collectors[cache] = collector
+
+    def register_lru_cache(self, cache: str, cached_function):
+        """Register a functools.lru_cache-wrapped function."""
+        def collect():
+            info = cached_function.cache_info()
+            return info.hits, info.misses
+        self.register_cache(cache, collect)
+
+    # --- Event loop ---
+
+    async def monitor_event_loop(self, interval: float = LOOP_LAG_INTERVAL):
+        """Background task: sample event-loop lag and flush this worker's snapshot."""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag = max(0.0, time.perf_counter() - start - interval)
+            self.observe("event_loop_lag_seconds", lag, buckets=LOOP_LAG_BUCKETS)
+            self.set_gauge("event_loop_lag_last_seconds", lag)
+            if time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+                self.flush()
+
+    # --- Snapshots ---
+
+    def snapshot(self) -> Dict:
+        """This process's metrics as plain lists (msgpack-friendly)."""
+        counters = []
+        for cache, collect in list(self._cache_collectors.items()):
+            try:
+                hits, misses = collect()
+            except Exception:
+                continue
+            counters.append(["cache_hits_total", [["cache", cache]], hits])
+            counters.append(["cache_misses_total", [["cache", cache]], misses])
+
+        with self._lock:
+            counters += [[name, [list(l) for l in labels], value] for (name, labels), value in self._counters.items()]
+            gauges = [[name, [list(l) for l in labels], value] for (name, labels), value in self._gauges.items()]
+            histograms = [
+                [name, [list(l) for l in labels], list(bounds), list(counts), total]
+                for (name, labels), (bounds, counts, total) in self._histograms.items()
+            ]
+
+        # Per-stage timing histograms (log2 microsecond buckets)
+        for stage, histogram in timing_service.histograms().items():
+            histograms.append([
+                "stage_duration_seconds", [["stage", stage]], list(STAGE_BUCKET_SECONDS),
+                histogram["counts"], histogram["sum_ms"] / 1000
+            ])
+
+        return {"pid": os.getpid(), "counters": counters, "gauges": gauges, "histograms": histograms}
+
+    def flush(self):
+        """Atomically write this worker's snapshot for /metrics aggregation."""
+        self._last_flush = time.monotonic()
+        try:
+            self.metrics_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.metrics_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(msgpack.packb(self.snapshot()))
+            os.replace(tmp_path, self.metrics_dir / f"{os.getpid()}.msgpack")
+        except Exception as e:
+            logger.warning("Failed to write metrics snapshot", extra={"error": str(e)})
+
+    def close(self):
+        """Remove this worker's snapshot so /metrics stops counting it (shutdown)."""
+        try:
+            (self.metrics_dir / f"{os.getpid()}.msgpack").unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("Failed to remove metrics snapshot", extra={"error": str(e)})
+
+    def _worker_snapshots(self) -> List[Dict]:
+        """Fresh snapshot for this process + the latest file of every other live worker."""
+        own_pid = os.getpid()
+        snapshots = [self.snapshot()]
+        for path in self.metrics_dir.glob("*.msgpack") if self.metrics_dir.exists() else []:
+            if path.stem == str(own_pid) or not path.stem.isdigit():
+                continue
+            if not _pid_alive(int(path.stem)):
+                # Left by a worker that exited without close() - prune it
+                path.unlink(missing_ok=True)
+                continue
+            try:
+                snapshots.append(msgpack.unpackb(path.read_bytes(), strict_map_key=False))
+            except Exception:
+                continue  # Partially written or foreign file
+        return snapshots
+
+    # --- Exposition ---
+
+    def render(self) -> str:
+        """All workers' metrics in Prometheus text format (version 0.0.4)."""
+        counters: Dict[Tuple[str, Labels], float] = {}
+        gauges: Dict[Tuple[str, Labels], float] = {}
+        histograms: Dict[Tuple[str, Labels], list] = {}
+
+        for snapshot in self._worker_snapshots():
+            pid = str(snapshot.get("pid"))
+            for name, labels, value in snapshot.get("counters", []):
+                key = (name, tuple(tuple(l) for l in labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, value in snapshot.get("gauges", []):
+                gauges[(name, tuple(tuple(l) for l in labels) + (("pid", pid),))] = value
+            for name, labels, bounds, counts, total in snapshot.get("histograms", []):
+                key = (name, tuple(tuple(l) for l in labels))
+                merged = histograms.get(key)
+                if merged is None or merged[0] != list(bounds):
+                    histograms[key] = [list(bounds), list(counts), total]
+                else:
+                    merged[1] = [a + b for a, b in zip(merged[1], counts)]
+                    merged[2] += total
+
+        # Derived: hit ratio per cache
+        for (name, labels), hits in list(counters.items()):
+            if name == "cache_hits_total":
+                lookups = hits + counters.get(("cache_misses_total", labels), 0)
+                gauges[("cache_hit_ratio", labels)] = hits / lookups if lookups else 0.0
+
+        by_name: Dict[str, List[str]] = {}
+        for (name, labels), value in counters.items():
+            by_name.setdefault(name, []).append(f"{PREFIX}{name}{_format_labels(labels)} {_format_value(value)}")
+        for (name, labels), value in gauges.items():
+            by_name.setdefault(name, []).append(f"{PREFIX}{name}{_format_labels(labels)} {_format_value(value)}")
+        for (name, labels), (bounds, counts, total) in histograms.items():
+            lines = by_name.setdefault(name, [])
+            cumulative = 0
+            for bound, count in zip(list(bounds) + ["+Inf"], counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else _format_value(bound)
+                lines.append(f"{PREFIX}{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{PREFIX}{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{PREFIX}{name}_count{_format_labels(labels)} {cumulative}")
+
+        output = []
+        for name in sorted(by_name):
+            metric_type, help_text = METRICS.get(name, ("untyped", name))
+            output.append(f"# HELP {PREFIX}{name} {help_text}")
+            output.append(f"# TYPE {PREFIX}{name} {metric_type}")
+            output.extend(sorted(by_name[name]))
+        return "\n".join(output) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except Exception:
+        return True  # Exists but not ours (EPERM)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class UpstreamMetricsTransport(httpx.AsyncBaseTransport):
+    """Wraps an httpx transport; labels calls by host (see UPSTREAM_HOSTS)."""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, upstream: Optional[str] = None):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self._upstream = upstream
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        name = self._upstream or UPSTREAM_HOSTS.get(request.url.host, request.url.host)
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            metrics_service.record_upstream(name, "error", time.perf_counter() - start)
+            raise
+        metrics_service.record_upstream(name, f"{response.status_code // 100}xx", time.perf_counter() - start)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class MetricsMiddleware:
+    """ASGI middleware: request latency per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics_service.observe_request(
+                _route_template(scope), scope.get("method", ""), status[0], time.perf_counter() - start
+            )
+
+
+def _route_template(scope) -> str:
+    """
+    Path template of the matched route, e.g. /api/luck/history/{uid}.
+    Unmatched paths share one label (bounded cardinality).
+    """
+    path = getattr(scope.get("route"), "path", None)
+    return path if path is not None else "unmatched"
+
+
+# Singleton instance
+metrics_service = MetricsService()
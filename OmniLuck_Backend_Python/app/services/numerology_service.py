@@ -1,10 +1,62 @@
 """
 Numerology Service for calculating Life Path, Destiny, and Daily Personal numbers.
 Uses standard Pythagorean system (1-9).
+
+Digit roots come from precomputed tables, and the per-user core numbers
+(life path, destiny, birth month/day) are memoized, so only the personal day
+is recomputed for each target date - with a few table lookups.
+calculate_daily_scores() does the same for whole arrays of users and dates
+with NumPy (one core computation per distinct DOB/name, one parse per date).
 """
 from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 import re
 
+import numpy as np
+
+from app.services.metrics_service import metrics_service
+from app.services.timing_service import timing_service
+
+MASTER_NUMBERS = (11, 22, 33)
+DIGIT_ROOT_TABLE_SIZE = 10000  # Covers every year and realistic name total
+CORE_CACHE_SIZE = 65536
+
+
+def _build_digit_roots(allow_master: bool) -> list:
+    """Digit root of every n < DIGIT_ROOT_TABLE_SIZE (digit sums shrink, so fill upward)."""
+    roots = list(range(10))
+    for n in range(10, DIGIT_ROOT_TABLE_SIZE):
+        if allow_master and n in MASTER_NUMBERS:
+            roots.append(n)
+        else:
+            roots.append(roots[sum(int(d) for d in str(n))])
+    return roots
+
+
+_DIGIT_ROOTS = _build_digit_roots(allow_master=True)
+_DIGIT_ROOTS_NO_MASTER = _build_digit_roots(allow_master=False)
+_DIGIT_ROOTS_ARRAY = np.array(_DIGIT_ROOTS, dtype=np.int16)
+_DIGIT_ROOTS_NO_MASTER_ARRAY = np.array(_DIGIT_ROOTS_NO_MASTER, dtype=np.int16)
+
+
+def _distinct(values) -> Tuple[list, np.ndarray]:
+    """Array-like of strings (None allowed) -> (distinct values, index array shaped like the input)."""
+    values = np.asarray(values, dtype=object)
+    flat = [v or "" for v in values.ravel().tolist()]
+    distinct, inverse = np.unique(np.array(flat, dtype=str), return_inverse=True)
+    return distinct.tolist(), inverse.reshape(values.shape)
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(date_str: str) -> Optional[date]:
+    """YYYY-MM-DD -> date (None if invalid). Memoized: few distinct dates are in play."""
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
 class NumerologyService:
     """Service for deterministic Numerology calculations"""
     
@@ -31,16 +83,54 @@ class NumerologyService:
             3: 3, 6: 3, 9: 3, 33: 3
         }
         
+        # Per-user core numbers, memoized across requests
+        self._dob_core = lru_cache(maxsize=CORE_CACHE_SIZE)(self._compute_dob_core)
+        self._destiny = lru_cache(maxsize=CORE_CACHE_SIZE)(self._compute_destiny)
+        metrics_service.register_lru_cache("numerology_dob", self._dob_core)
+        metrics_service.register_lru_cache("numerology_destiny", self._destiny)
+        metrics_service.register_lru_cache("numerology_dates", _parse_date)
+        
+        # Score for every (life path, destiny, personal day) - values are <= 33
+        self._score_table = [
+            [[self._synergy_score(lp, destiny, p_day) for p_day in range(10)] for destiny in range(34)]
+            for lp in range(34)
+        ]
+        self._score_array = np.array(self._score_table, dtype=np.int16)
+        
     def _reduce_sum(self, n: int, allow_master: bool = True) -> int:
         """
         Recursively sum digits until single digit or Master Number (11, 22, 33).
         Example: 1987 -> 25 -> 7
         """
-        while n > 9:
-            if allow_master and n in [11, 22, 33]:
-                return n
+        while n >= DIGIT_ROOT_TABLE_SIZE:
             n = sum(int(d) for d in str(n))
-        return n
+        return (_DIGIT_ROOTS if allow_master else _DIGIT_ROOTS_NO_MASTER)[n]
+    
+    def _compute_dob_core(self, dob_str: str) -> Tuple[int, Optional[int]]:
+        """
+        (life path, reduced birth month + reduced birth day) for a DOB.
+        Invalid DOBs give (0, None).
+        """
+        dt = _parse_date(dob_str)
+        if dt is None:
+            return 0, None
+        
+        # Reduce each part independently first (Standard Method)
+        m = _DIGIT_ROOTS[dt.month]
+        d = _DIGIT_ROOTS[dt.day]
+        y = _DIGIT_ROOTS[dt.year]
+        return self._reduce_sum(m + d + y), m + d
+    
+    def _compute_destiny(self, full_name: str) -> int:
+        if not full_name:
+            return 0
+            
+        clean_name = re.sub(r'[^a-zA-Z]', '', full_name.lower())
+        total = 0
+        for char in clean_name:
+            total += self.letter_map.get(char, 0)
+            
+        return self._reduce_sum(total, allow_master=True)
         
     def calculate_life_path(self, dob_str: str) -> int:
         """
@@ -48,16 +138,8 @@ class NumerologyService:
         Strategy: Reduce Month, Reduce Day, Reduce Year -> Sum them -> Reduce Total.
         """
         try:
-            dt = datetime.strptime(dob_str, "%Y-%m-%d")
-            
-            # Reduce each part independently first (Standard Method)
-            m = self._reduce_sum(dt.month, allow_master=True)
-            d = self._reduce_sum(dt.day, allow_master=True)
-            y = self._reduce_sum(dt.year, allow_master=True)
-            
-            total = m + d + y
-            return self._reduce_sum(total, allow_master=True)
-        except:
+            return self._dob_core(dob_str)[0]
+        except TypeError:  # Unhashable input
             return 0
 
     def calculate_destiny_number(self, full_name: str) -> int:
@@ -67,13 +149,7 @@ class NumerologyService:
         """
         if not full_name:
             return 0
-            
-        clean_name = re.sub(r'[^a-zA-Z]', '', full_name.lower())
-        total = 0
-        for char in clean_name:
-            total += self.letter_map.get(char, 0)
-            
-        return self._reduce_sum(total, allow_master=True)
+        return self._destiny(full_name)
         
     def calculate_personal_day(self, dob_str: str, target_date: date = None) -> int:
         """
@@ -86,51 +162,23 @@ class NumerologyService:
             target_date = date.today()
             
         try:
-            dt = datetime.strptime(dob_str, "%Y-%m-%d")
-            
-            # 1. Calculate Personal Year
-            # Sum of Birth Month + Birth Day + CURRENT YEAR
-            bm = self._reduce_sum(dt.month) # keep single digit for intermediate
-            bd = self._reduce_sum(dt.day)
-            cy = self._reduce_sum(target_date.year)
-            
-            personal_year = self._reduce_sum(bm + bd + cy)
-            
-            # 2. Calculate Personal Day
-            # Personal Year + Current Month + Current Day
-            cm = self._reduce_sum(target_date.month)
-            cd = self._reduce_sum(target_date.day)
-            
-            total = personal_year + cm + cd
-            return self._reduce_sum(total, allow_master=False) # Daily numbers usually 1-9
-            
-        except:
+            birth_sum = self._dob_core(dob_str)[1]
+        except TypeError:  # Unhashable input
+            birth_sum = None
+        if birth_sum is None:
             return 1
-            
-    def calculate_daily_score(self, dob_str: str, full_name: str, target_date_str: str = None) -> dict:
-        """
-        Calculate the Daily Numerology Score (0-100).
-        Logic: Synergy between Core Numbers and Today's Personal Day.
-        
-        Args:
-            dob_str: Date of birth (YYYY-MM-DD)
-            full_name: User's full name
-            target_date_str: Optional target date for calculation (YYYY-MM-DD). Defaults to today.
-        """
-        from datetime import date
         
-        # Parse target date if provided
-        target_date = None
-        if target_date_str:
-            try:
-                target_date = datetime.strptime(target_date_str, "%Y-%m-%d").date()
-            except:
-                target_date = None
-        
-        lp = self.calculate_life_path(dob_str)
-        destiny = self.calculate_destiny_number(full_name)
-        p_day = self.calculate_personal_day(dob_str, target_date)
+        # 1. Calculate Personal Year
+        # Sum of Birth Month + Birth Day (reduced, memoized) + CURRENT YEAR
+        personal_year = _DIGIT_ROOTS[birth_sum + _DIGIT_ROOTS[target_date.year]]
         
+        # 2. Calculate Personal Day
+        # Personal Year + Current Month + Current Day
+        total = personal_year + _DIGIT_ROOTS[target_date.month] + _DIGIT_ROOTS[target_date.day]
+        return _DIGIT_ROOTS_NO_MASTER[total] # Daily numbers usually 1-9
+            
+    def _synergy_score(self, lp: int, destiny: int, p_day: int) -> int:
+        """Daily score for core numbers vs. a Personal Day (tabulated in __init__)."""
         score = 50.0 # Base Neutral
         
         # 1. Personal Day vs Life Path Synergy (40 pts)
@@ -157,14 +205,32 @@ class NumerologyService:
             score += 5
             
         # 3. Master Number Bonus (Potential Energy)
-        if lp in [11, 22, 33] or destiny in [11, 22, 33]:
+        if lp in MASTER_NUMBERS or destiny in MASTER_NUMBERS:
             score += 10 # High potential user
             
         # 4. Personal Day 8 or 9 (Harvest/Completion) generally feels potent
         if p_day in [8, 9]:
             score += 5
             
-        final_score = int(max(10, min(100, score)))
+        return int(max(10, min(100, score)))
+        
+    def calculate_daily_score(self, dob_str: str, full_name: str, target_date_str: str = None) -> dict:
+        """
+        Calculate the Daily Numerology Score (0-100).
+        Logic: Synergy between Core Numbers and Today's Personal Day.
+        
+        Args:
+            dob_str: Date of birth (YYYY-MM-DD)
+            full_name: User's full name
+            target_date_str: Optional target date for calculation (YYYY-MM-DD). Defaults to today.
+        """
+        # Parse target date if provided
+        target_date = _parse_date(target_date_str) if target_date_str else None
+        
+        lp = self.calculate_life_path(dob_str)
+        destiny = self.calculate_destiny_number(full_name)
+        p_day = self.calculate_personal_day(dob_str, target_date)
+        final_score = self._score_table[lp][destiny][p_day]
         
         return {
             "numerology_score": final_score,
@@ -173,5 +239,49 @@ class NumerologyService:
             "personal_day_number": p_day
         }
 
+    @timing_service.timed("numerology_batch")
+    def calculate_daily_scores(self, dobs, names, target_dates=None) -> Dict[str, np.ndarray]:
+        """
+        Vectorized calculate_daily_score.
+        
+        dobs, names and target_dates (YYYY-MM-DD strings; None/invalid = today)
+        are broadcast against each other NumPy-style, e.g. a cohort across a
+        date range: calculate_daily_scores(dobs[:, None], names[:, None], dates[None, :]).
+        Returns the same fields as calculate_daily_score, as int arrays of the
+        broadcast shape; every element equals the scalar result.
+        """
+        distinct_dobs, dob_idx = _distinct(dobs)
+        distinct_names, name_idx = _distinct(names)
+        distinct_dates, date_idx = _distinct(target_dates)
+        
+        # Per-user core numbers (memoized scalar path, once per distinct value)
+        cores = [self._dob_core(dob) for dob in distinct_dobs]
+        life_paths = np.array([lp for lp, _ in cores], dtype=np.int16)
+        birth_sums = np.array([-1 if bs is None else bs for _, bs in cores], dtype=np.int16)
+        destinies = np.array([self.calculate_destiny_number(name) for name in distinct_names], dtype=np.int16)
+        
+        # Per-date parts: reduced year, reduced month + reduced day
+        today = date.today()
+        parsed = [(_parse_date(d) if d else None) or today for d in distinct_dates]
+        year_roots = np.array([_DIGIT_ROOTS[d.year] for d in parsed], dtype=np.int16)
+        month_day_roots = np.array([_DIGIT_ROOTS[d.month] + _DIGIT_ROOTS[d.day] for d in parsed], dtype=np.int16)
+        
+        dob_idx, name_idx, date_idx = np.broadcast_arrays(dob_idx, name_idx, date_idx)
+        lp = life_paths[dob_idx]
+        destiny = destinies[name_idx]
+        birth_sum = birth_sums[dob_idx]
+        
+        # Personal Year + Current Month + Current Day (invalid DOB -> 1)
+        personal_year = _DIGIT_ROOTS_ARRAY[np.maximum(birth_sum, 0) + year_roots[date_idx]]
+        p_day = _DIGIT_ROOTS_NO_MASTER_ARRAY[personal_year + month_day_roots[date_idx]]
+        p_day = np.where(birth_sum < 0, 1, p_day).astype(np.int16)
+        
+        return {
+            "numerology_score": self._score_array[lp, destiny, p_day],
+            "life_path_number": lp,
+            "destiny_number": destiny,
+            "personal_day_number": p_day
+        }
+
 # Singleton
 numerology_service = NumerologyService()
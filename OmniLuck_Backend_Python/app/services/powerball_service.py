@@ -4,8 +4,17 @@ Generates personalized powerball numbers based on astrology, numerology, and dai
 Now uses LIVE hot/cold numbers from lottery_stats_service!
 """
 from datetime import datetime, date
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional, Tuple
 import hashlib
+import numpy as np
+
+from app.services.balanced_table import BalancedCombinationTable
+from app.services.timing_service import timing_service
+
+# Bulk generation: candidates per batch, and the most batches before giving up
+# (about a third of the candidates survive, so 100k lines take ~32 batches)
+BULK_BATCH = 8192
+MAX_BULK_BATCHES = 1000
 
 
 class PowerballService:
@@ -23,26 +32,28 @@ class PowerballService:
         # Statistical Harmonic Sum Range (Most common sums for winning 5-ball sets)
         self.min_harmonic_sum = 130
         self.max_harmonic_sum = 220
+        
+        # Every balanced 5-ball combination (built once, memory-mapped)
+        self.balanced_table = BalancedCombinationTable(self._balanced_mask)
     
+    def stats_snapshot(self):
+        """Immutable hot/cold snapshot - uses live data if available, else fallback."""
+        try:
+            from app.services.lottery_stats_service import get_stats_snapshot
+            return get_stats_snapshot()
+        except Exception:
+            from app.services.lottery_stats_service import StatsSnapshot
+            return StatsSnapshot.build(self._default_hot, self._default_cold)
+
     @property
     def hot_numbers(self) -> List[int]:
         """Get hot numbers - uses live data if available, else fallback."""
-        try:
-            from app.services.lottery_stats_service import get_hot_cold_numbers
-            hot, cold = get_hot_cold_numbers()
-            return hot
-        except Exception:
-            return self._default_hot
+        return list(self.stats_snapshot().hot_numbers)
     
     @property
     def cold_numbers(self) -> List[int]:
         """Get cold numbers - uses live data if available, else fallback."""
-        try:
-            from app.services.lottery_stats_service import get_hot_cold_numbers
-            hot, cold = get_hot_cold_numbers()
-            return cold
-        except Exception:
-            return self._default_cold
+        return list(self.stats_snapshot().cold_numbers)
 
     def _get_seed_from_data(self, *args) -> int:
         """Create a deterministic seed from input data."""
@@ -67,6 +78,17 @@ class PowerballService:
         
         return True
 
+    def _balanced_mask(self, white_balls: np.ndarray) -> np.ndarray:
+        """Vectorized _is_statistically_balanced over an (N x 5) array of lines."""
+        sums = white_balls.sum(axis=1)
+        odds = (white_balls % 2).sum(axis=1)
+        lows = (white_balls <= 34).sum(axis=1)
+        return (
+            (sums >= self.min_harmonic_sum) & (sums <= self.max_harmonic_sum)
+            & (odds >= 2) & (odds <= 3)
+            & (lows >= 2) & (lows <= 3)
+        )
+
     def _planetary_territory_map(self, degree: float) -> int:
         """
         Maps a Zodiac degree (0-360) to a Powerball white ball (1-69).
@@ -74,13 +96,15 @@ class PowerballService:
         """
         return int((degree % 360) / (360 / self.white_ball_max)) + 1
 
-    def _apply_statistical_weight(self, ball: int, seed: int) -> int:
-        """Nudges cosmic balls towards 'hot' numbers or away from 'cold' ones."""
-        if ball in self.cold_numbers and (seed % 10) > 3:
+    def _apply_statistical_weight(self, ball: int, seed: int, snapshot=None) -> int:
+        """
+        Nudges cosmic balls towards 'hot' numbers or away from 'cold' ones.
+        Pass the caller's stats snapshot to avoid a lookup per ball.
+        """
+        snapshot = snapshot or self.stats_snapshot()
+        if ball in snapshot.cold_set and (seed % 10) > 3:
             return (ball + seed) % self.white_ball_max + 1
-        for hot in self.hot_numbers:
-            if abs(ball - hot) <= 1: return hot
-        return ball
+        return snapshot.nearest_hot[ball]
 
     def _numerology_number(self, name: str) -> int:
         name = name.upper().replace(" ", "")
@@ -92,37 +116,39 @@ class PowerballService:
         parts = date_str.split('-')
         return [int(p) for p in parts]
 
+    @timing_service.timed("powerball_personal")
     def generate_personal_powerball(self, name: str, dob: str) -> Dict:
         """Enhanced Personal Powerball with Parity, Range, and Harmonic Balancing."""
         name_num = self._numerology_number(name)
         date_nums = self._date_to_numbers(dob)
         base_seed = self._get_seed_from_data(name, dob)
+        snapshot = self.stats_snapshot()  # Same hot/cold view for every ball
         
-        for attempt in range(50): # More attempts for tighter balancing
-            white_balls = []
-            temp_seed = base_seed + attempt * 17
-            
-            # Ball 1: Name Numerology
-            ball1 = (name_num * 7 + attempt) % self.white_ball_max + 1
-            white_balls.append(self._apply_statistical_weight(ball1, temp_seed))
-            
-            # Life Path
-            lp = sum(date_nums)
-            while lp > 9: lp = sum(int(d) for d in str(lp))
-            
-            # Generate remaining via tempered birth seeds
-            for i, num in enumerate(date_nums + [lp]):
-                temp_seed = (temp_seed * 1103515245 + 12345 + num + i) & 0x7fffffff
+        white_balls = []
+        temp_seed = base_seed
+        
+        # Ball 1: Name Numerology
+        ball1 = (name_num * 7) % self.white_ball_max + 1
+        white_balls.append(self._apply_statistical_weight(ball1, temp_seed, snapshot))
+        
+        # Life Path
+        lp = sum(date_nums)
+        while lp > 9: lp = sum(int(d) for d in str(lp))
+        
+        # Generate remaining via tempered birth seeds
+        for i, num in enumerate(date_nums + [lp]):
+            temp_seed = (temp_seed * 1103515245 + 12345 + num + i) & 0x7fffffff
+            ball = (temp_seed % self.white_ball_max) + 1
+            ball = self._apply_statistical_weight(ball, temp_seed, snapshot)
+            while ball in white_balls:
+                temp_seed = (temp_seed * 1103515245 + 12345) & 0x7fffffff
                 ball = (temp_seed % self.white_ball_max) + 1
-                ball = self._apply_statistical_weight(ball, temp_seed)
-                while ball in white_balls:
-                    temp_seed = (temp_seed * 1103515245 + 12345) & 0x7fffffff
-                    ball = (temp_seed % self.white_ball_max) + 1
-                white_balls.append(ball)
-            
-            white_balls.sort()
-            if self._is_statistically_balanced(white_balls) or attempt == 49:
-                break
+            white_balls.append(ball)
+        
+        white_balls.sort()
+        if not self._is_statistically_balanced(white_balls):
+            # Seeded pick from the balanced table instead of retrying
+            white_balls = self.balanced_table.pick(base_seed)
         
         powerball = ((lp + name_num) % self.powerball_max) + 1
         return {
@@ -131,6 +157,7 @@ class PowerballService:
             "type": "personal"
         }
 
+    @timing_service.timed("powerball_daily")
     def generate_daily_powerballs(
         self, name: str, dob: str, current_date: str,
         luck_score: int, astro_score: int = 50, natal_score: int = 50,
@@ -144,49 +171,48 @@ class PowerballService:
         base_seed = self._get_seed_from_data(name, dob, current_date, luck_score)
         
         for i in range(num_lines):
-            for attempt in range(20):
-                combo_seed = base_seed + i * 1009 + attempt * 71
-                
-                # Use Delta Strategy: Generate gaps between numbers
-                # Standard Delta: [low, low-mid, low-mid, mid, mid-high, high]
-                # We'll use cosmic data to influence the gaps
-                deltas = []
-                temp_seed = combo_seed
-                
-                # 1. Map planetary territory (Simulated based on astro_score)
-                # In real use, we'd pass actual planet degrees here
-                planet_ball = self._planetary_territory_map(astro_score * 3.6 + i * 5)
-                
-                # 2. Build the set using the Delta spacing logic
-                # Delta 1: Tiny (1-5)
-                deltas.append((temp_seed % 5) + 1)
-                # Delta 2-4: Mid (3-12)
-                for _ in range(3):
-                    temp_seed = (temp_seed * 742938285 + 1) % 2147483647
-                    deltas.append((temp_seed % 10) + 3)
-                # Delta 5: Larger (8-15)
+            combo_seed = base_seed + i * 1009
+            
+            # Use Delta Strategy: Generate gaps between numbers
+            # Standard Delta: [low, low-mid, low-mid, mid, mid-high, high]
+            # We'll use cosmic data to influence the gaps
+            deltas = []
+            temp_seed = combo_seed
+            
+            # 1. Map planetary territory (Simulated based on astro_score)
+            # In real use, we'd pass actual planet degrees here
+            planet_ball = self._planetary_territory_map(astro_score * 3.6 + i * 5)
+            
+            # 2. Build the set using the Delta spacing logic
+            # Delta 1: Tiny (1-5)
+            deltas.append((temp_seed % 5) + 1)
+            # Delta 2-4: Mid (3-12)
+            for _ in range(3):
                 temp_seed = (temp_seed * 742938285 + 1) % 2147483647
-                deltas.append((temp_seed % 8) + 8)
-                
-                # Convert Deltas to Balls
-                white_balls = []
-                current_sum = planet_ball % 15 + 1 # Start with a small cosmic base
-                for d in deltas:
-                    current_sum += d
-                    if current_sum > self.white_ball_max:
-                        current_sum = (current_sum % self.white_ball_max) + 1
-                    white_balls.append(current_sum)
-                
-                white_balls = list(set(white_balls))
-                while len(white_balls) < 5:
-                    temp_seed = (temp_seed * 742938285 + 1) % 2147483647
-                    new_ball = (temp_seed % self.white_ball_max) + 1
-                    if new_ball not in white_balls: white_balls.append(new_ball)
-                
-                white_balls.sort()
-                
-                if self._is_statistically_balanced(white_balls) or attempt == 19:
-                    break
+                deltas.append((temp_seed % 10) + 3)
+            # Delta 5: Larger (8-15)
+            temp_seed = (temp_seed * 742938285 + 1) % 2147483647
+            deltas.append((temp_seed % 8) + 8)
+            
+            # Convert Deltas to Balls
+            white_balls = []
+            current_sum = planet_ball % 15 + 1 # Start with a small cosmic base
+            for d in deltas:
+                current_sum += d
+                if current_sum > self.white_ball_max:
+                    current_sum = (current_sum % self.white_ball_max) + 1
+                white_balls.append(current_sum)
+            
+            white_balls = list(set(white_balls))
+            while len(white_balls) < 5:
+                temp_seed = (temp_seed * 742938285 + 1) % 2147483647
+                new_ball = (temp_seed % self.white_ball_max) + 1
+                if new_ball not in white_balls: white_balls.append(new_ball)
+            
+            white_balls.sort()
+            if not self._is_statistically_balanced(white_balls):
+                # Seeded pick from the balanced table instead of retrying
+                white_balls = self.balanced_table.pick(combo_seed)
             
             # Powerball
             temp_seed = (temp_seed * 742938285 + 1 + i) % 2147483647
@@ -201,6 +227,126 @@ class PowerballService:
             
         return combinations
 
+    @timing_service.timed("powerball_wheel")
+    def generate_wheel_powerballs(
+        self, name: str, dob: str, current_date: str,
+        luck_score: int, astro_score: int = 50, natal_score: int = 50,
+        num_lines: int = 10, pool: Optional[List[int]] = None,
+        pool_size: int = 15, cover: str = "pair"
+    ) -> Dict:
+        """
+        Wheel mode: pick lines from the user's lucky pool that together cover
+        the most distinct pairs (or triples) of pool balls.
+        The pool defaults to the first `pool_size` balls of today's daily lines.
+        """
+        from app.services.wheel_service import wheel_service
+        
+        daily = self.generate_daily_powerballs(
+            name, dob, current_date, luck_score, astro_score, natal_score,
+            num_lines=max(num_lines, pool_size)
+        )
+        if not pool:
+            pool = []
+            for combo in daily:
+                pool.extend(b for b in combo["white_balls"] if b not in pool)
+            pool = pool[:pool_size]
+        
+        seed = self._get_seed_from_data(name, dob, current_date, luck_score)
+        wheel = wheel_service.build_wheel(pool, num_lines, self._balanced_mask, cover=cover, seed=seed)
+        
+        lines = [
+            {
+                "white_balls": white_balls,
+                "powerball": daily[i % len(daily)]["powerball"],
+                "type": "wheel",
+                "index": i + 1
+            }
+            for i, white_balls in enumerate(wheel["white_balls"])
+        ]
+        return {"lines": lines, "coverage": wheel["coverage"]}
+
+    def iter_bulk_powerballs(
+        self, name: str, dob: str, current_date: str,
+        luck_score: int, astro_score: int = 50,
+        num_lines: int = 1000, seed: Optional[int] = None
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Generate many distinct, balanced lines with the Delta Strategy, one
+        chunk per batch of BULK_BATCH candidates. Candidate delta vectors are
+        drawn for whole batches, unbalanced lines are snapped to the balanced
+        table and lines already generated are masked out; batches continue
+        until exactly `num_lines` lines have been yielded. Same inputs (and
+        seed) -> same lines, in order.
+        
+        Yields (white_balls (n x 5), powerballs (n,)) chunks. Raises
+        RuntimeError if MAX_BULK_BATCHES batches don't produce enough lines.
+        """
+        if seed is None:
+            seed = self._get_seed_from_data(name, dob, current_date, luck_score)
+        rng = np.random.default_rng(seed)
+        
+        batch = BULK_BATCH  # Fixed, so a smaller request is a prefix of a larger one
+        seen = np.empty(0, dtype=np.int64)  # Sorted keys of the lines yielded so far
+        remaining = num_lines
+        for batch_index in range(MAX_BULK_BATCHES):
+            if remaining <= 0:
+                return
+            index = np.arange(batch_index * batch, (batch_index + 1) * batch)
+            
+            # Planetary base per line (as in generate_daily_powerballs)
+            planet_ball = ((astro_score * 3.6 + index * 5) % 360 / (360 / self.white_ball_max)).astype(np.int64) + 1
+            deltas = np.column_stack([
+                rng.integers(1, 6, batch),         # Delta 1: Tiny (1-5)
+                rng.integers(3, 13, (batch, 3)),   # Delta 2-4: Mid (3-12)
+                rng.integers(8, 16, batch),        # Delta 5: Larger (8-15)
+            ])
+            
+            # Convert Deltas to Balls (wrapping past 69 like the scalar version)
+            white = np.empty((batch, 5), dtype=np.int64)
+            current = planet_ball % 15 + 1
+            for col in range(5):
+                current = current + deltas[:, col]
+                current = np.where(current > self.white_ball_max, current % self.white_ball_max + 1, current)
+                white[:, col] = current
+            white.sort(axis=1)
+            powerball = rng.integers(1, self.powerball_max + 1, batch)
+            
+            # Distinct balls within a line; unbalanced lines snap to the table
+            mask = (np.diff(white, axis=1) > 0).all(axis=1)
+            white, powerball = white[mask], powerball[mask]
+            unbalanced = ~self._balanced_mask(white)
+            white[unbalanced] = self.balanced_table.nearest(white[unbalanced])
+            keys = ((((white[:, 0] * 70 + white[:, 1]) * 70 + white[:, 2]) * 70 + white[:, 3]) * 70 + white[:, 4]) * 32 + powerball
+            
+            # Distinct lines: first occurrence in this batch, not yielded before
+            _, first = np.unique(keys, return_index=True)
+            first = np.sort(first)
+            first = first[~np.isin(keys[first], seen, assume_unique=True)][:remaining]
+            if not len(first):
+                continue
+            seen = np.union1d(seen, keys[first])
+            remaining -= len(first)
+            yield white[first], powerball[first]
+        
+        if remaining > 0:
+            raise RuntimeError(f"Generated only {num_lines - remaining} of {num_lines} distinct lines")
+
+    @timing_service.timed("powerball_bulk")
+    def generate_bulk_powerballs(
+        self, name: str, dob: str, current_date: str,
+        luck_score: int, astro_score: int = 50,
+        num_lines: int = 1000, seed: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        All of iter_bulk_powerballs() at once.
+        
+        Returns (white_balls (num_lines x 5), powerballs (num_lines,)).
+        """
+        chunks = list(self.iter_bulk_powerballs(name, dob, current_date, luck_score, astro_score, num_lines, seed))
+        if not chunks:
+            return np.empty((0, 5), dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate([c[0] for c in chunks]), np.concatenate([c[1] for c in chunks])
+
 
 # Singleton instance
 powerball_service = PowerballService()
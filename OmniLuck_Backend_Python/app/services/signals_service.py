@@ -5,16 +5,25 @@ Integrates external APIs to provide environmental context for luck predictions.
 import httpx
 import asyncio
 from datetime import datetime, date, timedelta
-from typing import Optional
+from typing import List, Optional, Tuple
 import math
 import swisseph as swe
 from app.config import settings
+from app.services.timing_service import timing_service
+from app.services.metrics_service import metrics_service
 from app.models.schemas import (
     LunarPhaseResponse,
     WeatherResponse,
     GeomagneticResponse,
     CosmicSignalsResponse
 )
+from app.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+# Batch requests share one weather lookup per tile of this size (degrees)
+WEATHER_TILE_DEGREES = 0.1
+WEATHER_CONCURRENCY = 8
 
 
 class SignalsService:
@@ -23,7 +32,7 @@ class SignalsService:
     def __init__(self):
         self.openweather_key = settings.OPENWEATHER_API_KEY
         self.openweather_key = settings.OPENWEATHER_API_KEY
-        self.client = httpx.AsyncClient(timeout=10.0)
+        self._client: Optional[httpx.AsyncClient] = None
         
         # Initialize Swiss Ephemeris
         try:
@@ -31,6 +40,14 @@ class SignalsService:
         except:
             swe.set_ephe_path(".")
     
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client, created on first request (building its SSL context is slow)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10.0, transport=metrics_service.transport())
+        return self._client
+    
+    @timing_service.timed("lunar")
     async def get_lunar_phase(self, target_date: Optional[date] = None) -> LunarPhaseResponse:
         """
         Get lunar phase information using FarmSense Moon Phases API.
@@ -96,7 +113,7 @@ class SignalsService:
             )
             
         except Exception as e:
-            print(f"❌ Lunar calculation error: {e}")
+            logger.error("Lunar calculation error", extra={"error": str(e)})
             return self._calculate_lunar_phase_fallback(target_date)
     
     def _get_moon_phase_name(self, phase: float) -> str:
@@ -151,6 +168,7 @@ class SignalsService:
             influence_score=self._calculate_lunar_influence(phase)
         )
     
+    @timing_service.timed("weather")
     async def get_weather(self, lat: float, lon: float) -> WeatherResponse:
         """
         Get current weather from OpenWeatherMap.
@@ -163,7 +181,7 @@ class SignalsService:
             WeatherResponse with weather data and influence score
         """
         if not self.openweather_key:
-            print("⚠️  OpenWeatherMap API key not set, using dummy data")
+            logger.warning("OpenWeatherMap API key not set, using dummy data")
             return self._get_dummy_weather()
         
         url = "https://api.openweathermap.org/data/2.5/weather"
@@ -203,7 +221,7 @@ class SignalsService:
             )
             
         except Exception as e:
-            print(f"❌ Weather API error: {e}")
+            logger.error("Weather API error", extra={"error": str(e)})
             return self._get_dummy_weather()
     
     def _calculate_weather_influence(self, condition: str, temp: float, humidity: int) -> int:
@@ -248,6 +266,7 @@ class SignalsService:
             influence_score=75
         )
     
+    @timing_service.timed("kp")
     async def get_geomagnetic_activity(self) -> GeomagneticResponse:
         """
         Get geomagnetic activity from NOAA SWPC.
@@ -284,7 +303,7 @@ class SignalsService:
             )
             
         except Exception as e:
-            print(f"❌ Geomagnetic API error: {e}")
+            logger.error("Geomagnetic API error", extra={"error": str(e)})
             # Fallback: assume quiet conditions
             return GeomagneticResponse(
                 kp_index=2.0,
@@ -339,7 +358,44 @@ class SignalsService:
             self.get_weather(lat, lon),
             self.get_geomagnetic_activity()
         )
+        return self._combine_signals(lunar, weather, geomagnetic)
+    
+    async def get_signals_for_locations(self, locations: List[Tuple[float, float]],
+                                        target_date: Optional[date] = None) -> List[CosmicSignalsResponse]:
+        """
+        Get all cosmic signals for many locations at once.
+        Lunar phase and Kp are fetched once; weather once per
+        WEATHER_TILE_DEGREES tile (at the tile center).
+        
+        Returns:
+            One CosmicSignalsResponse per location, in order
+        """
+        def tile(lat: float, lon: float) -> Tuple[float, float]:
+            return (round(round(lat / WEATHER_TILE_DEGREES) * WEATHER_TILE_DEGREES, 4),
+                    round(round(lon / WEATHER_TILE_DEGREES) * WEATHER_TILE_DEGREES, 4))
+        
+        tiles = list(dict.fromkeys(tile(lat, lon) for lat, lon in locations))
+        semaphore = asyncio.Semaphore(WEATHER_CONCURRENCY)
+        
+        async def tile_weather(lat: float, lon: float) -> WeatherResponse:
+            async with semaphore:
+                return await self.get_weather(lat, lon)
+        
+        lunar, geomagnetic, *weathers = await asyncio.gather(
+            self.get_lunar_phase(target_date),
+            self.get_geomagnetic_activity(),
+            *(tile_weather(lat, lon) for lat, lon in tiles)
+        )
+        weather_by_tile = dict(zip(tiles, weathers))
         
+        return [
+            self._combine_signals(lunar, weather_by_tile[tile(lat, lon)], geomagnetic)
+            for lat, lon in locations
+        ]
+    
+    def _combine_signals(self, lunar: LunarPhaseResponse, weather: WeatherResponse,
+                         geomagnetic: GeomagneticResponse) -> CosmicSignalsResponse:
+        """Weighted total of the individual signals"""
         # Calculate total influence
         total_influence = (
             lunar.influence_score * 0.3 +      # 30% weight
@@ -356,7 +412,9 @@ class SignalsService:
     
     async def close(self):
         """Close HTTP client"""
-        await self.client.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
 
 # Singleton instance
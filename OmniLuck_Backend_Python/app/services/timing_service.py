@@ -0,0 +1,202 @@
+"""
+Per-Stage Timing.
+Lightweight spans around the expensive stages of a request (signals fetches,
+natal chart, transits, numerology, LLM, powerball, ...).
+
+Each finished span is:
+- added to the current request's span list, which ServerTimingMiddleware
+  turns into a `Server-Timing` response header (visible in browser devtools;
+  streaming responses send headers first, so theirs only cover setup). The
+  header names internal stages, so the middleware is only installed when
+  SERVER_TIMING_ENABLED is set
+- counted in an in-memory per-stage histogram (log2 microsecond buckets)
+
+A span costs about a microsecond (budget: OVERHEAD_BUDGET_NS, checked by
+scripts/bench_timing.py) against stages that take milliseconds, so they stay
+on in production. Work handed to a thread pool keeps its request's spans
+when submitted through copy_context().run (see routes/luck.py).
+"""
+import inspect
+import threading
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Bucket b counts durations up to and including 2**b microseconds, like a
+# Prometheus `le` bucket (last bucket: everything longer)
+NUM_BUCKETS = 26  # 2**25 us ~ 33 s
+DRAIN_THRESHOLD = 4096  # Pending spans folded into the histograms at a time
+OVERHEAD_BUDGET_NS = 2000  # Per span; checked by scripts/bench_timing.py
+
+_request_spans: ContextVar[Optional[List[Tuple[str, int]]]] = ContextVar("request_spans", default=None)
+
+
+class Span:
+    """Context manager timing one stage"""
+    __slots__ = ("service", "name", "start")
+
+    def __init__(self, service: "TimingService", name: str):
+        self.service = service
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.service.record(self.name, perf_counter_ns() - self.start)
+        return False
+
+
+class TimingService:
+    """Span recording and per-stage histograms"""
+
+    def __init__(self):
+        # Finished spans are appended to a deque (atomic, no lock on the hot
+        # path) and folded into the histograms in batches
+        self._pending: deque = deque()
+        # name -> [bucket counts..., total count, total ns]
+        self._histograms: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str) -> Span:
+        """`with timing_service.span("natal_chart"): ...`"""
+        return Span(self, name)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator form of span() for sync and async functions."""
+        def decorator(func):
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with Span(self, name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with Span(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name: str, duration_ns: int):
+        """Add a finished span to the histograms and the current request."""
+        item = (name, duration_ns)
+        pending = self._pending
+        pending.append(item)
+        if len(pending) >= DRAIN_THRESHOLD:
+            self._drain()
+
+        spans = _request_spans.get()
+        if spans is not None:
+            spans.append(item)
+
+    def _drain(self):
+        """Fold pending spans into the histograms."""
+        pending = self._pending
+        with self._lock:
+            while pending:
+                try:
+                    name, duration_ns = pending.popleft()
+                except IndexError:  # Drained concurrently
+                    break
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    histogram = self._histograms[name] = [0] * (NUM_BUCKETS + 2)
+                # Smallest b with duration <= 2**b us
+                duration_us = -(-duration_ns // 1000)  # Rounded up
+                histogram[min(max(duration_us - 1, 0).bit_length(), NUM_BUCKETS - 1)] += 1
+                histogram[NUM_BUCKETS] += 1
+                histogram[NUM_BUCKETS + 1] += duration_ns
+
+    def start_request(self) -> List[Tuple[str, int]]:
+        """Begin collecting spans for the current request context."""
+        spans: List[Tuple[str, int]] = []
+        _request_spans.set(spans)
+        return spans
+
+    def server_timing(self, spans: List[Tuple[str, int]], total_ns: Optional[int] = None) -> str:
+        """Spans -> Server-Timing header value (repeated stages are summed)."""
+        totals: Dict[str, List[int]] = {}
+        for name, duration_ns in spans:
+            entry = totals.setdefault(name, [0, 0])
+            entry[0] += duration_ns
+            entry[1] += 1
+
+        parts = [
+            f'{name};dur={duration_ns / 1e6:.2f}' + (f';desc="x{count}"' if count > 1 else "")
+            for name, (duration_ns, count) in totals.items()
+        ]
+        if total_ns is not None:
+            parts.append(f"total;dur={total_ns / 1e6:.2f}")
+        return ", ".join(parts)
+
+    def histograms(self) -> Dict[str, Dict]:
+        """Per-stage raw histograms: bucket upper bounds (us), counts, count, sum."""
+        self._drain()
+        with self._lock:
+            snapshot = {name: list(histogram) for name, histogram in self._histograms.items()}
+        return {
+            name: {
+                "buckets_us": [2 ** b for b in range(NUM_BUCKETS)],
+                "counts": histogram[:NUM_BUCKETS],
+                "count": histogram[NUM_BUCKETS],
+                "sum_ms": histogram[NUM_BUCKETS + 1] / 1e6,
+            }
+            for name, histogram in snapshot.items()
+        }
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per-stage count, mean and approximate p50/p95/p99 (bucket upper bounds, ms)."""
+        result = {}
+        for name, histogram in self.histograms().items():
+            count = histogram["count"]
+            if not count:
+                continue
+            stats = {"count": count, "mean_ms": round(histogram["sum_ms"] / count, 3)}
+            for label, quantile in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+                seen = 0
+                for upper_us, bucket_count in zip(histogram["buckets_us"], histogram["counts"]):
+                    seen += bucket_count
+                    if seen >= quantile * count:
+                        stats[label] = upper_us / 1000
+                        break
+            result[name] = stats
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+            self._histograms.clear()
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware: collect spans per request, emit a Server-Timing header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans = timing_service.start_request()
+        start = perf_counter_ns()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                header = timing_service.server_timing(spans, perf_counter_ns() - start)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", header.encode("latin-1"))
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+# Singleton instance
+timing_service = TimingService()
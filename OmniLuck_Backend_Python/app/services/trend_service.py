@@ -0,0 +1,203 @@
+"""
+Personal Trend Aggregates.
+Running per-user mood statistics behind /api/ml/personal-trend, updated on
+every check-in instead of recomputed from history, so a trend read is O(1):
+
+- avg_mood_7d / avg_mood_30d: a ring buffer of WINDOW_DAYS daily slots
+  (day, mood sum, check-in count), indexed by day % WINDOW_DAYS. Windows end
+  at the user's latest check-in day; a slot is reused once its day falls out.
+- best_days: per-weekday mood sum and count; the BEST_DAYS weekdays with the
+  highest mean mood.
+- trend_direction: slope of mood over time by online weighted least squares.
+  Five running sums (w, wx, wy, wxx, wxy), with x in days relative to the
+  latest check-in, decayed by half every TREND_HALF_LIFE_DAYS so recent weeks
+  dominate. Beyond +/-SLOPE_THRESHOLD mood points per day the user is
+  improving / declining, else stable.
+
+Memory is bounded per user whatever the history length: three 30-slot and
+two 7-slot int64 arrays, five floats and three ints - about 1.7 KB per user
+(measured by scripts/bench_checkins.py).
+
+Check-ins older than the 30-day window still count towards total_logs,
+best_days and the (decayed) trend. run_sync() (started in main.py's
+lifespan) rebuilds the aggregates from the check-in log at startup - the
+"trends" warm-up step holds /ready until that is done - and then, every
+SYNC_INTERVAL seconds, picks up the check-ins other workers logged.
+"""
+import asyncio
+import threading
+from array import array
+from datetime import date
+from typing import Dict, Optional
+
+from app.services.checkin_service import checkin_service
+from app.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+WINDOW_DAYS = 30
+SHORT_WINDOW_DAYS = 7
+BEST_DAYS = 2
+TREND_HALF_LIFE_DAYS = 14.0
+SLOPE_THRESHOLD = 0.05  # Mood points per day
+SYNC_INTERVAL = 5.0  # Seconds between reads of other workers' check-in logs
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def day_number(day: str) -> int:
+    """YYYY-MM-DD -> proleptic Gregorian ordinal (raises ValueError)."""
+    return date.fromisoformat(day).toordinal()
+
+
+class UserTrend:
+    """Fixed-size running aggregates of one user's check-ins."""
+
+    __slots__ = ("total", "latest", "slot_day", "slot_sum", "slot_count", "weekday_sum", "weekday_count",
+                 "sw", "swx", "swy", "swxx", "swxy")
+
+    def __init__(self):
+        self.total = 0
+        self.latest = 0  # Newest check-in day (ordinal); x = 0 for the regression
+        self.slot_day = array("q", bytes(8 * WINDOW_DAYS))
+        self.slot_sum = array("q", bytes(8 * WINDOW_DAYS))
+        self.slot_count = array("q", bytes(8 * WINDOW_DAYS))
+        self.weekday_sum = array("q", bytes(8 * 7))
+        self.weekday_count = array("q", bytes(8 * 7))
+        self.sw = self.swx = self.swy = self.swxx = self.swxy = 0.0
+
+    def add(self, day: int, mood: int):
+        self.total += 1
+        if day > self.latest:
+            self._advance(day)
+
+        # Ring buffer (days outside the window only touch the other aggregates)
+        if day > self.latest - WINDOW_DAYS:
+            i = day % WINDOW_DAYS
+            if self.slot_day[i] != day:  # Slot held a day that has left the window
+                self.slot_day[i] = day
+                self.slot_sum[i] = 0
+                self.slot_count[i] = 0
+            self.slot_sum[i] += mood
+            self.slot_count[i] += 1
+
+        weekday = (day - 1) % 7  # Ordinal 1 (0001-01-01) was a Monday
+        self.weekday_sum[weekday] += mood
+        self.weekday_count[weekday] += 1
+
+        x = day - self.latest
+        w = 0.5 ** (-x / TREND_HALF_LIFE_DAYS)
+        self.sw += w
+        self.swx += w * x
+        self.swy += w * mood
+        self.swxx += w * x * x
+        self.swxy += w * x * mood
+
+    def _advance(self, day: int):
+        """Move x = 0 to a newer day: shift the regression sums and decay them."""
+        if self.total > 1:
+            shift = day - self.latest
+            self.swxx += shift * (shift * self.sw - 2 * self.swx)
+            self.swxy -= shift * self.swy
+            self.swx -= shift * self.sw
+            decay = 0.5 ** (shift / TREND_HALF_LIFE_DAYS)
+            self.sw *= decay
+            self.swx *= decay
+            self.swy *= decay
+            self.swxx *= decay
+            self.swxy *= decay
+        self.latest = day
+
+    def mean(self, days: int) -> float:
+        total = count = 0
+        for i in range(WINDOW_DAYS):
+            if self.latest - days < self.slot_day[i] <= self.latest:
+                total += self.slot_sum[i]
+                count += self.slot_count[i]
+        return round(total / count, 2) if count else 0.0
+
+    def slope(self) -> float:
+        denominator = self.sw * self.swxx - self.swx * self.swx
+        if denominator <= 1e-9:  # A single day: no trend yet
+            return 0.0
+        return (self.sw * self.swxy - self.swx * self.swy) / denominator
+
+    def best_days(self):
+        means = [
+            (self.weekday_sum[d] / self.weekday_count[d], self.weekday_count[d], d)
+            for d in range(7) if self.weekday_count[d]
+        ]
+        return [WEEKDAYS[d] for _, _, d in sorted(means, reverse=True)[:BEST_DAYS]]
+
+    def summary(self) -> Dict:
+        slope = self.slope()
+        if slope > SLOPE_THRESHOLD:
+            direction = "improving"
+        elif slope < -SLOPE_THRESHOLD:
+            direction = "declining"
+        else:
+            direction = "stable"
+        return {
+            "avg_mood_7d": self.mean(SHORT_WINDOW_DAYS),
+            "avg_mood_30d": self.mean(WINDOW_DAYS),
+            "trend_direction": direction,
+            "best_days": self.best_days(),
+            "total_logs": self.total,
+        }
+
+
+class TrendService:
+    """Per-user UserTrend aggregates, fed by check-ins"""
+
+    def __init__(self):
+        self._users: Dict[str, UserTrend] = {}
+        self._lock = threading.Lock()  # add() on the event loop vs sync() in the thread pool
+        self._offsets: Dict[str, int] = {}  # Check-in log file -> bytes already applied
+        self._sync_lock = threading.Lock()
+
+    def add(self, uid: str, day: int, mood: int):
+        """Fold one check-in (day from day_number()) into the user's aggregates."""
+        with self._lock:
+            trend = self._users.get(uid)
+            if trend is None:
+                trend = self._users[uid] = UserTrend()
+            trend.add(day, mood)
+
+    def trend(self, uid: str) -> Optional[Dict]:
+        """The user's current trend summary, or None without check-ins."""
+        with self._lock:
+            trend = self._users.get(uid)
+            return trend.summary() if trend is not None else None
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def sync(self) -> int:
+        """
+        Apply check-ins logged since the last sync, except this worker's own
+        (already added as they arrived). The first call replays the whole log.
+        """
+        with self._sync_lock:
+            applied = 0
+            for batch in checkin_service.read_batches(self._offsets, skip_own=True):
+                for uid, day, mood in zip(batch["uid"], batch["date"], batch["mood_score"]):
+                    try:
+                        self.add(uid, day_number(day), mood)
+                    except (TypeError, ValueError):
+                        continue  # Logged before dates were validated
+                    applied += 1
+            return applied
+
+    async def run_sync(self, interval: float = SYNC_INTERVAL):
+        """Background task: replay the check-in log, then keep up with other workers."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, self.sync)
+            except Exception as e:
+                logger.warning("Check-in log sync failed", extra={"error": str(e)})
+            await asyncio.sleep(interval)
+
+
+# Singleton instance
+trend_service = TrendService()
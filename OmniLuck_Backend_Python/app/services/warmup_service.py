@@ -0,0 +1,156 @@
+"""
+Startup Warm-Up.
+Loads what the first requests after a deploy would otherwise pay for:
+
+- timezone: TimezoneFinder data files (birth timezone inference)
+- astrology: Swiss Ephemeris files, via the current transit snapshot
+- lunar: today's lunar phase
+- lottery: cached hot/cold stats and the draw history arrays
+- balanced_table: the balanced combination table (built here if missing, so
+  no request pays the one-off ~3 s build)
+- llm: provider SDK imports and clients
+- numerology: digit-root and score tables
+- trends: personal-trend aggregates replayed from the check-in log
+
+Steps run concurrently (blocking ones in the default thread pool) from a
+background task started in main.py's lifespan, so the worker accepts
+connections meanwhile: /health answers at once and /ready stays 503 until
+every step has finished or WARMUP_TIMEOUT expires. A failing step is logged
+and reported but does not hold readiness back.
+"""
+import asyncio
+import inspect
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, Optional
+
+from app.config import settings
+from app.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+def _load_timezone_finder():
+    from app.services.astrology_service import timezone_finder
+    timezone_finder().timezone_at(lat=40.71, lng=-74.0)
+
+
+async def _warm_timezone():
+    # Import and page in the data files in a worker thread, then build the
+    # event loop thread's own finder (the routes look timezones up there)
+    await asyncio.get_running_loop().run_in_executor(None, _load_timezone_finder)
+    from app.services.astrology_service import timezone_finder
+    timezone_finder().timezone_at(lat=40.71, lng=-74.0)
+
+
+def _warm_astrology():
+    from app.services.astrology_service import astrology_service
+    # Same moment the routes use, so requests this minute reuse the snapshot
+    astrology_service.calculate_transit_positions(datetime.now().replace(second=0, microsecond=0))
+
+
+async def _warm_lunar():
+    from app.services.signals_service import signals_service
+    await signals_service.get_lunar_phase(date.today())
+
+
+def _warm_lottery():
+    from app.services.draw_store import draw_store
+    from app.services.lottery_stats_service import get_stats_snapshot
+    get_stats_snapshot()
+    draw_store.load()
+
+
+def _warm_balanced_table():
+    from app.services.powerball_service import powerball_service
+    len(powerball_service.balanced_table)
+
+
+def _warm_llm():
+    from app.services.llm_service import llm_service
+    llm_service.load_clients()
+
+
+def _warm_trends():
+    from app.services.trend_service import trend_service
+    trend_service.sync()  # Waits for the startup replay of the check-in log
+
+
+def _warm_numerology():
+    from app.services.numerology_service import numerology_service
+    numerology_service.calculate_daily_score("1990-01-01", "Warm Up")
+
+
+WARMUP_STEPS: Dict[str, Callable] = {
+    "timezone": _warm_timezone,
+    "astrology": _warm_astrology,
+    "lunar": _warm_lunar,
+    "lottery": _warm_lottery,
+    "balanced_table": _warm_balanced_table,
+    "llm": _warm_llm,
+    "numerology": _warm_numerology,
+    "trends": _warm_trends,
+}
+
+
+class WarmupService:
+    """Runs the warm-up steps once and tracks readiness"""
+
+    def __init__(self):
+        self.state = "pending"  # pending -> warming -> ready
+        self.steps: Dict[str, Dict] = {}
+        self.duration_ms: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def selected_steps(self) -> Dict[str, Callable]:
+        """WARMUP_STEPS filtered by settings.WARMUP_STEPS (empty: all)."""
+        names = [name.strip() for name in settings.WARMUP_STEPS.split(",") if name.strip()]
+        unknown = [name for name in names if name not in WARMUP_STEPS]
+        if unknown:
+            logger.warning("Unknown warm-up steps ignored", extra={"steps": unknown})
+        return {name: step for name, step in WARMUP_STEPS.items() if not names or name in names}
+
+    async def _run_step(self, name: str, step: Callable):
+        start = time.perf_counter()
+        self.steps[name] = {"status": "running"}
+        try:
+            if inspect.iscoroutinefunction(step):
+                await step()
+            else:
+                await asyncio.get_running_loop().run_in_executor(None, step)
+            self.steps[name] = {"status": "ok"}
+        except Exception as e:
+            logger.warning("Warm-up step failed", extra={"step": name, "error": str(e)})
+            self.steps[name] = {"status": "failed", "error": str(e)}
+        self.steps[name]["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    async def run(self):
+        """Run the selected steps concurrently; ready afterwards (or on timeout)."""
+        if not settings.WARMUP_ENABLED:
+            self.state = "ready"
+            return
+
+        self.state = "warming"
+        start = time.perf_counter()
+        tasks = [asyncio.create_task(self._run_step(name, step)) for name, step in self.selected_steps().items()]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=settings.WARMUP_TIMEOUT)
+            for task in pending:
+                task.cancel()  # Thread-pool steps finish in the background
+            for step in self.steps.values():
+                if step["status"] == "running":
+                    step["status"] = "timeout"
+
+        self.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.state = "ready"
+        logger.info("Warm-up finished", extra={"duration_ms": self.duration_ms, "steps": self.steps})
+
+    def status(self) -> Dict:
+        return {"state": self.state, "duration_ms": self.duration_ms, "steps": self.steps}
+
+
+# Singleton instance
+warmup_service = WarmupService()
@@ -0,0 +1,128 @@
+"""
+Powerball Wheel Generator.
+Picks N lines from a user's lucky pool so that together they cover as many
+distinct pairs (or triples) of pool balls as possible, instead of N
+independent lines that overlap heavily.
+
+Every balanced 5-ball subset of the pool is a candidate. Each candidate is a
+bitset over the pool's pairs/triples; lines are chosen greedily by how many
+uncovered pairs/triples they add, then improved with a swap-based local
+search. All steps are vectorized popcounts over the candidate bitsets.
+"""
+from itertools import combinations
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from app.services.match_service import _popcount
+
+COVER_SIZES = {"pair": 2, "triple": 3}
+LOCAL_SEARCH_PASSES = 3
+
+
+def _set_bits(units: np.ndarray, num_units: int) -> np.ndarray:
+    """(C x k) unit indices -> (C x W) uint64 bitsets."""
+    words = np.zeros((len(units), (num_units + 63) // 64), dtype=np.uint64)
+    rows = np.repeat(np.arange(len(units)), units.shape[1])
+    flat = units.ravel()
+    np.bitwise_or.at(words, (rows, flat // 64), np.uint64(1) << (flat % 64).astype(np.uint64))
+    return words
+
+
+def _coverage_bits(counts: np.ndarray) -> np.ndarray:
+    """Per-unit cover counts -> (W,) uint64 bitset of covered units."""
+    return _set_bits(np.nonzero(counts)[0][None, :], len(counts))[0]
+
+
+class WheelService:
+    """Coverage-maximizing line selection over a ball pool."""
+
+    def build_wheel(
+        self, pool: List[int], num_lines: int,
+        balanced_mask: Callable[[np.ndarray], np.ndarray],
+        cover: str = "pair", seed: int = 0
+    ) -> Dict:
+        """
+        Choose up to `num_lines` balanced lines from `pool` maximizing
+        coverage of distinct pool pairs (cover="pair") or triples.
+        Returns {"white_balls": [[...], ...], "coverage": {...}}.
+        """
+        pool = sorted(set(pool))
+        k = COVER_SIZES[cover]
+
+        # Candidates: balanced 5-subsets of the pool (as pool positions)
+        positions = np.array(list(combinations(range(len(pool)), 5)), dtype=np.intp)
+        white = np.array(pool)[positions]
+        keep = balanced_mask(white)
+        positions, white = positions[keep], white[keep]
+        if not len(positions):
+            raise ValueError("Pool has no balanced 5-ball combinations")
+
+        # Seeded candidate order (breaks ties differently per user)
+        order = np.random.default_rng(seed).permutation(len(positions))
+        positions, white = positions[order], white[order]
+
+        # Unit index of every k-subset of pool positions
+        unit_ids = {combo: i for i, combo in enumerate(combinations(range(len(pool)), k))}
+        sub_positions = np.array(list(combinations(range(5), k)), dtype=np.intp)
+        lookup = np.zeros((len(pool),) * k, dtype=np.intp)
+        for combo, i in unit_ids.items():
+            lookup[combo] = i
+        units = lookup[tuple(positions[:, sub_positions].transpose(2, 0, 1))]
+        num_units = len(unit_ids)
+        bits = _set_bits(units, num_units)
+
+        num_lines = min(num_lines, len(positions))
+        counts = np.zeros(num_units, dtype=np.int32)
+        chosen: List[int] = []
+
+        def gains(covered: np.ndarray) -> np.ndarray:
+            g = _popcount(bits & ~covered).sum(axis=1, dtype=np.int64)
+            g[chosen] = -1  # Never repeat a line
+            return g
+
+        # Greedy: add the line covering the most uncovered units
+        for _ in range(num_lines):
+            best = int(np.argmax(gains(_coverage_bits(counts))))
+            chosen.append(best)
+            counts[units[best]] += 1
+
+        # Local search: swap a line out if another candidate covers more
+        for _ in range(LOCAL_SEARCH_PASSES):
+            improved = False
+            for slot in range(len(chosen)):
+                line = chosen[slot]
+                counts[units[line]] -= 1
+                covered = _coverage_bits(counts)
+                lost = int(_popcount(bits[line] & ~covered).sum())
+                candidate_gains = gains(covered)
+                best = int(np.argmax(candidate_gains))
+                if candidate_gains[best] > lost:
+                    chosen[slot] = line = best
+                    improved = True
+                counts[units[line]] += 1
+            if not improved:
+                break
+
+        covered_units = int(np.count_nonzero(counts))
+        pair_units = len(pool) * (len(pool) - 1) // 2
+        pair_pos = positions[chosen][:, np.array(list(combinations(range(5), 2)))]
+        covered_pairs = len({(int(a), int(b)) for a, b in pair_pos.reshape(-1, 2)})
+
+        return {
+            "white_balls": white[chosen].tolist(),
+            "coverage": {
+                "cover": cover,
+                "pool": pool,
+                "covered": covered_units,
+                "total": num_units,
+                "ratio": round(covered_units / num_units, 4),
+                "pairs_covered": covered_pairs,
+                "pairs_total": pair_units,
+                "candidates": len(positions),
+            }
+        }
+
+
+# Singleton instance
+wheel_service = WheelService()
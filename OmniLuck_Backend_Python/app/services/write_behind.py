@@ -0,0 +1,136 @@
+"""
+Write-Behind Queue.
+Takes records off the request path: put() is a deque append (well under a
+microsecond, no I/O, no lock), and a background writer thread hands the
+pending records to a sink in batches - when BATCH_SIZE records are waiting
+or every FLUSH_INTERVAL seconds, whichever comes first.
+
+The queue is bounded (max_pending): if the sink falls that far behind, new
+records are dropped and counted rather than growing memory without limit.
+
+A batch the sink fails on (disk full, I/O error, locked database) goes back
+to the front of the queue, and the writer retries it after a backoff
+(RETRY_INITIAL_DELAY, doubling up to RETRY_MAX_DELAY). Sinks must therefore
+write a batch all-or-nothing. close() (from main.py's lifespan) stops the
+writer and flushes what is left, retrying CLOSE_ATTEMPTS times, so a clean
+shutdown loses nothing unless the sink keeps failing - then the loss is
+logged and counted.
+
+Used by the luck history store (luck_history_service) and the check-in log
+(checkin_service).
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, List, Optional
+
+from app.services.metrics_service import metrics_service
+from app.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+BATCH_SIZE = 1000  # Pending records that wake the writer early
+FLUSH_INTERVAL = 1.0  # Seconds between flushes otherwise
+MAX_PENDING = 100_000  # Beyond this, put() drops records
+RETRY_INITIAL_DELAY = 1.0  # Seconds before retrying a failed batch
+RETRY_MAX_DELAY = 60.0
+CLOSE_ATTEMPTS = 3  # Flush attempts at shutdown
+CLOSE_RETRY_DELAY = 0.5
+
+
+class WriteBehindQueue:
+    """Batches records in memory and writes them from a background thread."""
+
+    def __init__(self, name: str, sink: Callable[[List[Any]], None],
+                 batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL,
+                 max_pending: int = MAX_PENDING):
+        self.name = name
+        self.sink = sink  # Called with a list of records, from one thread at a time
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = deque()
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self._retry_at = 0.0  # time.monotonic() before which the writer doesn't retry
+        self._retry_delay = RETRY_INITIAL_DELAY
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, record: Any) -> bool:
+        """Queue a record for the writer; False if it was dropped (queue full or closed)."""
+        pending = self._pending
+        if len(pending) >= self.max_pending or self._closed:
+            metrics_service.inc("write_behind_records_total", queue=self.name, outcome="dropped")
+            return False
+        pending.append(record)
+        if self._writer is None:
+            self._start()
+        if len(pending) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def _start(self):
+        with self._start_lock:
+            if self._writer is None and not self._closed:
+                self._writer = threading.Thread(target=self._run, name=f"write-behind-{self.name}", daemon=True)
+                self._writer.start()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if time.monotonic() >= self._retry_at:
+                self.flush()
+
+    def flush(self) -> int:
+        """
+        Write everything pending now (any thread); returns the number of
+        records written. Stops at the first failed batch, which is put back.
+        """
+        with self._flush_lock:
+            written = 0
+            while self._pending:
+                batch = []
+                pending = self._pending
+                for _ in range(min(len(pending), self.batch_size * 10)):
+                    batch.append(pending.popleft())
+                start = time.perf_counter()
+                try:
+                    self.sink(batch)
+                except Exception as e:
+                    pending.extendleft(reversed(batch))
+                    metrics_service.inc("write_behind_records_total", len(batch), queue=self.name, outcome="failed")
+                    logger.warning("Write-behind flush failed - will retry", extra={
+                        "queue": self.name, "records": len(batch), "retry_in_s": self._retry_delay, "error": str(e)
+                    })
+                    self._retry_at = time.monotonic() + self._retry_delay
+                    self._retry_delay = min(self._retry_delay * 2, RETRY_MAX_DELAY)
+                    break
+                self._retry_at, self._retry_delay = 0.0, RETRY_INITIAL_DELAY
+                metrics_service.observe("write_behind_flush_seconds", time.perf_counter() - start, queue=self.name)
+                metrics_service.inc("write_behind_records_total", len(batch), queue=self.name, outcome="written")
+                written += len(batch)
+            return written
+
+    def close(self):
+        """Stop the writer thread and flush the remaining records (idempotent)."""
+        self._closed = True
+        self._wake.set()
+        writer = self._writer
+        if writer is not None:
+            writer.join(timeout=10)
+        for attempt in range(CLOSE_ATTEMPTS):
+            if attempt:
+                time.sleep(CLOSE_RETRY_DELAY)
+            self.flush()
+            if not self._pending:
+                return
+        lost = len(self._pending)
+        self._pending.clear()
+        metrics_service.inc("write_behind_records_total", lost, queue=self.name, outcome="lost")
+        logger.error("Write-behind records lost at shutdown", extra={"queue": self.name, "records": lost})
@@ -0,0 +1,49 @@
+"""
+Shared fixtures for the offline tests (test_backend.py needs a running server).
+"""
+import random
+from datetime import date, timedelta
+from typing import Dict, List
+
+import pytest
+
+from app.services.draw_store import MATRIX_ERAS, DrawStore
+
+
+def synthetic_records(start: str = "2010-02-03", end: str = "2017-12-30", seed: int = 1) -> List[Dict]:
+    """NY Open Data-shaped records, Wednesdays and Saturdays, each draw within its era's matrix."""
+    rng = random.Random(seed)
+    day, last = date.fromisoformat(start), date.fromisoformat(end)
+    records = []
+    while day <= last:
+        if day.weekday() in (2, 5):
+            era = [e for e in MATRIX_ERAS if e.start <= day.isoformat()][-1]
+            white = rng.sample(range(1, era.white_ball_max + 1), 5)
+            powerball = rng.randint(1, era.powerball_max)
+            records.append({
+                "draw_date": f"{day.isoformat()}T00:00:00.000",
+                "winning_numbers": " ".join(f"{b:02d}" for b in white + [powerball]),
+                "multiplier": str(rng.choice([2, 3, 4, 5])),
+            })
+        day += timedelta(days=1)
+    return records
+
+
+@pytest.fixture
+def mixed_era_store(tmp_path, monkeypatch):
+    """
+    A draw store spanning the 5/59+1/39, 5/59+1/35 and 5/69+1/26 matrices,
+    swapped in for the real one, with fresh match/co-occurrence indexes.
+    """
+    from app.services import (
+        backtest_service, cooccurrence_service, history_service, lottery_stats_service, match_service,
+    )
+
+    store = DrawStore(tmp_path / "powerball_draws")
+    store.append(synthetic_records())
+    for module in (backtest_service, cooccurrence_service, history_service, lottery_stats_service, match_service):
+        monkeypatch.setattr(module, "draw_store", store)
+    fresh_match = match_service.MatchService()
+    monkeypatch.setattr(match_service, "match_service", fresh_match)
+    monkeypatch.setattr(history_service, "match_service", fresh_match)
+    return store
@@ -0,0 +1,97 @@
+"""
+Check-in ingestion (app/services/checkin_service.py) throughput.
+
+Against a scratch log directory, submits --count check-ins from --users users
+as fast as one thread can and reports:
+- submit(): request-path cost per call (queue append only)
+- sustained ingestion: check-ins/s from the first submit until the
+  write-behind thread has appended and fsynced all of them
+- log size per check-in, and how fast read_batches() replays the log
+- personal-trend aggregates (app/services/trend_service.py): cost of an
+  update and of a read, and memory per user
+
+    python scripts/bench_checkins.py --count 200000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.schemas import DailyCheckIn  # noqa: E402
+from app.services.checkin_service import CheckInService  # noqa: E402
+from app.services.trend_service import TrendService, UserTrend, day_number  # noqa: E402
+
+
+def user_trend_bytes(trend: UserTrend) -> int:
+    return sys.getsizeof(trend) + sum(
+        sys.getsizeof(getattr(trend, name)) for name in UserTrend.__slots__
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+
+    today = date.today()
+    checkins = [
+        DailyCheckIn(
+            uid=f"user-{i % args.users}",
+            date=(today - timedelta(days=i // args.users)).isoformat(),
+            mood_score=i % 10 + 1,
+            energy_level=("low", "medium", "high")[i % 3],
+            mood_tags=["calm", "focused"] if i % 2 else [],
+            journal_text="Slept well, long walk before work." if i % 4 == 0 else None,
+        )
+        for i in range(args.count)
+    ]
+    saved_at = datetime.now()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = CheckInService(Path(tmp))
+        service.queue.max_pending = args.count  # Measure the writer, not the drop policy
+
+        start = time.perf_counter()
+        for checkin in checkins:
+            service.submit(checkin, None, saved_at)
+        submitted = time.perf_counter() - start
+
+        while len(service.queue):
+            time.sleep(0.01)
+        service.close()  # Waits for the last batch
+        drained = time.perf_counter() - start
+
+        size = sum(path.stat().st_size for path in Path(tmp).glob("*.msgpack"))
+        start = time.perf_counter()
+        replayed = sum(len(batch["uid"]) for batch in service.read_batches())
+        replay = time.perf_counter() - start
+        assert replayed == args.count, replayed
+
+        print(f"check-ins:            {args.count} from {args.users} users")
+        print(f"submit():             {submitted / args.count * 1e6:.2f} us/call")
+        print(f"sustained ingestion:  {args.count / drained:,.0f} check-ins/s ({drained:.2f}s until all fsynced)")
+        print(f"log size:             {size / args.count:.1f} bytes/check-in")
+        print(f"replay:               {args.count / replay:,.0f} check-ins/s")
+
+    trends = TrendService()
+    days = [day_number(checkin.date) for checkin in checkins]
+    start = time.perf_counter()
+    for checkin, day in zip(checkins, days):
+        trends.add(checkin.uid, day, checkin.mood_score)
+    update_us = (time.perf_counter() - start) / args.count * 1e6
+    start = time.perf_counter()
+    for i in range(args.users):
+        trends.trend(f"user-{i}")
+    read_us = (time.perf_counter() - start) / args.users * 1e6
+    print(f"trend update:         {update_us:.2f} us/check-in")
+    print(f"trend read:           {read_us:.2f} us/user")
+    print(f"trend memory:         {user_trend_bytes(trends._users['user-0'])} bytes/user")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Payload size and latency trade-offs of response compression (app/compression.py).
+
+For the existing response models (same payloads as scripts/bench_json.py
+plus a natal chart and a powerball bulk export), reports the body size
+uncompressed, with gzip at a few levels and with brotli when installed, the
+compression time (best of 5) and the resulting time to deliver the body on
+slow links: compression time + size / bandwidth.
+
+    python scripts/bench_compression.py
+"""
+import argparse
+import sys
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_json import forecast_payload, luck_payload, transits_payload  # noqa: E402
+
+from app.compression import BrotliEncoder, GzipEncoder, brotli  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.models.schemas import BirthInfo  # noqa: E402
+from app.responses import dumps  # noqa: E402
+
+# Link speeds in bits per second
+LINKS = (("3G", 400_000), ("4G", 4_000_000))
+
+
+def payloads():
+    from app.services.astrology_service import astrology_service
+    from app.services.powerball_service import powerball_service
+
+    chart = astrology_service.calculate_natal_chart(
+        BirthInfo(dob="1990-05-17", time="12:00", lat=40.71, lon=-74.0, timezone="America/New_York")
+    )
+    white, powerball = powerball_service.generate_bulk_powerballs(
+        name="Ada", dob="1990-05-17", current_date="2026-01-01", luck_score=70, astro_score=50, num_lines=1000
+    )
+    bulk = "".join(
+        f'{{"index": {i + 1}, "white_balls": {w}, "powerball": {pb}}}\n'
+        for i, (w, pb) in enumerate(zip(white.tolist(), powerball.tolist()))
+    ).encode()
+    return (
+        ("luck-100", dumps(luck_payload())),
+        ("forecast-365", dumps(forecast_payload())),
+        ("transits", dumps(transits_payload())),
+        ("natal-chart", dumps(chart)),
+        ("bulk-1000", bulk),
+    )
+
+
+def best_us(func, repeats: int = 5) -> float:
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    codecs = [
+        (f"gzip-{level}", lambda body, level=level: GzipEncoder(level).compress(body, final=True))
+        for level in (1, settings.COMPRESSION_GZIP_LEVEL, 9)
+    ]
+    if brotli is not None:
+        codecs.append((f"br-{settings.COMPRESSION_BROTLI_QUALITY}",
+                       lambda body: BrotliEncoder(settings.COMPRESSION_BROTLI_QUALITY).compress(body, final=True)))
+    print(f"brotli: {'yes' if brotli is not None else 'not installed'}; "
+          f"threshold {settings.COMPRESSION_MIN_SIZE} bytes; zlib {zlib.ZLIB_VERSION}\n")
+
+    header = f"{'payload':<13} {'codec':<8} {'bytes':>8} {'ratio':>6} {'cpu':>8}" + "".join(f" {name:>8}" for name, _ in LINKS)
+    print(header)
+    for name, body in payloads():
+        rows = [("none", len(body), 0.0)]
+        for codec, compress in codecs:
+            compressed = compress(body)
+            rows.append((codec, len(compressed), best_us(lambda: compress(body))))
+        for codec, size, cpu_us in rows:
+            delivery = "".join(f" {(cpu_us / 1e6 + size * 8 / bps) * 1000:>6.1f}ms" for _, bps in LINKS)
+            print(f"{name:<13} {codec:<8} {size:>8} {len(body) / size:>5.1f}x {cpu_us:>6.0f}us{delivery}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
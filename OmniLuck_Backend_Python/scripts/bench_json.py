@@ -0,0 +1,127 @@
+"""
+Response serialization: FastAPI's default JSON path vs FastJSONResponse (app/responses.py).
+
+Payloads:
+- luck-100:     LuckCalculationResponse with 100 daily powerball lines
+- forecast-365: ForecastResponse with a 365-day trajectory
+- transits:     DailyTransitsResponse with the aspect list for a real chart
+
+Paths (best of 5 runs, per response):
+- default:        jsonable_encoder + stdlib json (FastAPI's JSONResponse)
+- model+json:     model_dump(mode="json") + stdlib json
+- fast(model):    FastJSONResponse(model), i.e. model_dump_json
+- fast(dict):     FastJSONResponse(dict), orjson (what a response_model route
+                  hands the router's response class)
+
+    python scripts/bench_json.py --iterations 200
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.models.schemas import (  # noqa: E402
+    BirthInfo, ForecastDay, ForecastResponse, LuckCalculationResponse, LuckComponents, PowerballNumbers,
+)
+from app.responses import FastJSONResponse, orjson  # noqa: E402
+
+
+def luck_payload(lines: int = 100) -> LuckCalculationResponse:
+    return LuckCalculationResponse(
+        luck_score=72,
+        components=LuckComponents(
+            base_numerology=64, astrology_score=71, natal_potential=58,
+            cosmic_weather=66, personal_trend=3, total=72,
+        ),
+        confidence=0.85,
+        caption="Strong Momentum",
+        summary="Harmonious transits with a supportive numerology cycle.",
+        explanation="Jupiter trines your natal Sun while the Moon waxes in your sign. " * 4,
+        recommended_actions=["Start the project you have been postponing", "Reach out to a mentor", "Take a short walk at noon"],
+        strategic_advice="Lean into collaboration in the afternoon; avoid rushed financial decisions.",
+        lucky_time_slots=["09:00-11:00", "15:00-16:30"],
+        personal_powerball=PowerballNumbers(white_balls=[3, 17, 28, 44, 61], powerball=9, type="personal"),
+        daily_powerballs=[
+            PowerballNumbers(
+                white_balls=sorted({(i * 7 + k * 13) % 69 + 1 for k in range(5)} | {69})[:5],
+                powerball=i % 26 + 1, type="daily", index=i + 1,
+            )
+            for i in range(lines)
+        ],
+    )
+
+
+def forecast_payload(days: int = 365) -> ForecastResponse:
+    start = date.today()
+    return ForecastResponse(
+        trajectory=[
+            ForecastDay(
+                date=(start + timedelta(days=d)).isoformat(),
+                luck_score=40 + (d * 37) % 55,
+                transits_score=35 + (d * 11) % 60,
+                major_aspects=["Jupiter Trine Sun", "Moon Square Mars"],
+            )
+            for d in range(days)
+        ],
+        trend_direction="Rising",
+        best_day=(start + timedelta(days=17)).isoformat(),
+    )
+
+
+def transits_payload():
+    from app.services.astrology_service import astrology_service
+    chart = astrology_service.calculate_natal_chart(
+        BirthInfo(dob="1990-05-17", time="12:00", lat=40.71, lon=-74.0, timezone="America/New_York")
+    )
+    return astrology_service.calculate_daily_transits(datetime.now().replace(second=0, microsecond=0), chart)
+
+
+def per_call_us(func, iterations: int, repeats: int = 5) -> float:
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"orjson: {'yes' if orjson is not None else 'no (stdlib json fallback)'}\n")
+    print(f"{'payload':<14} {'bytes':>8} {'default':>10} {'model+json':>11} {'fast(model)':>12} {'fast(dict)':>11}  speedup")
+    for name, model in (
+        ("luck-100", luck_payload()),
+        ("forecast-365", forecast_payload()),
+        ("transits", transits_payload()),
+    ):
+        as_dict = model.model_dump(mode="json")
+        # Same document either way
+        assert json.loads(FastJSONResponse(model).body) == json.loads(JSONResponse(jsonable_encoder(model)).body)
+
+        timings = [
+            per_call_us(lambda: JSONResponse(jsonable_encoder(model)), args.iterations),
+            per_call_us(lambda: JSONResponse(model.model_dump(mode="json")), args.iterations),
+            per_call_us(lambda: FastJSONResponse(model), args.iterations),
+            per_call_us(lambda: FastJSONResponse(as_dict), args.iterations),
+        ]
+        size = len(FastJSONResponse(model).body)
+        print(
+            f"{name:<14} {size:>8} " + " ".join(f"{t:>9.0f}us" for t in timings[:2])
+            + f" {timings[2]:>10.0f}us {timings[3]:>9.0f}us  x{timings[0] / timings[2]:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
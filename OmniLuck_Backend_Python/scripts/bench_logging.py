@@ -0,0 +1,147 @@
+"""
+Request throughput with structured logging on and off (app/services/logging_service.py).
+
+Each mode runs in a fresh interpreter (log settings are read at startup) that
+drives POST /api/luck/calculate in-process over httpx's ASGI transport with
+CONCURRENCY requests in flight; log output goes to a pipe that the parent
+drains. Requests log on their hot paths (missing weather key, unreachable
+upstreams), so the INFO run exercises the queue handler and rate limiter.
+
+Also reports the caller-side cost of a logger call that passes the rate
+limiter and of one it suppresses (with LOG_LEVEL=OFF both are a level check).
+
+    python scripts/bench_logging.py --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+CONCURRENCY = 16
+MODES = (
+    ("OFF", "json"),
+    ("INFO", "json"),
+    ("INFO", "text"),
+)
+REQUEST = {
+    "uid": "bench",
+    "name": "Ada Lovelace",
+    "dob": "1990-05-17",
+    "birth_time": "12:00",
+    "birth_lat": 40.71,
+    "birth_lon": -74.0,
+    "current_lat": 40.71,
+    "current_lon": -74.0,
+}
+
+
+async def drive(total: int) -> dict:
+    import httpx
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up (TimezoneFinder, ephemeris, caches)
+        for _ in range(5):
+            await client.post("/api/luck/calculate", json=REQUEST)
+
+        remaining = total
+        failures = 0
+
+        async def worker():
+            nonlocal remaining, failures
+            while remaining > 0:
+                remaining -= 1
+                response = await client.post("/api/luck/calculate", json=REQUEST)
+                if response.status_code != 200:
+                    failures += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - start
+
+    return {"requests": total, "failures": failures, "seconds": elapsed}
+
+
+def logger_call_ns(iterations: int) -> dict:
+    """Caller-side cost of logger.warning, passed / rate-limited (this process's settings)."""
+    from app.services.logging_service import get_logger
+
+    logger = get_logger("bench")
+    results = {}
+    for label, make_msg in (("passed", lambda i: f"bench message {i}"), ("suppressed", lambda i: "bench message")):
+        messages = [make_msg(i) for i in range(iterations)]
+        start = time.perf_counter_ns()
+        for message in messages:
+            logger.warning(message, extra={"i": 1})
+        results[label] = (time.perf_counter_ns() - start) / iterations
+    return results
+
+
+def child(total: int, iterations: int):
+    from app.services.logging_service import logging_service
+
+    result = asyncio.run(drive(total))
+    # Flush the request logs and stop the writer; the per-call timing below
+    # then measures only what callers pay (filter + enqueue)
+    logging_service.shutdown()
+    result["logger_ns"] = logger_call_ns(iterations)
+    # Parent reads the last line of stderr; stdout carries the logs
+    print(json.dumps(result), file=sys.stderr)
+
+
+def run_mode(level: str, fmt: str, total: int, iterations: int) -> dict:
+    env = dict(
+        os.environ,
+        LOG_LEVEL=level,
+        LOG_FORMAT=fmt,
+        LOTTERY_REFRESHER_ENABLED="false",
+        PYTHONPATH=str(ROOT),
+    )
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child", "--requests", str(total), "--iterations", str(iterations)],
+        env=env, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr)
+    result = json.loads(proc.stderr.strip().splitlines()[-1])
+    result["log_lines"] = proc.stdout.count("\n")  # Request logs only
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=100000, help="logger calls for the per-call timing")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.requests, args.iterations)
+        return
+
+    print(f"{args.requests} x POST /api/luck/calculate, {CONCURRENCY} concurrent\n")
+    print(f"{'mode':<12} {'req/s':>9} {'log lines':>10} {'passed ns':>11} {'suppressed ns':>14}")
+    baseline = None
+    for level, fmt in MODES:
+        result = run_mode(level, fmt, args.requests, args.iterations)
+        rps = result["requests"] / result["seconds"]
+        baseline = baseline or rps
+        logger_ns = result["logger_ns"]
+        print(
+            f"{level + '/' + fmt:<12} {rps:>9.1f} {result['log_lines']:>10} "
+            f"{logger_ns['passed']:>11.0f} {logger_ns['suppressed']:>14.0f}"
+            f"   ({rps / baseline - 1:+.1%} vs OFF)"
+            + (f"  [{result['failures']} failed]" if result["failures"] else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
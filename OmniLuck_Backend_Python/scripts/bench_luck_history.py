@@ -0,0 +1,72 @@
+"""
+Luck history store (app/services/luck_history_service.py) throughput.
+
+Against a scratch database, reports:
+- record(): request-path cost per call (queue append only)
+- sustained writes: rows/s the write-behind thread commits while --users
+  users each get one score per day for --days days
+- history(uid, 30): latency of the indexed range scan at that table size,
+  and the query plan (must use luck_history_uid_date)
+
+    python scripts/bench_luck_history.py --users 1000 --days 90
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_json import luck_payload  # noqa: E402
+
+from app.services.luck_history_service import SELECT_HISTORY, LuckHistoryService  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--reads", type=int, default=1000)
+    args = parser.parse_args()
+
+    response = luck_payload(lines=0)
+    today = date.today()
+    days = [(today - timedelta(days=d)).isoformat() for d in range(args.days)]
+    total = args.users * args.days
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LuckHistoryService(Path(tmp) / "luck_history.db")
+        store.queue.max_pending = total  # Measure the writer, not the drop policy
+
+        # Request path: enqueue only (the writer thread starts with the first record)
+        start = time.perf_counter()
+        for day in days:
+            for user in range(args.users):
+                store.record(f"user-{user}", response, day=day)
+        enqueue = time.perf_counter() - start
+
+        # Sustained: until the writer has committed every row
+        while len(store.queue):
+            time.sleep(0.01)
+        store.flush()
+        drained = time.perf_counter() - start
+        print(f"rows:              {total}")
+        print(f"record():          {enqueue / total * 1e6:.2f} us/call")
+        print(f"sustained writes:  {total / drained:,.0f} rows/s ({drained:.2f}s to commit {total})")
+
+        store.history("user-0", 30)  # Open the read connection
+        start = time.perf_counter()
+        for i in range(args.reads):
+            store.history(f"user-{i % args.users}", 30)
+        read_us = (time.perf_counter() - start) / args.reads * 1e6
+        plan = store._reader.execute("EXPLAIN QUERY PLAN " + SELECT_HISTORY, ("user-0", days[-1])).fetchall()
+        print(f"history(uid, 30):  {read_us:.0f} us/query")
+        print("query plan:        " + "; ".join(row[-1] for row in plan))
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
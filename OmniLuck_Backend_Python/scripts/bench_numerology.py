@@ -0,0 +1,42 @@
+"""
+Microbenchmark for NumerologyService.calculate_daily_score.
+
+Cycles through a cohort of users and a year of target dates, as the forecast
+and batch endpoints do.
+
+    python scripts/bench_numerology.py --calls 1000000
+"""
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.numerology_service import numerology_service  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+
+    users = [
+        (f"{1950 + i % 60}-{1 + i % 12:02d}-{1 + i % 28:02d}", f"User Number{i} Example")
+        for i in range(args.users)
+    ]
+    dates = [(date(2026, 1, 1) + timedelta(days=i)).isoformat() for i in range(365)]
+
+    score = numerology_service.calculate_daily_score
+    start = time.perf_counter()
+    for i in range(args.calls):
+        dob, name = users[i % len(users)]
+        score(dob, name, dates[i % len(dates)])
+    elapsed = time.perf_counter() - start
+    print(f"{args.calls:,} calls in {elapsed:.2f}s ({elapsed / args.calls * 1e6:.2f} µs/call)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Benchmark Powerball line generation (100 lines per run).
+
+    python scripts/bench_powerball_generation.py --runs 50
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.powerball_service import powerball_service  # noqa: E402
+
+
+def bench(label: str, fn, runs: int) -> None:
+    fn()  # Warm up (loads the stats cache)
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    per_run = (time.perf_counter() - start) / runs * 1000
+    print(f"{label:<32} {per_run:8.3f} ms / 100 lines")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    bench("personal (100 profiles)", lambda: [
+        powerball_service.generate_personal_powerball(f"User {i}", "1990-05-17") for i in range(100)
+    ], args.runs)
+    bench("daily (100 lines, 1 profile)", lambda: powerball_service.generate_daily_powerballs(
+        "Bench User", "1990-05-17", "2026-01-01", luck_score=70, num_lines=100
+    ), args.runs)
+
+
+if __name__ == "__main__":
+    main()
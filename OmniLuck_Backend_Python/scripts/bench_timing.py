@@ -0,0 +1,79 @@
+"""
+Overhead of timing spans (app/services/timing_service.py).
+
+Times N empty `with span(...)` blocks and N calls through a @timed function,
+with and without an active request span list, against the bare loop (best of 5 runs each).
+Exits non-zero if a span costs more than OVERHEAD_BUDGET_NS.
+
+    python scripts/bench_timing.py --iterations 1000000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.timing_service import OVERHEAD_BUDGET_NS, timing_service  # noqa: E402
+
+
+def per_call_ns(func, iterations: int, repeats: int = 5) -> float:
+    """Best of `repeats` runs (least disturbed by other load)."""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        func(iterations)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / iterations
+
+
+def bare(n):
+    for _ in range(n):
+        pass
+
+
+def spans(n):
+    span = timing_service.span
+    for _ in range(n):
+        with span("bench"):
+            pass
+
+
+def plain_call(n):
+    f = lambda: None  # noqa: E731
+    for _ in range(n):
+        f()
+
+
+def timed_call(n):
+    f = timing_service.timed("bench_timed")(lambda: None)
+    for _ in range(n):
+        f()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1_000_000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    base = per_call_ns(bare, n)
+    call_base = per_call_ns(plain_call, n)
+    results = {
+        "span (no request)": per_call_ns(spans, n) - base,
+        "@timed (no request)": per_call_ns(timed_call, n) - call_base,
+    }
+    timing_service.start_request()  # Spans now also append to a request list
+    results["span (in request)"] = per_call_ns(spans, n) - base
+    results["@timed (in request)"] = per_call_ns(timed_call, n) - call_base
+
+    for label, overhead in results.items():
+        print(f"{label:22s} {overhead:7.0f} ns/span")
+    worst = max(results.values())
+    print(f"budget {OVERHEAD_BUDGET_NS} ns/span: {'OK' if worst <= OVERHEAD_BUDGET_NS else 'EXCEEDED'}")
+    sys.exit(0 if worst <= OVERHEAD_BUDGET_NS else 1)
+
+
+if __name__ == "__main__":
+    main()
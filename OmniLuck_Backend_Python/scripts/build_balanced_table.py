@@ -0,0 +1,27 @@
+"""
+Build (or rebuild) the balanced Powerball combination table.
+
+The "balanced_table" warm-up step builds it at startup if it is missing; run
+this at deploy time to keep the ~3 s build out of every fresh worker's warm-up.
+
+    python scripts/build_balanced_table.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.powerball_service import powerball_service  # noqa: E402
+
+
+def main():
+    table = powerball_service.balanced_table
+    start = time.perf_counter()
+    ranks = table.build()
+    print(f"✅ {len(ranks):,} balanced combinations -> {table.path} "
+          f"({ranks.nbytes / 1e6:.1f} MB, {time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
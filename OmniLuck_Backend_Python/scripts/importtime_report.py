@@ -0,0 +1,79 @@
+"""
+Import-time report for `import app.main` (cold start).
+
+Runs a fresh interpreter with `python -X importtime` a few times, keeps the
+fastest run, and prints the total plus the slowest modules by cumulative and
+self time, the app's own modules, and which of the lazily-loaded heavy
+dependencies (see test_import_time.py) were pulled in anyway.
+
+    python scripts/importtime_report.py --runs 5 --top 15
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from test_import_time import LAZY_MODULES  # noqa: E402
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile() -> list:
+    """One cold `import app.main`: [(module, self us, cumulative us, depth)]."""
+    env = dict(os.environ, LOG_LEVEL="OFF", PYTHONPATH=str(ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env, cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr)
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [profile() for _ in range(args.runs)]
+    totals = [next(cum for module, _, cum, _ in rows if module == "app.main") for rows in runs]
+    rows = runs[totals.index(min(totals))]
+    total_us = min(totals)
+
+    print(f"import app.main: {total_us / 1000:.0f} ms (best of {args.runs}; "
+          f"runs: {', '.join(f'{t / 1000:.0f}' for t in totals)} ms)\n")
+
+    # Direct imports of app.main and the slowest subtrees anywhere
+    print(f"Slowest by cumulative time (top {args.top}):")
+    for module, _, cumulative_us, depth in sorted(rows, key=lambda r: -r[2])[1:args.top + 1]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {'  ' * (depth - 1)}{module}")
+
+    print(f"\nSlowest by self time (top {args.top}):")
+    for module, self_us, _, _ in sorted(rows, key=lambda r: -r[1])[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {module}")
+
+    print("\nApp modules (self / cumulative):")
+    for module, self_us, cumulative_us, _ in rows:
+        if module.startswith("app."):
+            print(f"  {self_us / 1000:8.1f} / {cumulative_us / 1000:8.1f} ms  {module}")
+
+    loaded = {module for module, _, _, _ in rows}
+    eager = [module for module in LAZY_MODULES if module in loaded]
+    print(f"\nLazy modules imported at startup: {', '.join(eager) if eager else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Strategy backtests over a draw store that spans several Powerball matrices.
+
+    pytest test_backtest_service.py
+"""
+from collections import Counter
+
+import numpy as np
+
+from app.services.draw_store import CURRENT_ERA
+
+
+def test_point_in_time_frequencies_match_brute_force(mixed_era_store):
+    from app.services.backtest_service import point_in_time_frequencies
+
+    base = mixed_era_store.current_era_start()
+    balls = np.asarray(mixed_era_store.balls)[base:]
+    white_freq, pb_freq = point_in_time_frequencies(window=20)
+    assert len(white_freq) == len(balls) + 1
+    for i in (0, 1, 19, 20, 21, len(balls) // 2, len(balls)):
+        window = balls[max(0, i - 20):i]
+        white = Counter(window[:, :5].ravel().tolist())
+        powerball = Counter(window[:, 5].tolist())
+        assert white_freq[i].tolist() == [white.get(b, 0) for b in range(70)]
+        assert pb_freq[i].tolist() == [powerball.get(b, 0) for b in range(27)]
+
+
+def test_hot_cold_lists_match_live_stats(mixed_era_store):
+    from app.services.backtest_service import STATS_WINDOW, point_in_time_frequencies, point_in_time_hot_cold
+    from app.services.lottery_stats_service import LotteryStatsService
+
+    hot_rank, cold_mask = point_in_time_hot_cold(point_in_time_frequencies()[0])
+    live = LotteryStatsService().calculate_frequency(window=STATS_WINDOW)
+    hot = sorted(range(70), key=lambda ball: hot_rank[-1, ball])[:16]
+    assert hot == live["hot_numbers"]
+    assert sorted(np.nonzero(cold_mask[-1])[0].tolist()) == sorted(live["cold_numbers"])
+
+
+def test_nudge_matches_apply_statistical_weight(mixed_era_store):
+    from app.services.backtest_service import (
+        apply_statistical_weight, point_in_time_frequencies, point_in_time_hot_cold, random_lines,
+    )
+    from app.services.lottery_stats_service import StatsSnapshot
+    from app.services.powerball_service import PowerballService
+
+    white_freq = point_in_time_frequencies()[0]
+    rows = np.array([0, 57, len(white_freq) - 1])
+    hot_rank, cold_mask = point_in_time_hot_cold(white_freq[rows])
+    service = PowerballService()
+    rng = np.random.default_rng(3)
+    for r in range(len(rows)):
+        order = np.argsort(-white_freq[rows[r], 1:], kind="stable") + 1
+        snapshot = StatsSnapshot.build(order[:16].tolist(), order[-10:].tolist())
+        white, _ = random_lines(rng, 2000)
+        seeds = rng.integers(0, 2**31 - 1, size=white.shape)
+        nudged = apply_statistical_weight(white, seeds, hot_rank[[r] * 2000], cold_mask[[r] * 2000])
+        expected = [[service._apply_statistical_weight(ball, seed, snapshot) for ball, seed in zip(line, line_seeds)]
+                    for line, line_seeds in zip(white.tolist(), seeds.tolist())]
+        assert nudged.tolist() == expected
+
+
+def test_hot_cold_lines_are_valid(mixed_era_store):
+    from app.services.backtest_service import hot_cold_lines, point_in_time_frequencies, point_in_time_hot_cold
+
+    hot_rank, cold_mask = point_in_time_hot_cold(point_in_time_frequencies()[0])
+    latest = np.full(5000, len(hot_rank) - 1)
+    white, powerball = hot_cold_lines(np.random.default_rng(4), hot_rank[latest], cold_mask[latest])
+    assert white.shape == (5000, 5) and powerball.shape == (5000,)
+    assert white.min() >= 1 and white.max() <= 69 and powerball.min() >= 1 and powerball.max() <= 26
+    assert (np.diff(white, axis=1) > 0).all()  # Sorted, repeats re-drawn
+    hot = hot_rank[-1] < 99
+    assert hot[white].mean() > 16 / 69  # The nudge favours hot numbers
+
+
+def test_replay_scores_current_matrix_draws_only(mixed_era_store):
+    from app.services.backtest_service import STATS_WINDOW, STRATEGIES, backtest_service
+
+    report = backtest_service.replay_history(lines_per_draw=2)
+    base = mixed_era_store.current_era_start()
+    assert report["matrix"] == CURRENT_ERA.name
+    assert report["draws"] == len(mixed_era_store) - base - STATS_WINDOW
+    assert report["first_draw"] > CURRENT_ERA.start
+    assert set(report["strategies"]) == set(STRATEGIES)
+    for result in report["strategies"].values():
+        assert result["tickets"] == 2 * report["draws"]
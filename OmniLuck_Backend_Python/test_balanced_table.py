@@ -0,0 +1,164 @@
+"""
+Balanced combination table and the generators that pick from it.
+Builds the full table once for the session (a few seconds).
+
+    pytest test_balanced_table.py
+"""
+import threading
+from math import comb
+
+import numpy as np
+import pytest
+
+from app.services.balanced_table import BalancedCombinationTable, combination_ranks, unrank_combinations
+from app.services.powerball_service import PowerballService
+
+
+@pytest.fixture(scope="session")
+def table(tmp_path_factory):
+    table = BalancedCombinationTable(PowerballService()._balanced_mask, tmp_path_factory.mktemp("balanced") / "table.npy")
+    len(table)
+    return table
+
+
+@pytest.fixture
+def service(table):
+    service = PowerballService()
+    service.balanced_table = table
+    return service
+
+
+def _random_lines(rng, count):
+    white = rng.random((count, 69)).argpartition(5, axis=1)[:, :5] + 1
+    white.sort(axis=1)
+    return white
+
+
+def test_rank_round_trip():
+    rng = np.random.default_rng(0)
+    white = _random_lines(rng, 1000)
+    ranks = combination_ranks(white)
+    assert ranks.min() >= 0 and ranks.max() < comb(69, 5)
+    assert np.array_equal(unrank_combinations(ranks), white)
+
+
+def test_table_holds_exactly_the_balanced_lines(table, service):
+    ranks = np.asarray(table.ranks)
+    assert (np.diff(ranks.astype(np.int64)) > 0).all()  # Sorted, no repeats
+    rng = np.random.default_rng(1)
+    white = _random_lines(rng, 20_000)
+    in_table = np.isin(combination_ranks(white), ranks)
+    assert np.array_equal(in_table, service._balanced_mask(white))
+    sample = unrank_combinations(ranks[rng.integers(0, len(ranks), 2000)])
+    assert service._balanced_mask(sample).all()
+
+
+def test_pick_is_seeded_and_balanced(table, service):
+    ranks = np.asarray(table.ranks)
+    for seed in (0, 1, 1009, 2**31 - 1, 10**12):
+        line = table.pick(seed)
+        assert line == table.pick(seed)
+        assert line == unrank_combinations(ranks[[seed % len(ranks)]])[0].tolist()
+        assert service._is_statistically_balanced(line)
+
+
+def test_nearest_keeps_balanced_lines(table, service):
+    rng = np.random.default_rng(2)
+    white = _random_lines(rng, 5000)
+    snapped = table.nearest(white)
+    assert service._balanced_mask(snapped).all()
+    balanced = service._balanced_mask(white)
+    assert np.array_equal(snapped[balanced], white[balanced])
+
+
+def test_generated_lines_are_balanced(service, monkeypatch):
+    picks = []
+    real_pick = service.balanced_table.pick
+    monkeypatch.setattr(service.balanced_table, "pick", lambda seed: picks.append(seed) or real_pick(seed))
+
+    for day in range(1, 29):
+        current_date = f"2026-02-{day:02d}"
+        lines = service.generate_daily_powerballs("Ada Lovelace", "1815-12-10", current_date, luck_score=day, num_lines=10)
+        assert lines == service.generate_daily_powerballs("Ada Lovelace", "1815-12-10", current_date, luck_score=day, num_lines=10)
+        for line in lines:
+            assert service._is_statistically_balanced(line["white_balls"])
+            assert 1 <= line["powerball"] <= 26
+    for name in ("Ada Lovelace", "Alan Turing", "Grace Hopper", "X"):
+        personal = service.generate_personal_powerball(name, "1906-12-09")
+        assert service._is_statistically_balanced(personal["white_balls"])
+    assert picks  # Some candidates were unbalanced and came from the table
+
+
+def test_concurrent_first_use_builds_once(tmp_path, monkeypatch):
+    table = BalancedCombinationTable(PowerballService()._balanced_mask, tmp_path / "table.npy")
+    builds = []
+    monkeypatch.setattr(table, "build", lambda: builds.append(1) or np.arange(10, dtype=np.uint32))
+
+    threads = [threading.Thread(target=len, args=(table,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert builds == [1] and len(table) == 10
+
+
+def _bulk(service, count, seed=5):
+    return service.generate_bulk_powerballs("Ada Lovelace", "1815-12-10", "2026-02-02", 70, num_lines=count, seed=seed)
+
+
+@pytest.mark.parametrize("count", [1, 999, 8192, 30_000])
+def test_bulk_returns_exactly_count_distinct_balanced_lines(service, count):
+    white, powerball = _bulk(service, count)
+    assert white.shape == (count, 5) and powerball.shape == (count,)
+    assert service._balanced_mask(white).all()
+    assert (np.diff(white, axis=1) > 0).all()
+    assert ((1 <= powerball) & (powerball <= 26)).all()
+    assert len({(tuple(w), p) for w, p in zip(white.tolist(), powerball.tolist())}) == count
+
+
+def test_bulk_is_deterministic_and_prefix_stable(service):
+    white, powerball = _bulk(service, 20_000)
+    again = _bulk(service, 20_000)
+    smaller = _bulk(service, 5000)
+    assert np.array_equal(white, again[0]) and np.array_equal(powerball, again[1])
+    assert np.array_equal(white[:5000], smaller[0]) and np.array_equal(powerball[:5000], smaller[1])
+    chunks = list(service.iter_bulk_powerballs("Ada Lovelace", "1815-12-10", "2026-02-02", 70, num_lines=20_000, seed=5))
+    assert len(chunks) > 1
+    assert np.array_equal(np.concatenate([c[0] for c in chunks]), white)
+
+
+def test_bulk_raises_instead_of_returning_short(service, monkeypatch):
+    from app.services import powerball_service as module
+
+    monkeypatch.setattr(module, "MAX_BULK_BATCHES", 2)
+    with pytest.raises(RuntimeError, match="of 50000 distinct lines"):
+        _bulk(service, 50_000)
+
+
+def test_bulk_route_streams_every_line(table, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.services.powerball_service import powerball_service
+
+    monkeypatch.setattr(powerball_service, "balanced_table", table)
+    payload = {"name": "Ada Lovelace", "dob": "1815-12-10", "date": "2026-02-02", "count": 20_000, "seed": 5}
+    response = TestClient(app).post("/api/luck/lottery/bulk", json=payload)
+    assert response.status_code == 200
+    rows = [line for line in response.text.splitlines() if line]
+    assert len(rows) == 20_000
+    assert rows[0].startswith('{"index": 1, ') and rows[-1].startswith('{"index": 20000, ')
+
+
+def test_concurrent_builds_publish_a_complete_table(tmp_path):
+    """Workers building at the same time each write their own temp file"""
+    path = tmp_path / "table.npy"
+    tables = [BalancedCombinationTable(PowerballService()._balanced_mask, path) for _ in range(2)]
+    saved = []
+    threads = [threading.Thread(target=lambda t=t: saved.append(t.build())) for t in tables]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert np.array_equal(np.load(path), saved[0]) and np.array_equal(saved[0], saved[1])
+    assert [p.name for p in tmp_path.iterdir()] == ["table.npy"]  # No temp files left behind
@@ -0,0 +1,136 @@
+"""
+Batch luck scoring: parity with /calculate, per-user failures and the
+shared signals fetch.
+
+    pytest test_batch_luck_service.py
+"""
+import json
+from datetime import date, datetime
+
+import pytest
+
+from app.models.schemas import GeomagneticResponse, LunarPhaseResponse, WeatherResponse
+
+USERS = [
+    {"uid": "ada", "name": "Ada Lovelace", "dob": "1815-12-10", "birth_lat": 51.51, "birth_lon": -0.13,
+     "birth_time": "08:30", "current_lat": 51.5, "current_lon": -0.1},
+    {"uid": "alan", "name": "Alan Turing", "dob": "1912-06-23", "birth_lat": 51.52, "birth_lon": -0.18,
+     "current_lat": 40.7, "current_lon": -74.0},
+    {"uid": "grace", "name": "Grace Hopper", "dob": "1906-12-09"},  # No birth or current location
+]
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 3, 2, 8, 15, 42)
+
+
+@pytest.fixture
+def weather_calls(monkeypatch):
+    """Offline signals (weather depends on latitude), no AI, fixed clock."""
+    from app.routes import luck
+    from app.services import batch_luck_service as batch_module
+    from app.services.llm_service import llm_service
+    from app.services.signals_service import signals_service
+
+    calls = []
+
+    async def lunar(target_date=None):
+        return LunarPhaseResponse(phase_name="Full Moon", phase_percentage=0.5, illumination=100,
+                                  next_full_moon=date(2026, 3, 3), next_new_moon=date(2026, 3, 18), influence_score=80)
+
+    async def weather(lat, lon):
+        calls.append((lat, lon))
+        return WeatherResponse(condition="clear", temp_c=10, temp_f=50, humidity=40, pressure=1010,
+                               influence_score=int(abs(lat)) % 100)
+
+    async def geomagnetic():
+        return GeomagneticResponse(kp_index=1.0, activity_level="quiet", influence_score=17)
+
+    monkeypatch.setattr(signals_service, "get_lunar_phase", lunar)
+    monkeypatch.setattr(signals_service, "get_weather", weather)
+    monkeypatch.setattr(signals_service, "get_geomagnetic_activity", geomagnetic)
+    monkeypatch.setattr(llm_service, "analyze_luck_and_generate_content",
+                        lambda **kwargs: {"explanation": "No AI", "actions": []})  # No score: default weight
+    monkeypatch.setattr(luck, "datetime", FrozenDatetime)
+    monkeypatch.setattr(batch_module, "datetime", FrozenDatetime)
+    return calls
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    return TestClient(app)
+
+
+def _batch(client, users):
+    response = client.post("/api/luck/calculate:batch", json={"requests": users})
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_batch_rows_match_calculate(client, weather_calls):
+    rows = _batch(client, USERS)
+    assert [row["index"] for row in rows] == [0, 1, 2]
+    for user, row in zip(USERS, rows):
+        single = client.post("/api/luck/calculate", json=user).json()
+        assert row["uid"] == user["uid"]
+        if "current_lat" in user:
+            assert row["result"]["components"] == single["components"]
+            assert row["result"]["luck_score"] == single["luck_score"]
+        else:
+            # /calculate looks up (0, 0) for a missing location; the batch uses the neutral score
+            components = {**single["components"], "cosmic_weather": 50}
+            components["total"] = row["result"]["components"]["total"]
+            assert row["result"]["components"] == components
+
+
+def test_missing_location_skips_the_weather_fetch(client, weather_calls):
+    rows = _batch(client, USERS[2:] * 3)
+    assert weather_calls == []
+    assert all(row["result"]["components"]["cosmic_weather"] == 50 for row in rows)
+
+    _batch(client, USERS)
+    assert len(weather_calls) == 2 and (0.0, 0.0) not in weather_calls  # One tile per located user
+
+
+def test_failing_user_becomes_an_error_row(client, weather_calls, monkeypatch):
+    from app.services.batch_luck_service import batch_luck_service
+
+    real_build = batch_luck_service._build_response
+
+    def build(pillars, ai_result):
+        if pillars["astro_data"].get("sun_sign") == "Cancer":  # Alan
+            raise ValueError("broken chart")
+        return real_build(pillars, ai_result)
+
+    monkeypatch.setattr(batch_luck_service, "_build_response", build)
+    rows = _batch(client, USERS)
+    assert [row["uid"] for row in rows] == ["ada", "alan", "grace"]
+    assert rows[1] == {"index": 1, "uid": "alan", "error": "broken chart"}
+    assert "result" in rows[0] and "result" in rows[2]
+
+
+def test_dated_requests_are_scored_and_filed_for_their_day(client, weather_calls, tmp_path, monkeypatch):
+    from datetime import timedelta
+
+    from app.routes import luck
+    from app.services.luck_history_service import LuckHistoryService
+    from app.services.numerology_service import numerology_service
+
+    store = LuckHistoryService(tmp_path / "luck_history.db")
+    monkeypatch.setattr(luck, "luck_history_service", store)
+    day = (date.today() + timedelta(days=3)).isoformat()
+    ada = {**USERS[0], "date": day}
+
+    single = client.post("/api/luck/calculate", json=ada).json()
+    rows = _batch(client, [ada])
+    expected = numerology_service.calculate_daily_score(ada["dob"], ada["name"], day)["numerology_score"]
+    assert single["components"]["base_numerology"] == rows[0]["result"]["components"]["base_numerology"] == expected
+
+    store.flush()
+    assert [(row["date"], row["source"]) for row in store.history("ada", days=1)] == [(day, "batch")]  # Latest of that day
+    store.close()
@@ -0,0 +1,140 @@
+"""
+Append-only check-in log: write-behind appends, replay, resume and damage.
+
+    pytest test_checkin_service.py
+"""
+import errno
+import os
+from datetime import datetime
+
+import msgpack
+import pytest
+
+from app.models.schemas import DailyCheckIn
+from app.services import checkin_service as checkin_module
+from app.services.checkin_service import COLUMNS, CheckInService
+
+
+@pytest.fixture
+def log(tmp_path):
+    service = CheckInService(tmp_path / "checkins")
+    yield service
+    service.close()
+
+
+def _submit(service, uid, day="2026-03-02", mood=5):
+    checkin = DailyCheckIn(uid=uid, date=day, mood_score=mood, energy_level="medium", mood_tags=["calm"])
+    assert service.submit(checkin, 0.25, datetime(2026, 3, 2, 8, 30))
+
+
+def _uids(batches):
+    return [uid for batch in batches for uid in batch["uid"]]
+
+
+def test_round_trip(log):
+    for i in range(3):
+        _submit(log, f"u{i}", mood=i + 1)
+    assert log.flush() == 3
+
+    (batch,) = list(log.read_batches())
+    assert set(batch) == set(COLUMNS)
+    assert batch["uid"] == ["u0", "u1", "u2"]
+    assert batch["mood_score"] == [1, 2, 3]
+    assert batch["mood_tags"] == [["calm"]] * 3
+    assert batch["journal_sentiment"] == [0.25] * 3
+    assert batch["saved_at"] == [datetime(2026, 3, 2, 8, 30).timestamp()] * 3
+
+
+def test_offsets_resume(log):
+    offsets = {}
+    _submit(log, "a")
+    log.flush()
+    assert _uids(log.read_batches(offsets)) == ["a"]
+
+    _submit(log, "b")
+    _submit(log, "c")
+    log.flush()
+    _submit(log, "d")
+    log.flush()
+    assert _uids(log.read_batches(offsets)) == ["b", "c", "d"]
+    assert list(log.read_batches(offsets)) == []
+    assert offsets == {log.path.name: log.path.stat().st_size}
+    assert _uids(log.read_batches()) == ["a", "b", "c", "d"]  # Fresh offsets replay everything
+
+
+def test_skip_own_reads_other_workers_only(log):
+    other = CheckInService(log.log_dir)
+    _submit(log, "mine")
+    _submit(other, "theirs")
+    log.flush()
+    other.flush()
+    assert _uids(log.read_batches(skip_own=True)) == ["theirs"]
+    assert sorted(_uids(log.read_batches())) == ["mine", "theirs"]
+    other.close()
+
+
+def test_torn_tail_is_skipped_until_complete(log):
+    log.log_dir.mkdir(parents=True)
+    path = log.log_dir / "1-999.msgpack"
+    first = msgpack.packb({"uid": ["x"], "mood_score": [4]})
+    second = msgpack.packb({"uid": ["y"], "mood_score": [6]})
+    path.write_bytes(first + second[:7])  # Crashed mid-write
+
+    offsets = {}
+    assert _uids(log.read_batches(offsets)) == ["x"]
+    assert offsets[path.name] == len(first)
+    with open(path, "ab") as f:  # The rest shows up (a writer still appending)
+        f.write(second[7:])
+    assert _uids(log.read_batches(offsets)) == ["y"]
+
+
+def test_damaged_tail_is_skipped(log):
+    log.log_dir.mkdir(parents=True)
+    path = log.log_dir / "1-999.msgpack"
+    path.write_bytes(msgpack.packb({"uid": ["x"]}) + b"\xc1\xc1\xc1")  # 0xc1 is never valid msgpack
+    assert _uids(log.read_batches()) == ["x"]
+
+
+def test_failed_append_is_rolled_back_and_retried(log, monkeypatch):
+    _submit(log, "a")
+    log.flush()
+    size = log.path.stat().st_size
+
+    def fsync_fails(fd):
+        raise OSError(errno.EIO, "I/O error")
+
+    real_fsync = os.fsync
+    monkeypatch.setattr(checkin_module.os, "fsync", fsync_fails)
+    _submit(log, "b")
+    assert log.flush() == 0
+    assert log.path.stat().st_size == size  # Partial batch truncated away
+    assert len(log.queue) == 1  # Kept for the retry
+
+    monkeypatch.setattr(checkin_module.os, "fsync", real_fsync)
+    assert log.flush() == 1
+    assert _uids(log.read_batches()) == ["a", "b"]
+
+
+def test_torn_append_moves_to_a_new_file(log, monkeypatch):
+    _submit(log, "a")
+    log.flush()
+    first_file = log.path
+    real_write = os.write
+
+    def disk_full(fd, data):
+        real_write(fd, bytes(data[:5]))
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    def truncate_fails(fd, length):
+        raise OSError(errno.EIO, "I/O error")
+
+    monkeypatch.setattr(checkin_module.os, "write", disk_full)
+    monkeypatch.setattr(checkin_module.os, "ftruncate", truncate_fails)
+    _submit(log, "b")
+    assert log.flush() == 0
+
+    monkeypatch.undo()
+    assert log.flush() == 1
+    assert log.path != first_file
+    assert _uids(log.read_batches()) == ["a", "b"]  # The torn record is skipped, nothing doubled
+    assert list(log.read_batches(skip_own=True)) == []  # Both files are this worker's
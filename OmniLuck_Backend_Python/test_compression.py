@@ -0,0 +1,146 @@
+"""
+Response compression: Accept-Encoding negotiation, the size threshold,
+streaming and opted-out routes.
+
+    pytest test_compression.py
+"""
+import asyncio
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app import compression
+from app.compression import CompressionMiddleware, negotiate, no_compression
+
+BIG = "lucky numbers " * 200  # 2800 bytes
+SMALL = "lucky"
+
+
+@pytest.fixture(autouse=True)
+def gzip_only(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)  # Same result whether or not brotli is installed
+
+
+@pytest.mark.parametrize("header, coding", [
+    ("gzip", "gzip"),
+    ("GZIP, deflate", "gzip"),
+    ("gzip;q=0.5, identity", "gzip"),
+    ("gzip; q=0", None),
+    ("gzip;q=0.0, *", None),     # An explicit entry beats the wildcard
+    ("*", "gzip"),
+    ("*;q=0", None),
+    ("deflate, br", None),       # Nothing we can produce
+    ("identity;q=0", None),      # Refuses identity but accepts nothing else either
+    ("identity;q=0, *;q=0.1", "gzip"),
+    ("gzip;q=bogus", None),
+    ("", None),
+])
+def test_negotiate(header, coding):
+    assert negotiate(header) == coding
+
+
+def test_negotiate_prefers_brotli_when_installed(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", object())
+    assert negotiate("gzip, br") == "br"
+    assert negotiate("gzip, br;q=0") == "gzip"
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1000)
+
+    @app.get("/big")
+    def big():
+        return PlainTextResponse(BIG)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse(SMALL)
+
+    @app.get("/image")
+    def image():
+        return Response(BIG.encode(), media_type="image/png")
+
+    async def chunks():
+        for i in range(3):
+            yield f"{i}:{BIG[:100]}\n"
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    @app.get("/live")
+    @no_compression
+    async def live():
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    return app
+
+
+def _get(path, accept_encoding="gzip"):
+    """Raw ASGI response for one request: each body chunk exactly as sent."""
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # Client stays connected
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http", "path": path,
+        "raw_path": path.encode(), "root_path": "", "query_string": b"", "server": ("test", 80),
+        "client": ("test", 1), "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    asyncio.run(_app()(scope, receive, send))
+    headers = {k.decode(): v.decode() for k, v in messages[0]["headers"]}
+    bodies = [m["body"] for m in messages[1:] if m["type"] == "http.response.body"]
+    return headers, bodies
+
+
+def test_large_body_is_gzipped_with_vary():
+    response = TestClient(_app()).get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert int(response.headers["content-length"]) < len(BIG)
+    assert response.text == BIG  # Decoded by the client
+
+
+@pytest.mark.parametrize("path, accept_encoding", [
+    ("/small", "gzip"),           # Below minimum_size
+    ("/big", "identity"),         # Client doesn't accept gzip
+    ("/big", "gzip;q=0"),
+    ("/image", "gzip"),           # Already-compressed media type
+])
+def test_sent_as_is(path, accept_encoding):
+    response = TestClient(_app()).get(path, headers={"Accept-Encoding": accept_encoding})
+    assert "content-encoding" not in response.headers
+    assert response.text == (SMALL if path == "/small" else BIG)
+
+
+def test_stream_is_compressed_chunk_by_chunk():
+    headers, bodies = _get("/stream")
+    assert headers["content-encoding"] == "gzip" and "content-length" not in headers
+    assert "accept-encoding" in headers["vary"].lower()
+    decoder = zlib.decompressobj(31)
+    for i, body in enumerate(bodies[:3]):
+        # Each chunk decodes on arrival (sync flush), without waiting for the end
+        assert decoder.decompress(body).decode() == f"{i}:{BIG[:100]}\n"
+    assert decoder.decompress(b"".join(bodies[3:])) == b"" and decoder.eof
+
+
+def test_no_compression_route_streams_plain():
+    headers, bodies = _get("/live")
+    assert "content-encoding" not in headers
+    assert b"".join(bodies).decode() == "".join(f"{i}:{BIG[:100]}\n" for i in range(3))
+
+
+def test_batch_route_is_not_compressed():
+    from app.routes.luck import calculate_luck_batch
+    assert calculate_luck_batch.no_compression
@@ -0,0 +1,89 @@
+"""
+Co-occurrence index: counts over current-matrix draws, incremental updates
+and companion rankings.
+
+    pytest test_cooccurrence_service.py
+"""
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from conftest import synthetic_records
+
+
+@pytest.fixture
+def index(mixed_era_store):
+    from app.services.cooccurrence_service import CooccurrenceService
+    return CooccurrenceService()
+
+
+def _brute_force(store):
+    white = np.asarray(store.white_balls)[store.current_era_start():].tolist()
+    pairs, triples = Counter(), Counter()
+    for row in white:
+        pairs.update(combinations(row, 2))
+        triples.update(combinations(row, 3))
+    return len(white), pairs, triples
+
+
+def _assert_counts(index, store):
+    draws, pairs, triples = _brute_force(store)
+    expected = np.zeros_like(index.pairs)
+    for (a, b), count in pairs.items():
+        expected[a, b] = expected[b, a] = count
+    assert np.array_equal(index.pairs, expected)
+    flattened = Counter()
+    for (a, b), bucket in index.triples.items():
+        for c, count in bucket.items():
+            flattened[tuple(sorted((a, b, c)))] += count
+    assert flattened == Counter({triple: 3 * count for triple, count in triples.items()})  # Keyed by each pair
+    return draws
+
+
+def test_counts_current_matrix_draws_only(index, mixed_era_store):
+    base = mixed_era_store.current_era_start()
+    assert 0 < base < len(mixed_era_store)
+    assert index.update() == len(mixed_era_store) - base
+    _assert_counts(index, mixed_era_store)
+    assert index.update() == 0
+
+
+def test_incremental_update_equals_rebuild(index, mixed_era_store):
+    from app.services.cooccurrence_service import CooccurrenceService
+
+    index.update()
+    added = mixed_era_store.append(synthetic_records(start="2018-01-03", end="2018-06-30", seed=2))
+    assert index.update() == added
+    _assert_counts(index, mixed_era_store)
+    rebuilt = CooccurrenceService()
+    rebuilt.update()
+    assert np.array_equal(index.pairs, rebuilt.pairs) and index.triples == rebuilt.triples
+    assert np.array_equal(index._ranking, rebuilt._ranking)
+
+    # A back-filled draw inside the counted range (a Monday - synthetic draws are Wed/Sat) forces a rebuild
+    assert mixed_era_store.append([{"draw_date": "2016-01-04T00:00:00.000", "winning_numbers": "60 61 62 63 64 01"}]) == 1
+    assert index.update() == len(mixed_era_store) - mixed_era_store.current_era_start()
+    _assert_counts(index, mixed_era_store)
+
+def test_top_companions_ordering_and_ties(index, mixed_era_store):
+    _, pairs, triples = _brute_force(mixed_era_store)
+    companions = {ball: Counter() for ball in range(1, 70)}
+    for (a, b), count in pairs.items():
+        companions[a][b] += count
+        companions[b][a] += count
+    for ball in (1, 7, 60, 69):
+        expected = sorted(((-count, c) for c, count in companions[ball].items()))
+        expected += [(0, c) for c in range(1, 70) if c != ball and c not in companions[ball]]
+        top = index.top_companions(ball, k=68)
+        assert [(-row["count"], row["ball"]) for row in top] == sorted(expected)  # Ties: lower ball first
+        assert index.top_companions(ball, k=5) == top[:5]
+
+    third = Counter()
+    for (a, b, c), count in triples.items():
+        if {a, b} >= {7, 23} or {a, c} >= {7, 23} or {b, c} >= {7, 23}:
+            third[({a, b, c} - {7, 23}).pop()] += count
+    top = index.top_companions(23, k=10, with_ball=7)
+    assert top == [{"ball": c, "count": n} for c, n in sorted(third.items(), key=lambda item: (-item[1], item[0]))[:10]]
+    assert index.top_companions(7, k=10, with_ball=23) == top
@@ -0,0 +1,109 @@
+"""
+Draw store ingestion: dedup by date, out-of-order back-fills, reloads after
+another worker's save, and the incremental API sync on top of it.
+
+    pytest test_draw_store.py
+"""
+import asyncio
+import os
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+
+from app.services import lottery_stats_service as lottery_module
+from app.services.draw_store import DrawStore, date_to_day, day_to_date
+from app.services.metrics_service import metrics_service
+
+
+def _record(day, numbers, multiplier="2"):
+    return {"draw_date": f"{day}T00:00:00.000", "winning_numbers": numbers, "multiplier": multiplier}
+
+
+def _dates(store):
+    return [day_to_date(d) for d in store.dates]
+
+
+def test_append_dedups_by_date(tmp_path):
+    store = DrawStore(tmp_path)
+    assert store.append([
+        _record("2024-01-03", "05 04 03 02 01 20"),
+        _record("2024-01-06", "10 20 30 40 50 09"),
+        _record("2024-01-06", "11 21 31 41 51 10"),  # Same drawing twice in one batch: first wins
+        {"draw_date": "2024-01-08T00:00:00.000", "winning_numbers": "1 2 3"},  # Malformed
+    ]) == 2
+    version = store.version
+
+    assert store.append([_record("2024-01-03", "06 07 08 09 10 11")]) == 0  # Already stored
+    assert store.version == version
+    assert _dates(store) == ["2024-01-03", "2024-01-06"]
+    assert store.balls.tolist() == [[1, 2, 3, 4, 5, 20], [10, 20, 30, 40, 50, 9]]  # White balls sorted
+
+
+def test_backfill_is_sorted_in(tmp_path):
+    store = DrawStore(tmp_path)
+    store.append([_record("2024-01-10", "01 02 03 04 05 06", "3"), _record("2024-01-03", "11 12 13 14 15 16", "")])
+    assert store.append([_record("2024-01-06", "21 22 23 24 25 26", "5"), _record("2024-01-13", "31 32 33 34 35 07")]) == 2
+
+    assert _dates(store) == ["2024-01-03", "2024-01-06", "2024-01-10", "2024-01-13"]
+    assert store.powerballs.tolist() == [16, 26, 6, 7]  # Columns moved together
+    assert store.multipliers.tolist() == [0, 5, 3, 2]
+    assert store.latest_date == "2024-01-13"
+    assert store.recent(1)[0] == {"date": "2024-01-13", "white_balls": [31, 32, 33, 34, 35], "powerball": 7, "multiplier": "2"}
+
+    reopened = DrawStore(tmp_path)
+    assert len(reopened) == 4
+    assert np.array_equal(reopened.dates, store.dates) and np.array_equal(reopened.balls, store.balls)
+
+
+def test_reload_picks_up_another_workers_save(tmp_path):
+    writer, reader = DrawStore(tmp_path), DrawStore(tmp_path)
+    writer.append([_record("2024-01-03", "01 02 03 04 05 06")])
+    assert len(reader) == 1
+    assert reader.reload() is False  # Nothing new
+    assert writer.reload() is False  # Its own save doesn't count
+
+    version = reader.version
+    first_save = (tmp_path / "dates.npy").stat().st_mtime_ns
+    writer.append([_record("2024-01-06", "01 02 03 04 05 07")])
+    os.utime(tmp_path / "dates.npy", ns=(first_save, first_save))  # Both saves within one timestamp tick
+    assert reader.reload() is True
+    assert reader.latest_date == "2024-01-06" and reader.version > version
+    assert reader.reload() is False
+
+
+def test_reload_without_files(tmp_path):
+    assert DrawStore(tmp_path / "missing").reload() is False
+
+
+def test_sync_requests_only_newer_draws(mixed_era_store, monkeypatch):
+    latest = mixed_era_store.latest_date
+    requests = []
+    updates = []
+
+    def api(request):
+        requests.append(dict(request.url.params))
+        newer = [
+            _record("2018-01-06", "69 01 33 12 40 26"),
+            _record(latest, "01 02 03 04 05 06"),  # Boundary draw returned again
+            _record("2018-01-03", "10 20 30 40 50 01"),  # Out of order
+        ]
+        return httpx.Response(200, json=newer)
+
+    monkeypatch.setattr(metrics_service, "transport", lambda upstream=None: httpx.MockTransport(api))
+    for name in ("cooccurrence_service", "match_service"):
+        monkeypatch.setattr(lottery_module, name, SimpleNamespace(update=lambda name=name: updates.append(name)))
+    service = lottery_module.LotteryStatsService()
+
+    before = len(mixed_era_store)
+    assert asyncio.run(service.sync_draws()) == 2
+    assert requests[0]["$where"] == f"draw_date > '{latest}T00:00:00.000'"
+    assert len(mixed_era_store) == before + 2
+    assert _dates(mixed_era_store)[-3:] == [latest, "2018-01-03", "2018-01-06"]
+    assert mixed_era_store.balls[-1].tolist() == [1, 12, 33, 40, 69, 26]
+    assert updates == ["cooccurrence_service", "match_service"]
+
+    assert asyncio.run(service.sync_draws()) == 0  # Nothing new: indexes left alone
+    assert requests[1]["$where"] == "draw_date > '2018-01-06T00:00:00.000'"
+    assert updates == ["cooccurrence_service", "match_service"]
+    assert np.all(np.diff(mixed_era_store.dates) > 0) and mixed_era_store.dates[-1] == date_to_day("2018-01-06")
@@ -0,0 +1,128 @@
+"""
+Draw history: filters, cursor pagination and streamed exports.
+
+    pytest test_history_service.py
+"""
+import csv
+import io
+import json
+
+import numpy as np
+import pytest
+
+from app.services import history_service as history_module
+from app.services.draw_store import date_to_day, day_to_date
+
+
+@pytest.fixture
+def history(mixed_era_store):
+    return history_module.HistoryService()
+
+
+@pytest.fixture
+def client(mixed_era_store, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.services.lottery_stats_service import lottery_stats_service
+
+    async def fresh(force_refresh=False):
+        return False
+
+    monkeypatch.setattr(lottery_stats_service, "check_history_freshness", fresh)
+    return TestClient(app)
+
+
+def _dates(store, indices=None):
+    days = np.asarray(store.dates)
+    return [day_to_date(day) for day in (days if indices is None else days[indices])]
+
+
+def _walk(history, indices, limit, order):
+    pages, cursor = [], None
+    while True:
+        page = history.page(indices, limit=limit, cursor=cursor, order=order)
+        assert page["total"] == len(indices)
+        pages.append([row["date"] for row in page["drawings"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("order", ["desc", "asc"])
+@pytest.mark.parametrize("limit", [1, 7, 50, 2000])
+def test_pages_cover_every_draw_once(history, mixed_era_store, order, limit):
+    for filters in ({}, {"balls": [7]}, {"powerball": 3, "start_date": "2013-01-01"}):
+        indices = history.find(**filters)
+        expected = _dates(mixed_era_store, indices)
+        pages = _walk(history, indices, limit, order)
+        assert all(0 < len(page) <= limit for page in pages) or expected == []
+        assert [day for page in pages for day in page] == (expected[::-1] if order == "desc" else expected)
+
+
+def test_filters_match_a_scan(history, mixed_era_store):
+    balls = np.asarray(mixed_era_store.balls)
+    dates = _dates(mixed_era_store)
+    indices = history.find("2012-01-04", "2015-10-10", balls=[7, 23], powerball=None)
+    expected = [i for i, (day, row) in enumerate(zip(dates, balls)) if "2012-01-04" <= day <= "2015-10-10" and {7, 23} <= set(row[:5])]
+    assert indices.tolist() == expected
+    pb = history.find(powerball=30)
+    assert pb.tolist() == [i for i, row in enumerate(balls) if row[5] == 30]
+
+
+def test_date_range_is_inclusive_and_cursor_exclusive(history, mixed_era_store):
+    dates = _dates(mixed_era_store)
+    first, last = dates[100], dates[110]
+    assert _dates(mixed_era_store, history.find(first, last)) == dates[100:111]  # Both ends included
+
+    everything = history.find()
+    newer = history.page(everything, limit=5, cursor=first, order="asc")["drawings"]
+    older = history.page(everything, limit=5, cursor=first, order="desc")["drawings"]
+    assert [row["date"] for row in newer] == dates[101:106]  # The cursor draw itself is not repeated
+    assert [row["date"] for row in older] == dates[95:100][::-1]
+
+    between = day_to_date(date_to_day(first) + 1)  # Not a draw day
+    assert between not in dates
+    assert history.page(everything, limit=1, cursor=between, order="asc")["drawings"][0]["date"] == dates[101]
+    assert history.page(everything, limit=1, cursor=between, order="desc")["drawings"][0]["date"] == dates[100]
+
+
+def test_page_size_is_capped(client):
+    max_size = history_module.MAX_PAGE_SIZE
+    response = client.get("/api/luck/lottery/history", params={"limit": max_size, "order": "asc"})
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["drawings"]) == max_size and body["next_cursor"] == body["drawings"][-1]["date"]
+    for limit in (0, max_size + 1):
+        assert client.get("/api/luck/lottery/history", params={"limit": limit}).status_code == 400
+
+
+@pytest.mark.parametrize("order", ["desc", "asc"])
+def test_export_streams_in_chunks(history, mixed_era_store, monkeypatch, order):
+    monkeypatch.setattr(history_module, "EXPORT_CHUNK", 100)
+    indices = history.find()
+    rows = history.rows(indices[::-1] if order == "desc" else indices)
+
+    chunks = list(history.export(indices, fmt="ndjson", order=order))
+    assert len(chunks) == -(-len(indices) // 100)
+    assert [json.loads(line) for chunk in chunks for line in chunk.splitlines()] == rows
+
+    chunks = list(history.export(indices, fmt="csv", order=order))
+    assert len(chunks) == 1 + -(-len(indices) // 100)  # Header first
+    records = list(csv.reader(io.StringIO("".join(chunks))))
+    assert records[0] == ["date", "ball_1", "ball_2", "ball_3", "ball_4", "ball_5", "powerball", "multiplier"]
+    assert records[1:] == [
+        [r["date"], *map(str, r["white_balls"]), str(r["powerball"]), r["multiplier"] or ""] for r in rows
+    ]
+
+
+def test_export_route(client, history, mixed_era_store):
+    params = {"format": "ndjson", "balls": "7", "order": "asc"}
+    response = client.get("/api/luck/lottery/history", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in response.text.splitlines()] == history.rows(history.find(balls=[7]))
+
+    response = client.get("/api/luck/lottery/history", params={"format": "csv"})
+    assert response.headers["content-type"].startswith("text/csv")
+    assert len(response.text.splitlines()) == 1 + len(mixed_era_store)
@@ -0,0 +1,73 @@
+"""
+Cold-start regression test: `import app.main` must stay cheap.
+
+Provider SDKs, numpy, the ephemeris and the like are loaded on first use, so
+importing the app should only cost FastAPI, pydantic, httpx and our own
+modules. Each check runs in a fresh interpreter.
+
+    python test_import_time.py        (or: pytest test_import_time.py)
+
+Use scripts/importtime_report.py to see where the time goes.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# Best of IMPORT_RUNS fresh `import app.main`s must stay under this
+IMPORT_BUDGET_SECONDS = 1.0
+IMPORT_RUNS = 3
+
+# Heavy dependencies that must only be imported on first use
+LAZY_MODULES = (
+    "google.genai",
+    "groq",
+    "requests",
+    "numpy",
+    "swisseph",
+    "timezonefinder",
+    "filelock",
+)
+
+
+def _run(code: str) -> str:
+    env = dict(os.environ, LOG_LEVEL="OFF", LOTTERY_REFRESHER_ENABLED="false", PYTHONPATH=str(ROOT))
+    proc = subprocess.run([sys.executable, "-c", code], env=env, cwd=ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.strip()
+
+
+def test_lazy_modules_not_imported():
+    """Heavy dependencies stay out of the startup import graph"""
+    loaded = _run(
+        "import sys, app.main\n"
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    assert not loaded, f"imported at startup: {loaded} (import them where they are used)"
+
+
+def _best_import_seconds() -> float:
+    return min(
+        float(_run("import time\nstart = time.perf_counter()\nimport app.main\nprint(time.perf_counter() - start)"))
+        for _ in range(IMPORT_RUNS)
+    )
+
+
+def test_import_time_budget():
+    """`import app.main` stays under IMPORT_BUDGET_SECONDS"""
+    best = _best_import_seconds()
+    assert best < IMPORT_BUDGET_SECONDS, (
+        f"import app.main took {best:.2f}s (budget {IMPORT_BUDGET_SECONDS}s); "
+        "see scripts/importtime_report.py"
+    )
+
+
+if __name__ == "__main__":
+    print("🧊 Testing cold-start imports...")
+    test_lazy_modules_not_imported()
+    print(f"   ✓ Not imported at startup: {', '.join(LAZY_MODULES)}")
+    best = _best_import_seconds()
+    assert best < IMPORT_BUDGET_SECONDS, f"import app.main took {best:.2f}s (budget {IMPORT_BUDGET_SECONDS}s)"
+    print(f"   ✓ import app.main: {best:.2f}s (budget {IMPORT_BUDGET_SECONDS}s)")
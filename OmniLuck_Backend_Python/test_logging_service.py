@@ -0,0 +1,56 @@
+"""
+Logging service lifecycle: queued writes, shutdown and reconfiguration.
+
+    pytest test_logging_service.py
+"""
+import io
+import logging
+
+import pytest
+
+from app.config import settings
+from app.services.logging_service import ROOT_LOGGER, LoggingService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "LOG_LEVEL", "INFO")
+    monkeypatch.setattr(settings, "LOG_FORMAT", "text")
+    root = logging.getLogger(ROOT_LOGGER)
+    level, handlers = root.level, list(root.handlers)
+    service = LoggingService()
+    yield service
+    service.shutdown()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def _lines(stream):
+    return [line.split(": ", 1)[1] for line in stream.getvalue().splitlines()]
+
+
+def test_records_after_shutdown_are_written(service):
+    logger = logging.getLogger(f"{ROOT_LOGGER}.test")
+    stream = io.StringIO()
+    service.configure(stream)
+    logger.info("queued")
+    service.shutdown()
+    assert _lines(stream) == ["queued"]
+
+    logger.info("after shutdown")  # e.g. the lifespan's last flush messages
+    assert _lines(stream) == ["queued", "after shutdown"]
+    assert service._listener is None
+    assert sum(handler is service._handler for handler in logging.getLogger(ROOT_LOGGER).handlers) == 1
+
+
+def test_configure_after_shutdown_restarts_the_queue(service):
+    logger = logging.getLogger(f"{ROOT_LOGGER}.test")
+    first, second = io.StringIO(), io.StringIO()
+    service.configure(first)
+    service.shutdown()
+    service.configure(second)
+    assert service._listener is not None
+    logger.info("requeued")
+    service.shutdown()
+    assert _lines(first) == [] and _lines(second) == ["requeued"]
+    service.shutdown()  # Already stopped - no-op
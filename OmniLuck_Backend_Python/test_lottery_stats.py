@@ -0,0 +1,213 @@
+"""
+Hot/cold statistics over a draw store that spans several Powerball matrices.
+
+    pytest test_lottery_stats.py
+"""
+import asyncio
+from collections import Counter
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from filelock import FileLock
+
+from app.services import lottery_stats_service as lottery_module
+from app.services.draw_store import CURRENT_ERA, MATRIX_ERAS, date_to_day
+
+
+@pytest.fixture
+def stats(mixed_era_store):
+    from app.services.lottery_stats_service import LotteryStatsService
+    return LotteryStatsService()
+
+
+def _current_draws(store):
+    keep = np.asarray(store.dates) >= date_to_day(CURRENT_ERA.start)
+    return np.asarray(store.balls)[keep]
+
+
+def test_store_spans_old_matrices(mixed_era_store):
+    """The fixture really contains Powerballs the current matrix cannot hold"""
+    assert int(np.asarray(mixed_era_store.powerballs).max()) > CURRENT_ERA.powerball_max
+    assert set(mixed_era_store.era_ids().tolist()) == set(range(len(MATRIX_ERAS)))
+
+
+@pytest.mark.parametrize("window", [10, 100, 500, None])
+def test_frequency_uses_current_matrix_draws_only(stats, mixed_era_store, window):
+    result = stats.calculate_frequency(window=window)
+    draws = _current_draws(mixed_era_store)
+    expected = draws if window is None else draws[-window:]
+
+    assert result["matrix"] == CURRENT_ERA.name
+    assert result["total_draws_analyzed"] == len(expected)
+    assert result["white_frequency"] == {
+        ball: Counter(expected[:, :5].ravel().tolist()).get(ball, 0) for ball in range(1, 70)
+    }
+    assert result["powerball_frequency"] == {
+        ball: Counter(expected[:, 5].tolist()).get(ball, 0) for ball in range(1, 27)
+    }
+    assert all(1 <= ball <= CURRENT_ERA.powerball_max for ball in result["hot_powerballs"] + result["cold_powerballs"])
+
+
+def test_window_larger_than_current_era_is_clamped(stats, mixed_era_store):
+    current = len(_current_draws(mixed_era_store))
+    result = stats.calculate_frequency(window=len(mixed_era_store))
+    assert result["total_draws_analyzed"] == current < len(mixed_era_store)
+
+
+def test_last_seen_gaps(stats, mixed_era_store):
+    draws = _current_draws(mixed_era_store)
+    gaps = stats.calculate_frequency(window=50)["last_seen"]["powerball"]
+    for ball, gap in gaps.items():
+        seen = np.nonzero(draws[-50:, 5] == ball)[0]
+        assert gap == (None if not len(seen) else 49 - int(seen[-1]))
+
+
+def test_background_refresh_backs_off_while_failing(stats, monkeypatch):
+    import asyncio
+    from datetime import datetime
+
+    from app.services import lottery_stats_service as module
+
+    attempts = []
+
+    async def failing_refresh():
+        attempts.append(1)
+
+    async def succeeding_refresh():
+        attempts.append(1)
+        monkeypatch.setattr(module, "_last_draw_sync", datetime.now())
+
+    async def stale_requests(count):
+        for _ in range(count):
+            stats.refresh_in_background()
+            await stats._refresh_task
+
+    monkeypatch.setattr(module, "_last_draw_sync", None)
+    monkeypatch.setattr(stats, "refresh", failing_refresh)
+    asyncio.run(stale_requests(5))
+    assert len(attempts) == 1  # Later requests fall inside the backoff
+    assert stats._background_refresh_delay == 2 * module.RETRY_INITIAL_DELAY
+
+    stats._next_background_refresh = 0.0  # Backoff elapsed
+    asyncio.run(stale_requests(3))
+    assert len(attempts) == 2
+    assert stats._background_refresh_delay == 4 * module.RETRY_INITIAL_DELAY
+
+    stats._next_background_refresh = 0.0
+    monkeypatch.setattr(stats, "refresh", succeeding_refresh)
+    asyncio.run(stale_requests(1))
+    assert len(attempts) == 3
+    assert stats._background_refresh_delay == module.RETRY_INITIAL_DELAY
+    assert stats._next_background_refresh == 0.0
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch, mixed_era_store):
+    """Module cache state and files in tmp_path; index updates stubbed out."""
+    monkeypatch.setattr(lottery_module, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(lottery_module, "CACHE_FILE", tmp_path / "lottery_cache.msgpack")
+    monkeypatch.setattr(lottery_module, "LEGACY_CACHE_FILE", tmp_path / "lottery_cache.json")
+    monkeypatch.setattr(lottery_module, "LOCK_FILE", tmp_path / "lottery_cache.lock")
+    monkeypatch.setattr(lottery_module, "_file_lock", FileLock(str(tmp_path / "lottery_cache.lock")))
+    monkeypatch.setattr(lottery_module, "_refresh_lock", asyncio.Lock())
+    monkeypatch.setattr(lottery_module, "_memory_cache", dict.fromkeys(lottery_module._memory_cache))
+    monkeypatch.setattr(lottery_module, "_last_draw_sync", None)
+    monkeypatch.setattr(lottery_module, "_stats_version", 0)
+    monkeypatch.setattr(lottery_module, "_stats_snapshot", None)
+    for name in ("cooccurrence_service", "match_service"):
+        monkeypatch.setattr(lottery_module, name, SimpleNamespace(update=lambda: None))
+    return lottery_module
+
+
+@pytest.fixture
+def syncs(cache, stats, monkeypatch):
+    """Replace the API sync with a slow fake; returns its call log."""
+    calls = []
+
+    async def fake_sync_draws():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        monkeypatch.setattr(cache, "_last_draw_sync", datetime.now())
+        return 0
+
+    monkeypatch.setattr(stats, "sync_draws", fake_sync_draws)
+    return calls
+
+
+def _publish(cache, hot):
+    """What another worker leaves behind after its refresh."""
+    cache._save_cache_to_file({
+        "hot_numbers": hot, "cold_numbers": [1, 2], "hot_powerballs": [3], "cold_powerballs": [4],
+        "last_updated": datetime.now(),
+    })
+
+
+def test_concurrent_refreshes_sync_once(cache, stats, syncs):
+    async def stampede():
+        return await asyncio.gather(*(stats.refresh() for _ in range(8)))
+
+    assert sorted(asyncio.run(stampede())) == [False] * 7 + [True]
+    assert len(syncs) == 1
+    assert cache.CACHE_FILE.exists()
+    assert cache._memory_cache["hot_numbers"] == stats.calculate_frequency(window=100)["hot_numbers"]
+
+    assert asyncio.run(stats.refresh()) is False  # Still current
+    assert len(syncs) == 1
+
+
+def test_refresh_skips_what_another_worker_published(cache, stats, syncs):
+    other_worker = FileLock(str(cache.LOCK_FILE))
+    other_worker.acquire()
+
+    async def race():
+        task = asyncio.create_task(stats.refresh())
+        await asyncio.sleep(0.1)  # Our refresh is waiting on the file lock...
+        assert not task.done()
+        _publish(cache, [7, 8, 9])  # ...while the other worker finishes its own
+        other_worker.release()
+        return await task
+
+    assert asyncio.run(race()) is False
+    assert syncs == []
+    assert cache._memory_cache["hot_numbers"] == [7, 8, 9]
+    assert cache._last_draw_sync == cache._memory_cache["last_updated"]
+
+
+def test_refresh_gives_up_on_a_busy_lock(cache, stats, syncs, monkeypatch):
+    monkeypatch.setattr(cache, "REFRESH_LOCK_TIMEOUT", 0.3)
+    other_worker = FileLock(str(cache.LOCK_FILE))
+    other_worker.acquire()
+    try:
+        assert asyncio.run(stats.refresh()) is False
+    finally:
+        other_worker.release()
+    assert syncs == []
+
+
+def test_snapshot_is_rebuilt_only_when_the_numbers_change(cache, stats):
+    _publish(cache, [7, 8, 9])
+    cache._load_cache_from_file()
+    snapshot = cache.get_stats_snapshot()
+    assert snapshot.hot_numbers == (7, 8, 9) and snapshot.cold_set == {1, 2}
+
+    # Reloading the same file, or recomputing the same stats, keeps the snapshot
+    cache._load_cache_from_file()
+    stats._swap_stats({"hot_numbers": [7, 8, 9], "cold_numbers": [1, 2], "hot_powerballs": [3], "cold_powerballs": [4]})
+    assert cache.get_stats_snapshot() is snapshot
+
+    # A newer publication does not
+    _publish(cache, [10, 11, 12])
+    cache._load_cache_from_file()
+    updated = cache.get_stats_snapshot()
+    assert updated.version > snapshot.version and updated.hot_numbers == (10, 11, 12)
+
+    fresh = stats.calculate_frequency(window=100)
+    stats._swap_stats(fresh)
+    assert cache.get_stats_snapshot().hot_numbers == tuple(fresh["hot_numbers"])
+
+
+def test_snapshot_nearest_hot():
+    snapshot = lottery_module.StatsSnapshot.build([10, 40, 41], [1], white_ball_max=69)
+    assert [snapshot.nearest_hot[b] for b in (9, 10, 11, 12, 39, 42, 69)] == [10, 10, 10, 12, 40, 41, 69]
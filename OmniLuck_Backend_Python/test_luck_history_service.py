@@ -0,0 +1,64 @@
+"""
+Luck history store: the day a score is filed under, and /history reads
+off the event loop.
+
+    pytest test_luck_history_service.py
+"""
+import asyncio
+from datetime import date, timedelta
+
+from app.services.luck_history_service import LuckHistoryService
+
+
+def _score(total: int) -> dict:
+    components = {"base_numerology": 50, "astrology_score": 50, "natal_potential": 50,
+                  "cosmic_weather": 50, "personal_trend": 0, "total": total}
+    return {"luck_score": total, "components": components, "caption": f"Score {total}"}
+
+
+def test_scores_are_filed_under_their_day(tmp_path):
+    store = LuckHistoryService(tmp_path / "luck_history.db")
+    today = date.today()
+    tomorrow, last_week = (today + timedelta(days=1)).isoformat(), (today - timedelta(days=6)).isoformat()
+    store.record("u1", _score(61), day=tomorrow)
+    store.record("u1", _score(62), day=last_week)
+    store.record("u1", _score(63))
+    store.record("u1", _score(64), day="not a date")  # Same as no date: today
+    store.record("u1", _score(65), day=today.strftime("%Y%m%d"))  # Normalized
+    store.flush()
+
+    history = store.history("u1", days=7)
+    assert [(row["date"], row["score"]) for row in history] == [
+        (tomorrow, 61), (today.isoformat(), 65), (last_week, 62),
+    ]
+    store.close()
+
+
+def test_history_route_reads_off_the_event_loop(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.routes import luck
+
+    store = LuckHistoryService(tmp_path / "luck_history.db")
+    store.record("u1", _score(70))
+    store.flush()
+    monkeypatch.setattr(luck, "luck_history_service", store)
+
+    on_loop = []
+    real_history = store.history
+
+    def history(uid, days):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:  # Executor thread
+            on_loop.append(False)
+        return real_history(uid, days)
+
+    monkeypatch.setattr(store, "history", history)
+    response = TestClient(app).get("/api/luck/history/u1?days=1")
+    assert response.status_code == 200
+    assert [row["score"] for row in response.json()["history"]] == [70]
+    assert on_loop == [False]
+    store.close()
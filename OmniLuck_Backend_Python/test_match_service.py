@@ -0,0 +1,170 @@
+"""
+Ticket-vs-history match index, checked against a brute-force scan of a draw
+store that spans several Powerball matrices.
+
+    pytest test_match_service.py
+"""
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from app.services.draw_store import MATRIX_ERAS, POWERBALL_MAX_EVER, day_to_date
+from conftest import synthetic_records
+
+
+@pytest.fixture
+def index(mixed_era_store):
+    from app.services import match_service
+    return match_service.match_service
+
+
+def _draws(store):
+    return [
+        (set(row[:5]), row[5], era, day_to_date(day))
+        for row, era, day in zip(np.asarray(store.balls).tolist(), store.era_ids().tolist(), store.dates.tolist())
+    ]
+
+
+def _brute_force(line, draws):
+    """Tier counts, fixed prizes and best result of one line, draw by draw."""
+    from app.services.match_service import CODE_TIER, ERA_PRIZES, NO_PRIZE, PRIZE_TIERS
+
+    tiers, by_matrix, total, best = Counter(), Counter(), 0, (NO_PRIZE, None)
+    for white, powerball, era, day in draws:
+        tier = CODE_TIER[2 * len(white & set(line["white_balls"])) + (powerball == line["powerball"])]
+        if tier == NO_PRIZE:
+            continue
+        tiers[PRIZE_TIERS[tier]["tier"]] += 1
+        by_matrix[MATRIX_ERAS[era].name] += 1
+        total += ERA_PRIZES[MATRIX_ERAS[era].start][tier] or 0
+        if tier <= best[0]:
+            best = (tier, day)
+    return {
+        "tiers": dict(tiers),
+        "wins_by_matrix": dict(by_matrix),
+        "fixed_prize_total": total,
+        "best_tier": PRIZE_TIERS[best[0]]["tier"] if best[1] else None,
+        "best_date": best[1],
+    }
+
+
+def _random_lines(rng, count):
+    return [
+        {"white_balls": rng.sample(range(1, 70), 5), "powerball": rng.randint(1, POWERBALL_MAX_EVER)}
+        for _ in range(count)
+    ]
+
+
+def test_check_lines_matches_brute_force(index, mixed_era_store):
+    rng = random.Random(7)
+    draws = _draws(mixed_era_store)
+    # Random picks plus lines copied from old- and current-matrix draws (big wins)
+    lines = _random_lines(rng, 60)
+    for i in (0, 5, len(draws) // 2, len(draws) - 1):
+        white, powerball = sorted(draws[i][0]), draws[i][1]
+        lines.append({"white_balls": white, "powerball": powerball})
+        other = next(b for b in range(69, 0, -1) if b not in white)
+        lines.append({"white_balls": white[:4] + [other], "powerball": powerball})
+
+    result = index.check_lines(lines)
+    assert result["draws_checked"] == len(draws)
+    assert sum(m["draws"] for m in result["matrices"]) == len(draws)
+    for line, got in zip(lines, result["results"]):
+        expected = _brute_force(line, draws)
+        assert {key: got[key] for key in expected} == expected, line
+
+
+def test_old_matrix_powerball_is_checkable(index, mixed_era_store):
+    draws = _draws(mixed_era_store)
+    white, powerball, _, day = next(d for d in draws if d[1] > 35)
+    got = index.check_lines([{"white_balls": sorted(white), "powerball": powerball}])["results"][0]
+    assert got["tiers"]["Jackpot"] >= 1
+    assert got["wins_by_matrix"].get(MATRIX_ERAS[0].name)
+    assert day in got["exact_white_hits"]
+
+
+def test_postings_match_brute_force(index, mixed_era_store):
+    balls = np.asarray(mixed_era_store.balls)
+    for ball in range(1, 70):
+        expected = np.nonzero((balls[:, :5] == ball).any(axis=1))[0]
+        assert np.array_equal(index.draws_with_ball(ball), expected)
+    for powerball in range(1, POWERBALL_MAX_EVER + 1):
+        assert np.array_equal(index.draws_with_powerball(powerball), np.nonzero(balls[:, 5] == powerball)[0])
+
+    rng = random.Random(3)
+    for size in (0, 1, 2, 3):
+        for _ in range(20):
+            chosen = rng.sample(range(1, 60), size)
+            expected = [i for i, row in enumerate(balls[:, :5].tolist()) if set(chosen) <= set(row)]
+            assert index.draws_with_balls(chosen).tolist() == expected
+
+
+def test_incremental_update_equals_rebuild(index, mixed_era_store):
+    from app.services.match_service import MatchService
+
+    lines = _random_lines(random.Random(11), 30)
+    index.check_lines(lines)  # Build the index, then ingest newer draws
+    added = mixed_era_store.append(synthetic_records(start="2018-01-03", end="2018-06-30", seed=2))
+    assert added and index.update() == added
+
+    incremental, rebuilt = index.check_lines(lines), MatchService().check_lines(lines)
+    assert incremental == rebuilt
+    assert incremental["draws_checked"] == len(mixed_era_store)
+
+
+@pytest.mark.parametrize("line, error", [
+    ({"white_balls": [1, 2, 3, 4, 5], "powerball": 39}, None),
+    ({"white_balls": [1, 2, 3, 4, 5], "powerball": 40}, "Powerball must be between 1 and 39"),
+    ({"white_balls": [1, 2, 3, 4, 70], "powerball": 1}, "White balls must be between 1 and 69"),
+    ({"white_balls": [1, 1, 3, 4, 5], "powerball": 1}, "Each line needs 5 distinct white balls"),
+])
+def test_validate_line(line, error):
+    from app.services.match_service import MatchService
+    assert MatchService.validate_line(line) == error
+
+
+def test_check_route(index, mixed_era_store):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    draws = _draws(mixed_era_store)
+    white, powerball, _, day = draws[-1]
+    lines = [{"white_balls": sorted(white), "powerball": powerball}] + _random_lines(random.Random(5), 99)
+    client = TestClient(app)
+    response = client.post("/api/luck/lottery/check", json={"lines": lines})
+    assert response.status_code == 200
+    body = response.json()
+    assert body == index.check_lines(lines)
+    assert body["results"][0]["best_tier"] == "Jackpot" and body["results"][0]["best_date"] == day
+
+    bad = {"lines": [{"white_balls": [1, 2, 3, 4, 5], "powerball": 40}]}
+    assert client.post("/api/luck/lottery/check", json=bad).status_code == 400
+
+
+def test_concurrent_updates_index_each_draw_once(index, mixed_era_store):
+    import threading
+
+    draws = _draws(mixed_era_store)
+    white, powerball, _, day = draws[-1]
+    index.update()
+    added = mixed_era_store.append(synthetic_records(start="2018-01-03", end="2018-03-31", seed=4))
+    new_white = sorted(np.asarray(mixed_era_store.white_balls)[-1].tolist())
+    barrier = threading.Barrier(8)
+    counts = []
+
+    def update():
+        barrier.wait()
+        counts.append(index.update())
+
+    threads = [threading.Thread(target=update) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(counts) == [0] * 7 + [added]
+    assert index.exact_hits(white) == [day]
+    assert index.exact_hits(new_white) == [mixed_era_store.latest_date]
+    assert index.check_lines([{"white_balls": new_white, "powerball": 1}])["draws_checked"] == len(mixed_era_store)
@@ -0,0 +1,101 @@
+"""
+Metrics: route labels and cross-worker snapshot files.
+
+    pytest test_metrics_service.py
+"""
+import os
+import subprocess
+import sys
+
+import msgpack
+
+from app.services import metrics_service as metrics_module
+from app.services.metrics_service import MetricsService
+
+
+def _snapshot_file(metrics_dir, pid, value):
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    snapshot = {"pid": pid, "counters": [["test_total", [], value]], "gauges": [["test_gauge", [], 1]], "histograms": []}
+    path = metrics_dir / f"{pid}.msgpack"
+    path.write_bytes(msgpack.packb(snapshot))
+    return path
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_route_label_is_the_route_template(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    service = MetricsService()
+    monkeypatch.setattr(metrics_module, "metrics_service", service)
+    app = FastAPI()
+    app.add_middleware(metrics_module.MetricsMiddleware)
+
+    @app.get("/items/{a}/{b}")
+    def item(a: str, b: str):
+        return {}
+
+    client = TestClient(app)
+    client.get("/items/7/7")  # Values equal to each other
+    client.get("/items/items/b")  # Values equal to literal segments and names
+    client.get("/nowhere")
+
+    routes = {dict(labels)["route"] for name, labels in service._histograms if name == "http_request_duration_seconds"}
+    assert routes == {"/items/{a}/{b}", "unmatched"}
+
+
+def test_dead_workers_are_pruned(tmp_path):
+    metrics_dir = tmp_path / "metrics"
+    live = _snapshot_file(metrics_dir, os.getppid(), 3)
+    dead = _snapshot_file(metrics_dir, _dead_pid(), 5)
+
+    text = MetricsService(metrics_dir).render()
+    assert "omniluck_test_total 3" in text
+    assert f'pid="{os.getppid()}"' in text
+    assert live.exists() and not dead.exists()
+
+
+def test_close_removes_own_snapshot(tmp_path):
+    metrics_dir = tmp_path / "metrics"
+    service = MetricsService(metrics_dir)
+    service.inc("test_total")
+    service.flush()
+    assert (metrics_dir / f"{os.getpid()}.msgpack").exists()
+    service.close()
+    assert list(metrics_dir.glob("*.msgpack")) == []
+    service.close()  # Already gone - no error
+
+
+def test_upstream_outcomes_share_one_vocabulary(monkeypatch):
+    import asyncio
+
+    import httpx
+
+    service = MetricsService()
+    monkeypatch.setattr(metrics_module, "metrics_service", service)
+    with service.upstream("gemini"):
+        pass
+    try:
+        with service.upstream("gemini"):
+            raise RuntimeError("quota")
+    except RuntimeError:
+        pass
+
+    async def call():
+        api = httpx.MockTransport(lambda request: httpx.Response(200))
+        transport = metrics_module.UpstreamMetricsTransport(api, upstream="nyc")
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get("https://example.org/")
+
+    asyncio.run(call())
+
+    outcomes = {
+        (dict(labels)["upstream"], dict(labels)["outcome"]): value
+        for (name, labels), value in service._counters.items() if name == "upstream_requests_total"
+    }
+    assert outcomes == {("gemini", "2xx"): 1, ("gemini", "error"): 1, ("nyc", "2xx"): 1}
@@ -0,0 +1,168 @@
+"""
+Numerology: the table-driven service against the original digit-by-digit
+implementation, memoization, batch scoring and the /forecast horizon.
+
+    pytest test_numerology_service.py
+"""
+import random
+import re
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services import numerology_service as numerology_module
+from app.services.numerology_service import NumerologyService, numerology_service
+
+DATES = [f"2026-03-{day:02d}" for day in range(1, 8)]
+
+
+class ReferenceNumerology:
+    """The original scalar implementation (digit sums by string, no tables or caches)."""
+
+    letter_map = {
+        'a': 1, 'j': 1, 's': 1, 'b': 2, 'k': 2, 't': 2, 'c': 3, 'l': 3, 'u': 3,
+        'd': 4, 'm': 4, 'v': 4, 'e': 5, 'n': 5, 'w': 5, 'f': 6, 'o': 6, 'x': 6,
+        'g': 7, 'p': 7, 'y': 7, 'h': 8, 'q': 8, 'z': 8, 'i': 9, 'r': 9,
+    }
+    concord_groups = {1: 1, 5: 1, 7: 1, 2: 2, 4: 2, 8: 2, 11: 2, 22: 2, 3: 3, 6: 3, 9: 3, 33: 3}
+
+    def reduce_sum(self, n, allow_master=True):
+        while n > 9:
+            if allow_master and n in [11, 22, 33]:
+                return n
+            n = sum(int(d) for d in str(n))
+        return n
+
+    def life_path(self, dob_str):
+        try:
+            dt = datetime.strptime(dob_str, "%Y-%m-%d")
+        except ValueError:
+            return 0
+        return self.reduce_sum(self.reduce_sum(dt.month) + self.reduce_sum(dt.day) + self.reduce_sum(dt.year))
+
+    def destiny(self, full_name):
+        if not full_name:
+            return 0
+        clean_name = re.sub(r'[^a-zA-Z]', '', full_name.lower())
+        return self.reduce_sum(sum(self.letter_map.get(char, 0) for char in clean_name))
+
+    def personal_day(self, dob_str, target_date):
+        try:
+            dt = datetime.strptime(dob_str, "%Y-%m-%d")
+        except ValueError:
+            return 1
+        personal_year = self.reduce_sum(self.reduce_sum(dt.month) + self.reduce_sum(dt.day) + self.reduce_sum(target_date.year))
+        total = personal_year + self.reduce_sum(target_date.month) + self.reduce_sum(target_date.day)
+        return self.reduce_sum(total, allow_master=False)
+
+    def daily_score(self, dob_str, full_name, target_date):
+        lp, destiny, p_day = self.life_path(dob_str), self.destiny(full_name), self.personal_day(dob_str, target_date)
+        score = 50.0
+        group_pd = self.concord_groups.get(p_day, 0)
+        if lp == p_day:
+            score += 40
+        elif self.concord_groups.get(lp, 0) == group_pd:
+            score += 25
+        elif (lp % 2) == (p_day % 2):
+            score += 10
+        else:
+            score -= 5
+        if destiny == p_day:
+            score += 30
+        elif self.concord_groups.get(destiny, 0) == group_pd:
+            score += 15
+        elif (destiny % 2) == (p_day % 2):
+            score += 5
+        if lp in [11, 22, 33] or destiny in [11, 22, 33]:
+            score += 10
+        if p_day in [8, 9]:
+            score += 5
+        return {
+            "numerology_score": int(max(10, min(100, score))),
+            "life_path_number": lp,
+            "destiny_number": destiny,
+            "personal_day_number": p_day,
+        }
+
+
+REFERENCE = ReferenceNumerology()
+NAMES = ["Ada Lovelace", "Alan Mathison Turing", "K", "Zoë O'Brien-Smith", "", "zzzzzzzzzzzzzzzzzzzzzzzzzzzzzzzzzzzzzz"]
+
+
+@pytest.mark.parametrize("allow_master", [True, False])
+def test_digit_root_tables_match_reference(allow_master):
+    service = NumerologyService()
+    for n in list(range(numerology_module.DIGIT_ROOT_TABLE_SIZE)) + [10**6 - 1, 123456789, 2**40]:
+        assert service._reduce_sum(n, allow_master) == REFERENCE.reduce_sum(n, allow_master), n
+
+
+def test_daily_score_matches_reference():
+    rng = random.Random(7)
+    dobs = ["1929-11-29", "1999-12-31", "2000-02-29", "1990-02-30", "1990-1-1", "garbage", ""]
+    dobs += [(date(1900, 1, 1) + timedelta(days=rng.randrange(60000))).isoformat() for _ in range(300)]
+    targets = [date(2024, 1, 1) + timedelta(days=i) for i in range(0, 800, 7)] + [date(2029, 11, 29)]
+    service = NumerologyService()
+    for dob in dobs:
+        name = rng.choice(NAMES)
+        for target in rng.sample(targets, 10):
+            assert service.calculate_daily_score(dob, name, target.isoformat()) == REFERENCE.daily_score(dob, name, target), (dob, name, target)
+
+
+def test_core_numbers_are_memoized():
+    service = NumerologyService()
+    for day in range(1, 29):
+        service.calculate_daily_score("1815-12-10", "Ada Lovelace", f"2026-02-{day:02d}")
+    service.calculate_daily_scores(
+        np.array([["1815-12-10"], ["1912-06-23"]]), np.array([["Ada Lovelace"], ["Alan Turing"]]), np.array([DATES])
+    )
+
+    dob = service._dob_core.cache_info()
+    destiny = service._destiny.cache_info()
+    assert (dob.misses, destiny.misses) == (2, 2)  # One computation per distinct DOB / name
+    assert dob.hits >= 2 * 28 and destiny.hits >= 28
+
+
+def test_batch_matches_scalar():
+    dobs = np.array(["1990-01-01", "1815-12-10", "2000-02-29", "not a date"])
+    names = np.array(["Ada Lovelace", "Alan Turing", "X", ""])
+    dates = np.array(DATES + ["2026-02-30", ""])
+    batch = numerology_service.calculate_daily_scores(dobs[:, None], names[:, None], dates[None, :])
+    for i, (dob, name) in enumerate(zip(dobs, names)):
+        for j, day in enumerate(dates):
+            scalar = numerology_service.calculate_daily_score(dob, name, day or None)
+            assert {key: int(values[i, j]) for key, values in batch.items()} == scalar
+
+
+def _forecast(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.services.astrology_service import astrology_service
+
+    days = [{"date": day, "transits_score": 40 + 5 * i, "major_aspects": []} for i, day in enumerate(DATES)]
+    monkeypatch.setattr(astrology_service, "calculate_natal_chart", lambda birth_info: SimpleNamespace(strength_score=60))
+    monkeypatch.setattr(astrology_service, "calculate_weekly_forecast", lambda natal_chart: days)
+    payload = {"uid": "u1", "name": "Ada Lovelace", "dob": "1815-12-10", "birth_lat": 51.5, "birth_lon": -0.12}
+    response = TestClient(app).post("/api/luck/forecast", json=payload)
+    assert response.status_code == 200
+    return [day["luck_score"] for day in response.json()["trajectory"]]
+
+
+def test_forecast_falls_back_per_day(monkeypatch):
+    scores = _forecast(monkeypatch)
+    numerology = [numerology_service.calculate_daily_score("1815-12-10", "Ada Lovelace", day)["numerology_score"] for day in DATES]
+    assert scores == [int((40 + 5 * i) * 0.4 + 60 * 0.2 + n * 0.15 + 50 * 0.15 + 55 * 0.1) for i, n in enumerate(numerology)]
+
+    real_parse = numerology_module._parse_date
+
+    def bad_day(date_str):
+        if date_str == DATES[3]:
+            raise RuntimeError("bad day")
+        return real_parse(date_str)
+
+    monkeypatch.setattr(numerology_module, "_parse_date", bad_day)
+    fallback = _forecast(monkeypatch)
+    assert fallback[3] == int(55 * 0.4 + 60 * 0.2 + 50 * 0.15 + 50 * 0.15 + 55 * 0.1)
+    assert fallback[:3] + fallback[4:] == scores[:3] + scores[4:]
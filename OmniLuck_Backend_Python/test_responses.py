@@ -0,0 +1,57 @@
+"""
+JSON response bodies: orjson and the stdlib fallback must produce the same
+bytes for numpy values, dates, non-str keys and nested models.
+
+    pytest test_responses.py
+"""
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pytest
+from pydantic import BaseModel
+
+from app import responses
+from app.responses import FastJSONResponse, dumps
+
+
+class Line(BaseModel):
+    white_balls: list
+    powerball: int
+
+
+CASES = [
+    (np.int64(7), b'7'),
+    (np.float64(0.25), b'0.25'),
+    (np.bool_(True), b'true'),
+    (np.arange(6, dtype=np.int32).reshape(2, 3), b'[[0,1,2],[3,4,5]]'),
+    (np.array([0.5, 1.5], dtype=np.float32), b'[0.5,1.5]'),
+    (date(2024, 1, 6), b'"2024-01-06"'),
+    (datetime(2024, 1, 6, 22, 59, tzinfo=timezone.utc), b'"2024-01-06T22:59:00+00:00"'),
+    ({1: "a", "b": np.uint8(2)}, b'{"1":"a","b":2}'),
+    ({date(2024, 1, 6): np.int64(3)}, b'{"2024-01-06":3}'),
+    (
+        {"draws": [{"date": date(2024, 1, 6), "white": np.array([1, 2, 3, 4, 5]), "pb": np.int16(9)}]},
+        b'{"draws":[{"date":"2024-01-06","white":[1,2,3,4,5],"pb":9}]}',
+    ),
+    ({"line": Line(white_balls=[1, 2, 3, 4, 5], powerball=9)}, b'{"line":{"white_balls":[1,2,3,4,5],"powerball":9}}'),
+    ({"name": "Zoë ♈️"}, '{"name":"Zoë ♈️"}'.encode()),
+]
+
+
+@pytest.fixture(params=["stdlib", "orjson"])
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(responses, "orjson", None)
+    elif responses.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+@pytest.mark.parametrize("content, expected", CASES)
+def test_dumps_matches_on_both_backends(backend, content, expected):
+    assert dumps(content) == expected
+
+
+def test_model_body(backend):
+    line = Line(white_balls=[1, 2, 3, 4, 5], powerball=9)
+    assert FastJSONResponse(line).body == b'{"white_balls":[1,2,3,4,5],"powerball":9}'
@@ -0,0 +1,150 @@
+"""
+Per-stage timing: request span lists, executor propagation, the
+Server-Timing header and the per-span overhead budget.
+
+    pytest test_timing_service.py
+"""
+import asyncio
+import re
+import time
+from contextvars import Context, copy_context
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services import timing_service as timing_module
+from app.services.timing_service import OVERHEAD_BUDGET_NS, ServerTimingMiddleware, TimingService
+
+
+def test_nested_spans_land_in_the_request():
+    service = TimingService()
+
+    @service.timed("outer")
+    def outer():
+        with service.span("inner"):
+            pass
+        with service.span("inner"):
+            pass
+
+    def request():
+        spans = service.start_request()
+        outer()
+        return spans
+
+    spans = copy_context().run(request)
+    assert [name for name, _ in spans] == ["inner", "inner", "outer"]  # In finishing order
+    assert spans[2][1] >= spans[0][1] + spans[1][1]
+    assert {name: h["count"] for name, h in service.histograms().items()} == {"inner": 2, "outer": 1}
+
+
+def test_spans_outside_a_request_only_feed_the_histograms():
+    service = TimingService()
+
+    def background_job():
+        with service.span("idle"):
+            pass
+        return timing_module._request_spans.get()
+
+    assert Context().run(background_job) is None
+    assert service.histograms()["idle"]["count"] == 1
+
+
+def test_async_timed():
+    service = TimingService()
+
+    @service.timed("fetch")
+    async def fetch():
+        await asyncio.sleep(0)
+        return 7
+
+    async def request():
+        spans = service.start_request()
+        assert await fetch() == 7
+        return spans
+
+    assert [name for name, _ in asyncio.run(request())] == ["fetch"]
+
+
+def test_executor_work_keeps_the_request_spans_through_copy_context():
+    service = TimingService()
+
+    def stage(name):
+        with service.span(name):
+            pass
+
+    async def request():
+        spans = service.start_request()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, copy_context().run, stage, "copied")
+        await loop.run_in_executor(None, stage, "lost")  # Executor threads don't inherit the context
+        return spans
+
+    assert [name for name, _ in asyncio.run(request())] == ["copied"]
+    assert set(service.histograms()) == {"copied", "lost"}
+
+
+def test_server_timing_header_format():
+    spans = [("natal_chart", 1_500_000), ("weather", 250_000), ("natal_chart", 500_000)]
+    header = TimingService().server_timing(spans, total_ns=3_004_999)
+    assert header == 'natal_chart;dur=2.00;desc="x2", weather;dur=0.25, total;dur=3.00'
+    assert TimingService().server_timing([]) == ""
+
+
+def test_middleware_emits_the_header(monkeypatch):
+    service = TimingService()
+    monkeypatch.setattr(timing_module, "timing_service", service)
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/work")
+    def work():
+        with service.span("stage"):
+            pass
+        return {}
+
+    header = TestClient(app).get("/work").headers["server-timing"]
+    assert re.fullmatch(r"stage;dur=\d+\.\d\d, total;dur=\d+\.\d\d", header)
+
+
+def test_header_is_off_by_default():
+    from app.main import app
+
+    assert not any(m.cls is ServerTimingMiddleware for m in app.user_middleware)
+    assert "server-timing" not in TestClient(app).get("/").headers
+
+
+def test_span_overhead_within_budget():
+    service = TimingService()
+    span = service.span
+    n = 20_000
+
+    def best_per_call(func):
+        best = None
+        for _ in range(5):
+            start = time.perf_counter_ns()
+            func()
+            elapsed = time.perf_counter_ns() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best / n
+
+    def spans():
+        for _ in range(n):
+            with span("bench"):
+                pass
+
+    def bare():
+        for _ in range(n):
+            pass
+
+    assert best_per_call(spans) - best_per_call(bare) < OVERHEAD_BUDGET_NS
+
+
+def test_histogram_buckets_are_inclusive_upper_bounds():
+    service = TimingService()
+    for duration_ns in (0, 500, 1000, 1001, 2000, 2001, 4000, 10**15):
+        service.record("stage", duration_ns)
+    histogram = service.histograms()["stage"]
+    counts = dict(zip(histogram["buckets_us"], histogram["counts"]))
+    # <= 1us: 0, 500, 1000 | <= 2us: 1001, 2000 | <= 4us: 2001, 4000 | last: the rest
+    assert (counts[1], counts[2], counts[4], histogram["counts"][-1]) == (3, 2, 2, 1)
+    assert histogram["count"] == 8
@@ -0,0 +1,169 @@
+"""
+Personal trend aggregates: incremental statistics vs recomputation from the
+full history, and the check-in log sync.
+
+    pytest test_trend_service.py
+"""
+import asyncio
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.models.schemas import DailyCheckIn
+from app.services import trend_service as trend_module
+from app.services.checkin_service import CheckInService
+from app.services.trend_service import (
+    TREND_HALF_LIFE_DAYS, WEEKDAYS, WINDOW_DAYS, TrendService, UserTrend, day_number,
+)
+
+START = day_number("2026-01-01")
+
+
+def _history(seed, days=120, count=200):
+    """Check-ins (day, mood) in random order, with repeated days and a drift."""
+    rng = random.Random(seed)
+    history = []
+    for _ in range(count):
+        day = START + rng.randrange(days)
+        history.append((day, max(1, min(10, round(3 + 4 * (day - START) / days + rng.gauss(0, 2))))))
+    return history
+
+
+def _trend(history):
+    trend = UserTrend()
+    for day, mood in history:
+        trend.add(day, mood)
+    return trend
+
+
+def _weighted_slope(history):
+    """From-scratch weighted least squares of mood on day."""
+    days = np.array([day for day, _ in history], dtype=float)
+    moods = np.array([mood for _, mood in history], dtype=float)
+    x = days - days.max()
+    w = 0.5 ** (-x / TREND_HALF_LIFE_DAYS)
+    design = np.stack([np.ones_like(x), x], axis=1)
+    intercept, slope = np.linalg.solve(design.T @ (w[:, None] * design), design.T @ (w * moods))
+    return slope
+
+
+def _mean(history, days):
+    latest = max(day for day, _ in history)
+    moods = [mood for day, mood in history if latest - days < day <= latest]
+    return round(sum(moods) / len(moods), 2) if moods else 0.0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_slope_matches_weighted_regression(seed):
+    history = _history(seed)
+    assert _trend(history).slope() == pytest.approx(_weighted_slope(history), rel=1e-9, abs=1e-12)
+    in_order = _trend(sorted(history))
+    assert in_order.slope() == pytest.approx(_weighted_slope(history), rel=1e-9, abs=1e-12)
+
+
+def test_single_day_has_no_slope():
+    trend = _trend([(START, 4), (START, 9)])
+    assert trend.slope() == 0.0
+    assert trend.summary()["trend_direction"] == "stable"
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_windows_reuse_slots_and_accept_late_check_ins(seed):
+    history = _history(seed, days=4 * WINDOW_DAYS)  # Every slot is reused several times
+    trend = _trend(history)
+    assert trend.mean(7) == _mean(history, 7)
+    assert trend.mean(WINDOW_DAYS) == _mean(history, WINDOW_DAYS)
+    assert trend.total == len(history)
+
+    # Arrival order doesn't matter: shuffled == sorted
+    assert trend.summary() == _trend(sorted(history)).summary()
+
+
+def test_check_in_older_than_window_skips_the_ring_buffer():
+    trend = _trend([(START + 40, 8), (START + 39, 6)])
+    slots = (list(trend.slot_day), list(trend.slot_sum), list(trend.slot_count))
+    trend.add(START, 1)  # Outside the 30-day window
+    assert (list(trend.slot_day), list(trend.slot_sum), list(trend.slot_count)) == slots
+    summary = trend.summary()
+    assert summary["avg_mood_30d"] == 7.0 and summary["total_logs"] == 3
+
+
+def test_best_days():
+    history = _history(7)
+    trend = _trend(history)
+    by_weekday = {}
+    for day, mood in history:
+        by_weekday.setdefault((day - 1) % 7, []).append(mood)
+    means = sorted(((sum(m) / len(m), len(m), d) for d, m in by_weekday.items()), reverse=True)
+    assert trend.best_days() == [WEEKDAYS[d] for _, _, d in means[:2]]
+    assert WEEKDAYS[(day_number("2026-03-02") - 1) % 7] == "Monday"
+
+
+def test_service_summary():
+    service = TrendService()
+    assert service.trend("nobody") is None
+    for day in range(10):
+        service.add("u1", START + day, 1 + day)
+    summary = service.trend("u1")
+    assert summary["trend_direction"] == "improving" and summary["avg_mood_7d"] == 7.0
+    assert len(service) == 1
+
+
+@pytest.fixture
+def logs(tmp_path, monkeypatch):
+    own = CheckInService(tmp_path / "checkins")
+    other = CheckInService(tmp_path / "checkins")  # Another worker's log in the same directory
+    monkeypatch.setattr(trend_module, "checkin_service", own)
+    yield own, other
+    own.close()
+    other.close()
+
+
+def _log(service, uid, day, mood=5):
+    checkin = DailyCheckIn(uid=uid, date=day, mood_score=mood, energy_level="medium")
+    assert service.submit(checkin, None, datetime(2026, 3, 2))
+    service.flush()
+
+
+def test_sync_applies_other_workers_check_ins_once(logs):
+    own, other = logs
+    service = TrendService()
+    _log(own, "mine", "2026-03-01")  # Added directly when it arrived, not through the log
+    _log(other, "theirs", "2026-03-01", mood=4)
+    _log(other, "theirs", "2026-03-02", mood=6)
+
+    assert service.sync() == 2
+    assert service.trend("mine") is None
+    assert service.trend("theirs")["total_logs"] == 2
+    assert service.sync() == 0  # Offsets remembered
+
+    _log(other, "theirs", "2026-03-03")
+    assert service.sync() == 1
+    assert service.trend("theirs")["total_logs"] == 3
+
+
+def test_run_sync_skips_own_log(logs):
+    own, other = logs
+    service = TrendService()
+    _log(own, "mine", "2026-03-01")
+    _log(other, "theirs", "2026-03-01")
+
+    async def sync_briefly():
+        task = asyncio.create_task(service.run_sync(interval=0.01))
+        for _ in range(500):
+            await asyncio.sleep(0.01)
+            if len(service):
+                break
+        _log(own, "mine", "2026-03-02")
+        _log(other, "theirs", "2026-03-02")
+        for _ in range(500):
+            await asyncio.sleep(0.01)
+            if service.trend("theirs")["total_logs"] == 2:
+                break
+        task.cancel()
+
+    asyncio.run(sync_briefly())
+    assert service.trend("mine") is None
+    assert service.trend("theirs")["total_logs"] == 2
@@ -0,0 +1,104 @@
+"""
+Startup warm-up: readiness, failing steps and the timeout.
+
+    pytest test_warmup_service.py
+"""
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.config import settings
+from app.services import warmup_service as warmup_module
+from app.services.warmup_service import WarmupService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = WarmupService()
+    monkeypatch.setattr(main, "warmup_service", service)
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(settings, "WARMUP_STEPS", "")
+    monkeypatch.setattr(settings, "WARMUP_TIMEOUT", 5.0)
+    return service
+
+
+def _steps(monkeypatch, **steps):
+    monkeypatch.setattr(warmup_module, "WARMUP_STEPS", steps)
+
+
+def test_ready_is_503_until_warmup_finishes(service, monkeypatch):
+    client = TestClient(main.app)
+    seen = []
+
+    async def slow():
+        # Mid warm-up, as a load balancer would see it
+        response = await main.readiness_check()
+        seen.append((service.state, response.status_code, (await main.health_check())["ready"]))
+
+    _steps(monkeypatch, slow=slow)
+    assert client.get("/ready").status_code == 503
+    asyncio.run(service.run())
+
+    assert seen == [("warming", 503, False)]
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["state"] == "ready" and response.json()["steps"]["slow"]["status"] == "ok"
+    assert client.get("/health").json() == {"status": "healthy", "ready": True}
+
+
+def test_failing_step_does_not_block_the_others(service, monkeypatch):
+    done = []
+
+    def broken():
+        raise RuntimeError("ephemeris missing")
+
+    async def fine():
+        await asyncio.sleep(0.01)
+        done.append("async")
+
+    _steps(monkeypatch, broken=broken, fine=fine, threaded=lambda: done.append("thread"))
+    asyncio.run(service.run())
+
+    assert service.ready and sorted(done) == ["async", "thread"]
+    assert service.steps["broken"]["status"] == "failed"
+    assert service.steps["broken"]["error"] == "ephemeris missing"
+    assert service.steps["fine"]["status"] == service.steps["threaded"]["status"] == "ok"
+
+
+def test_timeout_reports_ready_anyway(service, monkeypatch):
+    release = threading.Event()
+
+    async def stuck():
+        await asyncio.sleep(60)
+
+    _steps(monkeypatch, stuck=stuck, blocked=lambda: release.wait(10), quick=lambda: None)
+    monkeypatch.setattr(settings, "WARMUP_TIMEOUT", 0.1)
+
+    async def warm():
+        try:
+            await service.run()
+        finally:
+            release.set()  # Let the thread finish before the loop shuts its executor down
+
+    asyncio.run(warm())
+
+    assert service.ready and service.duration_ms < 5000
+    assert {name: step["status"] for name, step in service.steps.items()} == {
+        "stuck": "timeout", "blocked": "timeout", "quick": "ok",
+    }
+
+
+def test_selected_steps_and_disabled(service, monkeypatch):
+    ran = []
+    _steps(monkeypatch, a=lambda: ran.append("a"), b=lambda: ran.append("b"))
+    monkeypatch.setattr(settings, "WARMUP_STEPS", "b, nope")
+    asyncio.run(service.run())
+    assert ran == ["b"] and list(service.steps) == ["b"]
+
+    disabled = WarmupService()
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", False)
+    asyncio.run(disabled.run())
+    assert disabled.ready and disabled.steps == {}
@@ -0,0 +1,93 @@
+"""
+Wheel generator: line validity, exact coverage accounting and coverage
+quality against exhaustive search on small pools.
+
+    pytest test_wheel_service.py
+"""
+from itertools import combinations
+from math import comb
+
+import numpy as np
+import pytest
+
+from app.services import wheel_service as wheel_module
+from app.services.powerball_service import PowerballService
+from app.services.wheel_service import wheel_service
+
+
+def any_line(white):
+    return np.ones(len(white), dtype=bool)
+
+
+balanced = PowerballService()._balanced_mask
+
+POOL = [3, 8, 14, 21, 27, 33, 38, 44, 50, 57, 61, 66]
+
+
+def _covered(lines, k):
+    return {units for line in lines for units in combinations(sorted(line), k)}
+
+
+@pytest.mark.parametrize("cover, k", [("pair", 2), ("triple", 3)])
+@pytest.mark.parametrize("num_lines", [1, 4, 10])
+def test_lines_and_coverage_are_exact(cover, k, num_lines):
+    wheel = wheel_service.build_wheel(POOL, num_lines, balanced, cover=cover, seed=1)
+    lines = wheel["white_balls"]
+    coverage = wheel["coverage"]
+
+    assert len(lines) == num_lines
+    assert len({tuple(line) for line in lines}) == num_lines  # Never repeats a line
+    assert all(set(line) <= set(POOL) and len(set(line)) == 5 for line in lines)
+    assert balanced(np.array(lines)).all()
+    assert coverage["covered"] == len(_covered(lines, k))
+    assert coverage["total"] == comb(len(POOL), k)
+    assert coverage["pairs_covered"] == len(_covered(lines, 2))
+    assert coverage["pairs_total"] == comb(len(POOL), 2)
+
+
+@pytest.mark.parametrize("pool, num_lines", [(list(range(1, 9)), 2), (list(range(1, 9)), 3), (list(range(1, 10)), 3)])
+def test_pair_coverage_is_near_optimal(pool, num_lines):
+    """Greedy max coverage guarantees 1 - 1/e of the optimum; local search keeps at least that"""
+    candidates = list(combinations(pool, 5))
+    optimum = max(len(_covered(lines, 2)) for lines in combinations(candidates, num_lines))
+    covered = wheel_service.build_wheel(pool, num_lines, any_line, seed=3)["coverage"]["covered"]
+    assert (1 - 1 / np.e) * optimum <= covered <= optimum
+
+
+def test_local_search_never_loses_coverage(monkeypatch):
+    for seed in range(5):
+        improved = wheel_service.build_wheel(POOL, 6, balanced, seed=seed)["coverage"]["covered"]
+        monkeypatch.setattr(wheel_module, "LOCAL_SEARCH_PASSES", 0)
+        greedy = wheel_service.build_wheel(POOL, 6, balanced, seed=seed)["coverage"]["covered"]
+        monkeypatch.undo()
+        assert improved >= greedy
+
+
+def test_enough_lines_cover_every_pair():
+    # 7 balls: 21 pairs, each 5-ball line covers 10 - three lines can cover them all
+    pool = list(range(1, 8))
+    wheel = wheel_service.build_wheel(pool, 3, any_line, seed=0)
+    assert wheel["coverage"]["covered"] == wheel["coverage"]["total"] == 21
+
+
+def test_lines_capped_by_candidates_and_errors():
+    wheel = wheel_service.build_wheel([1, 2, 3, 4, 5], 10, any_line)
+    assert wheel["white_balls"] == [[1, 2, 3, 4, 5]]
+    assert wheel["coverage"]["ratio"] == 1.0
+    with pytest.raises(ValueError):
+        wheel_service.build_wheel([1, 2, 3, 4, 5], 3, balanced)  # Sum 15 is never balanced
+
+
+def test_wheel_route_validates_modes():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    client = TestClient(app)
+    payload = {"dob": "1990-01-01", "date": "2026-02-02", "pool": POOL, "count": 4}
+    response = client.post("/api/luck/lottery/wheel", json=payload)
+    assert response.status_code == 200
+    assert len(response.json()["lines"]) == 4
+    assert client.post("/api/luck/lottery/wheel", json={**payload, "cover": "quad"}).status_code == 422
+    lottery = {"name": "A", "dob": "1990-01-01", "powerball_mode": "wheeel"}
+    assert client.post("/api/luck/lottery", json=lottery).status_code == 422
@@ -0,0 +1,122 @@
+"""
+Write-behind queue and the luck history store it feeds.
+
+    pytest test_write_behind.py
+"""
+import sqlite3
+
+import pytest
+
+from app.services import write_behind
+from app.services.write_behind import WriteBehindQueue
+
+
+class FlakySink:
+    """Records written batches; raises OSError for the first `failures` calls."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.calls = 0
+        self.written = []
+
+    def __call__(self, batch):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OSError("No space left on device")
+        self.written.extend(batch)
+
+
+@pytest.fixture(autouse=True)
+def no_close_delay(monkeypatch):
+    monkeypatch.setattr(write_behind, "CLOSE_RETRY_DELAY", 0)
+
+
+def test_flush_writes_in_order():
+    sink = FlakySink()
+    queue = WriteBehindQueue("test", sink, batch_size=3, flush_interval=60)
+    for i in range(100):
+        assert queue.put(i)
+    assert queue.flush() == 100
+    assert sink.written == list(range(100)) and len(queue) == 0
+    queue.close()
+
+
+def test_failed_batch_is_kept_and_retried():
+    sink = FlakySink(failures=2)
+    queue = WriteBehindQueue("test", sink, batch_size=2, flush_interval=60)
+    for i in range(50):
+        queue.put(i)
+
+    assert queue.flush() == 0
+    assert len(queue) == 50 and sink.written == []
+    first_retry = queue._retry_at
+    queue.put(50)  # Queued behind the failed records
+    assert queue.flush() == 0
+    assert queue._retry_at > first_retry  # Backoff doubles
+    assert queue._retry_delay == 4 * write_behind.RETRY_INITIAL_DELAY
+
+    assert queue.flush() == 51
+    assert sink.written == list(range(51))
+    assert queue._retry_at == 0.0 and queue._retry_delay == write_behind.RETRY_INITIAL_DELAY
+    queue.close()
+
+
+def test_close_retries_before_giving_up():
+    sink = FlakySink(failures=write_behind.CLOSE_ATTEMPTS - 1)
+    queue = WriteBehindQueue("test", sink, flush_interval=60)
+    queue.put("kept")
+    queue.close()
+    assert sink.written == ["kept"]
+    assert not queue.put("late")  # Closed
+
+
+def test_close_reports_lost_records():
+    from app.services.metrics_service import metrics_service
+
+    sink = FlakySink(failures=10**6)
+    queue = WriteBehindQueue("lost_test", sink, flush_interval=60)
+    for i in range(5):
+        queue.put(i)
+    queue.close()
+    assert sink.calls >= write_behind.CLOSE_ATTEMPTS  # Plus the writer thread's last tick
+    assert len(queue) == 0
+    lost = [line for line in metrics_service.render().splitlines() if 'queue="lost_test"' in line and 'outcome="lost"' in line]
+    assert lost and lost[0].endswith(" 5")
+
+
+def test_full_queue_drops():
+    queue = WriteBehindQueue("test", FlakySink(), flush_interval=60, max_pending=3)
+    assert [queue.put(i) for i in range(5)] == [True, True, True, False, False]
+    queue.close()
+
+
+def _score(total: int) -> dict:
+    components = {"base_numerology": 50, "astrology_score": 50, "natal_potential": 50,
+                  "cosmic_weather": 50, "personal_trend": 0, "total": total}
+    return {"luck_score": total, "components": components, "caption": f"Score {total}"}
+
+
+def test_luck_history_survives_a_failed_write(tmp_path):
+    from app.services.luck_history_service import LuckHistoryService
+
+    store = LuckHistoryService(tmp_path / "luck_history.db")
+    store.record("u1", _score(40), source="batch")
+    store.record("u1", {"caption": "no score"}, source="batch")  # Malformed - skipped, not retried forever
+
+    real_write, failures = store._write, []
+
+    def failing_once(entries):
+        if not failures:
+            failures.append(1)
+            raise sqlite3.OperationalError("database is locked")
+        real_write(entries)
+
+    store.queue.sink = failing_once
+    assert store.flush() == 0
+    assert store.flush() == 2
+    store.record("u1", _score(80), source="calculate")
+    store.flush()
+
+    history = store.history("u1", days=1)
+    assert [(row["score"], row["source"]) for row in history] == [(80, "calculate")]  # Latest of the day
+    store.close()